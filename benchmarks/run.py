@@ -0,0 +1,347 @@
+"""
+Benchmarks request throughput and latency of every API class against the local
+Daraja simulator.
+
+Each class is measured in three modes:
+
+    sync    a new client, and therefore a new connection, for every call
+    pooled  one pooled client shared by `--concurrency` threads
+    async   one pooled async client driving `--concurrency` tasks
+
+By default requests go over HTTP to a simulator server on localhost. With
+`--in-process` they are answered by the simulator's MockTransport instead, which
+isolates the SDK's own per-call overhead from socket I/O.
+
+Usage:
+    python -m benchmarks.run --calls 1000 --concurrency 16 --output results.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+
+from mpesa import (
+    B2C,
+    C2B,
+    AsyncB2C,
+    AsyncBalance,
+    AsyncC2B,
+    AsyncMpesaExpress,
+    AsyncReversal,
+    AsyncTransactionStatus,
+    Balance,
+    DarajaSimulator,
+    MpesaExpress,
+    Reversal,
+    RetryPolicy,
+    TokenCache,
+    TransactionStatus,
+)
+
+CALLBACK_URL = "https://example.com/callback"
+MODES = ("sync", "pooled", "async")
+
+# Each entry maps a class name to its sync class, async class and a function
+# making one request with a unique reference.
+CALLS: Dict[str, Any] = {
+    "C2B": (
+        C2B,
+        AsyncC2B,
+        lambda api, n: api.simulate(
+            600123, "CustomerPayBillOnline", 10, 254708374149, f"ref{n}"
+        ),
+    ),
+    "B2C": (
+        B2C,
+        AsyncB2C,
+        lambda api, n: api.transact(
+            f"bench-{n}",
+            "initiator",
+            "credential",
+            "BusinessPayment",
+            "10",
+            600123,
+            254708374149,
+            "Benchmark",
+            CALLBACK_URL,
+            CALLBACK_URL,
+        ),
+    ),
+    "Balance": (
+        Balance,
+        AsyncBalance,
+        lambda api, n: api.get_balance(
+            "initiator",
+            "credential",
+            "600123",
+            4,
+            "Benchmark",
+            CALLBACK_URL,
+            CALLBACK_URL,
+        ),
+    ),
+    "TransactionStatus": (
+        TransactionStatus,
+        AsyncTransactionStatus,
+        lambda api, n: api.check_transaction_status(
+            "credential",
+            f"bench-{n}",
+            "600123",
+            "4",
+            f"SIM{n:07d}",
+            "Benchmark",
+            "initiator",
+            CALLBACK_URL,
+            CALLBACK_URL,
+        ),
+    ),
+    "MpesaExpress": (
+        MpesaExpress,
+        AsyncMpesaExpress,
+        lambda api, n: api.stk_push(
+            174379,
+            "passkey",
+            "CustomerPayBillOnline",
+            1,
+            254708374149,
+            254708374149,
+            CALLBACK_URL,
+            "Benchmark",
+            f"ref{n}",
+        ),
+    ),
+    "Reversal": (
+        Reversal,
+        AsyncReversal,
+        lambda api, n: api.reverse(
+            600123,
+            "initiator",
+            "10",
+            "credential",
+            f"SIM{n:07d}",
+            CALLBACK_URL,
+            CALLBACK_URL,
+            None,
+            "Benchmark",
+        ),
+    ),
+}
+
+
+class BenchmarkResult(NamedTuple):
+    """Measurements of one API class in one mode."""
+
+    api: str
+    mode: str
+    transport: str
+    calls: int
+    concurrency: int
+    errors: int
+    elapsed: float
+    throughput: float
+    mean_ms: float
+    p50_ms: float
+    p99_ms: float
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Returns the nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize(
+    api: str,
+    mode: str,
+    transport: str,
+    concurrency: int,
+    latencies: List[float],
+    errors: int,
+    elapsed: float,
+) -> BenchmarkResult:
+    latencies = sorted(latencies)
+    calls = len(latencies)
+    return BenchmarkResult(
+        api=api,
+        mode=mode,
+        transport=transport,
+        calls=calls,
+        concurrency=concurrency,
+        errors=errors,
+        elapsed=round(elapsed, 4),
+        throughput=round(calls / elapsed, 1) if elapsed else 0.0,
+        mean_ms=round(sum(latencies) / calls * 1000, 3) if calls else 0.0,
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 3),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 3),
+    )
+
+
+class Runner:
+    """Builds clients against one simulator and measures every mode."""
+
+    def __init__(self, simulator: DarajaSimulator, url: Optional[str]):
+        self.simulator = simulator
+        self.url = url
+        self.transport = "in-process" if url is None else "http"
+        # A dedicated cache keeps tokens from leaking between benchmark runs.
+        self.token_cache = TokenCache()
+        self._references = itertools.count()
+
+    def options(self, asynchronous: bool) -> Dict[str, Any]:
+        options: Dict[str, Any] = {
+            "app_key": "benchmark",
+            "app_secret": "benchmark",
+            "token_cache": self.token_cache,
+            "retry_policy": RetryPolicy(max_retries=0),
+        }
+        if self.url is not None:
+            options["sandbox_url"] = self.url
+        elif asynchronous:
+            options["transport"] = self.simulator.async_transport()
+        else:
+            options["transport"] = self.simulator.transport()
+        return options
+
+    def timed(self, call: Callable[[], Any]) -> Optional[float]:
+        started = time.perf_counter()
+        try:
+            call()
+        except (httpx.HTTPError, ValueError):
+            return None
+        return time.perf_counter() - started
+
+    def run_sync(self, name: str, calls: int) -> BenchmarkResult:
+        cls, _, request = CALLS[name]
+
+        def call() -> None:
+            with cls(**self.options(False)) as api:
+                request(api, next(self._references))
+
+        started = time.perf_counter()
+        timings = [self.timed(call) for _ in range(calls)]
+        elapsed = time.perf_counter() - started
+        return self._result(name, "sync", 1, timings, elapsed)
+
+    def run_pooled(self, name: str, calls: int, concurrency: int) -> BenchmarkResult:
+        cls, _, request = CALLS[name]
+        with cls(**self.options(False)) as api:
+            api.warmup()
+
+            def call() -> Optional[float]:
+                return self.timed(lambda: request(api, next(self._references)))
+
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                started = time.perf_counter()
+                timings = list(executor.map(lambda _: call(), range(calls)))
+                elapsed = time.perf_counter() - started
+        return self._result(name, "pooled", concurrency, timings, elapsed)
+
+    def run_async(self, name: str, calls: int, concurrency: int) -> BenchmarkResult:
+        _, cls, request = CALLS[name]
+
+        async def measure() -> BenchmarkResult:
+            async with cls(**self.options(True)) as api:
+                await api.warmup()
+                semaphore = asyncio.Semaphore(concurrency)
+
+                async def call() -> Optional[float]:
+                    async with semaphore:
+                        started = time.perf_counter()
+                        try:
+                            await request(api, next(self._references))
+                        except (httpx.HTTPError, ValueError):
+                            return None
+                        return time.perf_counter() - started
+
+                started = time.perf_counter()
+                timings = await asyncio.gather(*(call() for _ in range(calls)))
+                elapsed = time.perf_counter() - started
+            return self._result(name, "async", concurrency, timings, elapsed)
+
+        return asyncio.run(measure())
+
+    def _result(self, name, mode, concurrency, timings, elapsed) -> BenchmarkResult:
+        latencies = [timing for timing in timings if timing is not None]
+        errors = len(timings) - len(latencies)
+        return summarize(
+            name, mode, self.transport, concurrency, latencies, errors, elapsed
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> List[BenchmarkResult]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=500, help="Calls per run.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--apis", nargs="+", choices=sorted(CALLS), default=list(CALLS))
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Simulated server latency in seconds.",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Use the in-process transport instead of HTTP.",
+    )
+    parser.add_argument("--output", help="Write JSON results to this file.")
+    args = parser.parse_args(argv)
+
+    started_at = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    simulator = DarajaSimulator(latency=args.latency, error_rate=args.error_rate)
+    server = None if args.in_process else simulator.serve()
+    runner = Runner(simulator, None if server is None else server.url)
+
+    results = []
+    try:
+        for name in args.apis:
+            for mode in args.modes:
+                if mode == "sync":
+                    result = runner.run_sync(name, args.calls)
+                elif mode == "pooled":
+                    result = runner.run_pooled(name, args.calls, args.concurrency)
+                else:
+                    result = runner.run_async(name, args.calls, args.concurrency)
+                results.append(result)
+                print(
+                    f"{result.api:<18} {result.mode:<7} {result.throughput:>9.1f}/s "
+                    f"p50 {result.p50_ms:>8.3f}ms p99 {result.p99_ms:>8.3f}ms "
+                    f"errors {result.errors}",
+                    file=sys.stderr,
+                )
+    finally:
+        if server is not None:
+            server.close()
+        simulator.close()
+
+    report = {
+        "python": platform.python_version(),
+        "httpx": httpx.__version__,
+        "platform": platform.platform(),
+        "started_at": started_at,
+        "settings": vars(args),
+        "results": [result._asdict() for result in results],
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    return results
+
+
+if __name__ == "__main__":
+    main()
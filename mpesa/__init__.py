@@ -1,4 +1,144 @@
-from .api import MpesaBase, C2B, B2C, TransactionStatus, Balance, MpesaExpress, Reversal
-
-__all__ = ["MpesaBase", "C2B", "B2C", "TransactionStatus", "Balance", "MpesaExpress", "Reversal"]
+from .api import (
+    MpesaBase,
+    C2B,
+    B2C,
+    TransactionStatus,
+    Balance,
+    MpesaExpress,
+    Reversal,
+    TokenCache,
+)
+from .api import StkPushPoller, StkPushOutcome
+from .api import SecurityCredentialCache, StkPasswordGenerator, stk_password_generator
+from .api import ClientRegistry, AsyncClientRegistry, Tenant
+from .api import RetryPolicy
+from .api import RateLimiter, TokenBucket
+from .api import CircuitBreaker, CircuitOpenError
+from .api import BulkDisbursement, DisbursementResult
+from .api import ResultCorrelator, ResultTimeoutError
+from .api import OutboundQueue, OutboundEntry, OutboundResult
+from .api import StkCampaign, CampaignResult, read_records
+from .api import PayloadValidator, ValidationError, Rule, normalize_msisdn
+from .api import (
+    MpesaResponse,
+    Acknowledgement,
+    C2BResponse,
+    StkPushResponse,
+    StkQueryResponse,
+    MalformedResponseError,
+)
+from .api import (
+    StatusReconciliation,
+    ReconciliationRecord,
+    read_transaction_ids,
+    write_report,
+)
+from .api import (
+    Instrumentation,
+    MetricsCollector,
+    OpenTelemetryInstrumentation,
+    render_prometheus,
+)
+from .api import DarajaSimulator, SimulatorServer
+from .api import (
+    IdempotencyStore,
+    MemoryIdempotencyStore,
+    SQLiteIdempotencyStore,
+    DuplicateRequestError,
+)
+from .api import (
+    CallbackReceiver,
+    parse_callback,
+    StkCallback,
+    C2BNotification,
+    ResultCallback,
+    B2CResult,
+    ReversalResult,
+    TransactionStatusResult,
+    BalanceResult,
+    TimeoutNotification,
+)
+from .api import (
+    AsyncMpesaBase,
+    AsyncC2B,
+    AsyncB2C,
+    AsyncBalance,
+    AsyncTransactionStatus,
+    AsyncMpesaExpress,
+    AsyncReversal,
+)
 
+__all__ = [
+    "MpesaBase",
+    "C2B",
+    "B2C",
+    "TransactionStatus",
+    "Balance",
+    "MpesaExpress",
+    "Reversal",
+    "TokenCache",
+    "AsyncMpesaBase",
+    "AsyncC2B",
+    "AsyncB2C",
+    "AsyncBalance",
+    "AsyncTransactionStatus",
+    "AsyncMpesaExpress",
+    "AsyncReversal",
+    "BulkDisbursement",
+    "DisbursementResult",
+    "RateLimiter",
+    "TokenBucket",
+    "RetryPolicy",
+    "StkPushPoller",
+    "StkPushOutcome",
+    "CallbackReceiver",
+    "parse_callback",
+    "StkCallback",
+    "C2BNotification",
+    "ResultCallback",
+    "B2CResult",
+    "ReversalResult",
+    "TransactionStatusResult",
+    "BalanceResult",
+    "TimeoutNotification",
+    "IdempotencyStore",
+    "MemoryIdempotencyStore",
+    "SQLiteIdempotencyStore",
+    "DuplicateRequestError",
+    "DarajaSimulator",
+    "SimulatorServer",
+    "Instrumentation",
+    "MetricsCollector",
+    "OpenTelemetryInstrumentation",
+    "render_prometheus",
+    "StkPasswordGenerator",
+    "stk_password_generator",
+    "SecurityCredentialCache",
+    "ClientRegistry",
+    "AsyncClientRegistry",
+    "Tenant",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "StatusReconciliation",
+    "ReconciliationRecord",
+    "read_transaction_ids",
+    "write_report",
+    "ResultCorrelator",
+    "ResultTimeoutError",
+    "OutboundQueue",
+    "OutboundEntry",
+    "OutboundResult",
+    "StkCampaign",
+    "CampaignResult",
+    "read_records",
+    "PayloadValidator",
+    "ValidationError",
+    "Rule",
+    "normalize_msisdn",
+    "MpesaResponse",
+    "Acknowledgement",
+    "C2BResponse",
+    "StkPushResponse",
+    "StkQueryResponse",
+    "MalformedResponseError",
+]
@@ -5,5 +5,142 @@ from .c2b import C2B
 from .b2c import B2C
 from .mpesa_express import MpesaExpress
 from .reversal import Reversal
+from .token_cache import TokenCache
+from .credentials import (
+    SecurityCredentialCache,
+    StkPasswordGenerator,
+    stk_password_generator,
+)
+from .poller import StkPushPoller, StkPushOutcome
+from .retry import RetryPolicy
+from .rate_limit import RateLimiter, TokenBucket
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .bulk import BulkDisbursement, DisbursementResult
+from .correlator import ResultCorrelator, ResultTimeoutError
+from .outbound import OutboundQueue, OutboundEntry, OutboundResult
+from .campaign import StkCampaign, CampaignResult, read_records
+from .validation import PayloadValidator, ValidationError, Rule, normalize_msisdn
+from .responses import (
+    MpesaResponse,
+    Acknowledgement,
+    C2BResponse,
+    StkPushResponse,
+    StkQueryResponse,
+    MalformedResponseError,
+)
+from .reconciliation import (
+    StatusReconciliation,
+    ReconciliationRecord,
+    read_transaction_ids,
+    write_report,
+)
+from .instrumentation import (
+    Instrumentation,
+    MetricsCollector,
+    OpenTelemetryInstrumentation,
+    render_prometheus,
+)
+from .simulator import DarajaSimulator, SimulatorServer
+from .idempotency import (
+    IdempotencyStore,
+    MemoryIdempotencyStore,
+    SQLiteIdempotencyStore,
+    DuplicateRequestError,
+)
+from .callbacks import (
+    CallbackReceiver,
+    parse_callback,
+    StkCallback,
+    C2BNotification,
+    ResultCallback,
+    B2CResult,
+    ReversalResult,
+    TransactionStatusResult,
+    BalanceResult,
+    TimeoutNotification,
+)
+from .registry import ClientRegistry, AsyncClientRegistry, Tenant
+from .aio import (
+    AsyncMpesaBase,
+    AsyncC2B,
+    AsyncB2C,
+    AsyncBalance,
+    AsyncTransactionStatus,
+    AsyncMpesaExpress,
+    AsyncReversal,
+)
 
-__all__ = ["MpesaBase", "Balance", "TransactionStatus", "C2B", "B2C", "MpesaExpress", "Reversal"]
+__all__ = [
+    "MpesaBase",
+    "Balance",
+    "TransactionStatus",
+    "C2B",
+    "B2C",
+    "MpesaExpress",
+    "Reversal",
+    "TokenCache",
+    "AsyncMpesaBase",
+    "AsyncC2B",
+    "AsyncB2C",
+    "AsyncBalance",
+    "AsyncTransactionStatus",
+    "AsyncMpesaExpress",
+    "AsyncReversal",
+    "BulkDisbursement",
+    "DisbursementResult",
+    "RateLimiter",
+    "TokenBucket",
+    "RetryPolicy",
+    "StkPushPoller",
+    "StkPushOutcome",
+    "CallbackReceiver",
+    "parse_callback",
+    "StkCallback",
+    "C2BNotification",
+    "ResultCallback",
+    "B2CResult",
+    "ReversalResult",
+    "TransactionStatusResult",
+    "BalanceResult",
+    "TimeoutNotification",
+    "IdempotencyStore",
+    "MemoryIdempotencyStore",
+    "SQLiteIdempotencyStore",
+    "DuplicateRequestError",
+    "DarajaSimulator",
+    "SimulatorServer",
+    "Instrumentation",
+    "MetricsCollector",
+    "OpenTelemetryInstrumentation",
+    "render_prometheus",
+    "StkPasswordGenerator",
+    "stk_password_generator",
+    "SecurityCredentialCache",
+    "ClientRegistry",
+    "AsyncClientRegistry",
+    "Tenant",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "StatusReconciliation",
+    "ReconciliationRecord",
+    "read_transaction_ids",
+    "write_report",
+    "ResultCorrelator",
+    "ResultTimeoutError",
+    "OutboundQueue",
+    "OutboundEntry",
+    "OutboundResult",
+    "StkCampaign",
+    "CampaignResult",
+    "read_records",
+    "PayloadValidator",
+    "ValidationError",
+    "Rule",
+    "normalize_msisdn",
+    "MpesaResponse",
+    "Acknowledgement",
+    "C2BResponse",
+    "StkPushResponse",
+    "StkQueryResponse",
+    "MalformedResponseError",
+]
@@ -0,0 +1,381 @@
+import asyncio
+import functools
+import time
+from typing import Optional, Dict, Any, Callable, Tuple
+import httpx
+
+from mpesa.api import serialization
+from mpesa.api.auth import MpesaBase
+from mpesa.api.b2c import B2C
+from mpesa.api.balance import Balance
+from mpesa.api.c2b import C2B
+from mpesa.api.constants import AUTH_PATH
+from mpesa.api.idempotency import IdempotencyRecord
+from mpesa.api.mpesa_express import MpesaExpress
+from mpesa.api.reversal import Reversal
+from mpesa.api.status import TransactionStatus
+from mpesa.api.token_cache import TokenCache
+
+
+async def _run_blocking(function: Callable[..., Any], *args: Any) -> Any:
+    """
+    Runs a blocking call, such as a write to a SQLite idempotency store, in the
+    default executor so that it does not stall the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(function, *args))
+
+
+class AsyncMpesaBase(MpesaBase):
+    """
+    AsyncMpesaBase is the asyncio counterpart of MpesaBase. Requests are sent over a
+    pooled `httpx.AsyncClient` and no network I/O happens in the constructor; the
+    access token is fetched on the first request and shared through the same token
+    cache used by the synchronous classes.
+
+    The async API classes reuse the payload building of their synchronous
+    counterparts, so every endpoint method returns an awaitable. Request handling
+    is shared with MpesaBase; only the network I/O is awaited here, and calls to
+    the idempotency store run in the default executor.
+
+    Methods:
+        authenticate() -> Optional[str]: Coroutine that retrieves an access token.
+        get_token() -> Optional[str]: Coroutine returning a cached access token,
+        authenticating only when no fresh token is available.
+        warmup() -> Optional[str]: Coroutine that fetches the access token ahead of
+        the first request.
+        aclose(): Coroutine that closes the pooled client if this instance created
+        it.
+    """
+
+    def __init__(
+        self,
+        env: str = "sandbox",
+        app_key: Optional[str] = None,
+        app_secret: Optional[str] = None,
+        sandbox_url: str = "https://sandbox.safaricom.co.ke",
+        live_url: str = "https://safaricom.co.ke",
+        token_cache: Optional[TokenCache] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+        **kwargs: Any,
+    ):
+        """
+        Initializes an instance of AsyncMpesaBase without contacting Mpesa.
+
+        Args:
+            env (str): Environment to use; options are "sandbox" or "production".
+            app_key (Optional[str]): Consumer key from Mpesa's developer portal.
+            app_secret (Optional[str]): Consumer secret from Mpesa's developer portal.
+            sandbox_url (str): URL for the sandbox environment.
+            live_url (str): URL for the live production environment.
+            token_cache (Optional[TokenCache]): Cache used to share access tokens;
+            defaults to the process-wide cache.
+            http_client (Optional[httpx.AsyncClient]): Existing async client to
+            share between instances; it is not closed by `aclose()`.
+            limits (Optional[httpx.Limits]): Connection pool limits for the client
+            created by this instance.
+            http2 (bool): Enables HTTP/2 on the client created by this instance;
+            requires the `h2` package.
+            **kwargs: Additional options forwarded to MpesaBase, e.g. rate_limiter
+            or an `httpx.AsyncBaseTransport` as transport.
+        """
+        # Keyword arguments keep the call valid for MpesaExpress, whose constructor
+        # takes app_key and app_secret before env.
+        super().__init__(
+            env=env,
+            app_key=app_key,
+            app_secret=app_secret,
+            sandbox_url=sandbox_url,
+            live_url=live_url,
+            token_cache=token_cache,
+            http_client=http_client,
+            limits=limits,
+            http2=http2,
+            **kwargs,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' with asynchronous Mpesa clients.")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Returns the pooled async HTTP client, creating it on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.AsyncClient(
+                        limits=self.limits,
+                        http2=self.http2,
+                        timeout=self.timeout,
+                        transport=self.transport,
+                    )
+        return self._client
+
+    def close(self) -> None:
+        raise TypeError("Use 'await aclose()' with asynchronous Mpesa clients.")
+
+    async def aclose(self) -> None:
+        """Closes the pooled async HTTP client if it was created by this instance."""
+        if self._client is not None and self._owns_client:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    async def warmup(self) -> Optional[str]:
+        """Fetches an access token ahead of the first API request."""
+        return await self.get_token()
+
+    async def get_token(self) -> Optional[str]:
+        """
+        Returns an access token, reusing a cached one while it is still fresh.
+
+        Returns:
+            Optional[str]: The access token for the "Bearer" authorization header.
+
+        Raises:
+            ValueError: Raised if app_key or app_secret is not provided.
+            httpx.HTTPStatusError: Raised if the authentication request returns a
+            non-200 status code.
+        """
+        self._require_credentials()
+
+        key = self._token_key()
+        token = self.token_cache.get(key)
+        if token is None:
+            # Single-flight: concurrent tasks wait for one authentication request
+            async with self.token_cache.async_refresh_lock(key):
+                token = self.token_cache.get(key)
+                if token is None:
+                    return await self.authenticate()
+
+        self.token = token
+        return token
+
+    async def authenticate(self) -> Optional[str]:
+        """
+        Authenticates with the Mpesa API using Basic Auth and fetches an access token,
+        storing it in `self.token` and in the token cache.
+
+        Returns:
+            Optional[str]: The access token for subsequent API requests.
+
+        Raises:
+            ValueError: Raised if app_key or app_secret is not provided, or if the
+            response does not contain an access token.
+            httpx.HTTPStatusError: Raised if the authentication request returns a
+            non-200 status code.
+        """
+        self._require_credentials()
+
+        try:
+            response = await self.client.get(
+                self._url(AUTH_PATH), auth=self._basic_auth()
+            )
+        except httpx.RequestError as err:
+            raise self._authentication_error(err)
+        return self._accept_token(response)
+
+    async def _send(
+        self,
+        path: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+    ) -> httpx.Response:
+        """
+        Sends a POST request to a Mpesa endpoint, retrying transient failures
+        according to the retry policy without blocking the event loop. Requests
+        with an idempotency key are not retried after an ambiguous gateway error.
+
+        Raises:
+            httpx.RequestError: Raised when the last attempt fails in transport.
+            CircuitOpenError: Raised if the endpoint's circuit is open.
+        """
+        policy = self.retry_policy
+        deadline = policy.start()
+        url = self._url(path)
+        body = serialization.dumps(payload)
+        attempt = 0
+        response: Optional[httpx.Response] = None
+        error: Optional[httpx.RequestError] = None
+
+        while True:
+            probe = self._admit_retry(path, attempt, error)
+            if probe is None:
+                return response
+
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(path)
+
+            timer = self._phase_timer()
+            started = time.perf_counter()
+            try:
+                response = await self.client.post(
+                    url,
+                    headers=headers,
+                    content=body,
+                    timeout=policy.bound_timeout(self.timeout, deadline),
+                    extensions=None if timer is None else {"trace": timer.atrace},
+                )
+                error = None
+            except httpx.RequestError as err:
+                response, error = None, err
+
+            delay = self._retry_delay(
+                path,
+                attempt,
+                deadline,
+                started,
+                timer,
+                probe,
+                response,
+                error,
+                idempotency_key,
+            )
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _post(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        operation: str,
+        idempotency_key: Optional[str] = None,
+    ) -> Any:
+        """Sends a request and reports it to the instrumentation."""
+        if self.instrumentation is None:
+            return (await self._request(path, payload, operation, idempotency_key))[0]
+
+        started = self._request_started(path, operation)
+        try:
+            result, status_code = await self._request(
+                path, payload, operation, idempotency_key
+            )
+        except Exception as err:
+            self._request_finished(path, operation, started, error=err)
+            raise
+        self._request_finished(path, operation, started, status_code)
+        return result
+
+    async def _request(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        operation: str,
+        idempotency_key: Optional[str] = None,
+    ) -> Tuple[Any, Optional[int]]:
+        """
+        Sends an authenticated JSON POST request to a Mpesa endpoint over the pooled
+        async client and returns the parsed JSON response. A request rejected
+        because of an expired access token is replayed once with a refreshed token.
+
+        Raises:
+            httpx.HTTPStatusError: Raised for HTTP errors during the request.
+            DuplicateRequestError: Raised if a request with the same idempotency key
+            is still pending or had a different payload.
+            CircuitOpenError: Raised if the endpoint's circuit is open.
+            ValueError: Raised for invalid or unsuccessful response from Mpesa API.
+        """
+        started = time.perf_counter()
+        token = await self.get_token()
+        self._auth_acquired(path, started)
+
+        record = await self._claim_async(idempotency_key, payload)
+        if record is not None:
+            return self._replay(path, payload, record), None
+
+        try:
+            response = await self._send(
+                path, self._headers(token), payload, idempotency_key
+            )
+            if self._refresh_rejected(response, token):
+                token = await self.get_token()
+                response = await self._send(
+                    path, self._headers(token), payload, idempotency_key
+                )
+            result, data = self._result(path, response, idempotency_key)
+        except (httpx.HTTPError, ValueError) as err:
+            await self._settle_async(idempotency_key, error=err)
+            raise self._request_error(operation, err)
+
+        await self._settle_async(idempotency_key, data)
+        return result, response.status_code
+
+    async def _claim_async(
+        self, idempotency_key: Optional[str], payload: Dict[str, Any]
+    ) -> Optional[IdempotencyRecord]:
+        """Runs `_claim()` in the default executor, off the event loop."""
+        if idempotency_key is None or self.idempotency_store is None:
+            return None
+        return await _run_blocking(self._claim, idempotency_key, payload)
+
+    async def _settle_async(
+        self,
+        idempotency_key: Optional[str],
+        data: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Runs `_settle()` in the default executor, off the event loop."""
+        if idempotency_key is None or self.idempotency_store is None:
+            return
+        await _run_blocking(self._settle, idempotency_key, data, error)
+
+
+class AsyncC2B(AsyncMpesaBase, C2B):
+    """
+    Asynchronous C2B client; `register()` and `simulate()` return awaitables.
+    """
+
+
+class AsyncB2C(AsyncMpesaBase, B2C):
+    """
+    Asynchronous B2C client; `transact()` returns an awaitable.
+    """
+
+
+class AsyncBalance(AsyncMpesaBase, Balance):
+    """
+    Asynchronous account balance client; `get_balance()` returns an awaitable.
+    """
+
+
+class AsyncTransactionStatus(AsyncMpesaBase, TransactionStatus):
+    """
+    Asynchronous transaction status client; `check_transaction_status()` returns an
+    awaitable.
+    """
+
+
+class AsyncMpesaExpress(AsyncMpesaBase, MpesaExpress):
+    """
+    Asynchronous Mpesa Express client; `stk_push()` and `status()` return awaitables.
+    """
+
+    def __init__(
+        self,
+        app_key: Optional[str] = None,
+        app_secret: Optional[str] = None,
+        env: str = "sandbox",
+        sandbox_url: str = "https://sandbox.safaricom.co.ke",
+        live_url: str = "https://safaricom.co.ke",
+        **kwargs: Any,
+    ):
+        # Mirrors the argument order of MpesaExpress
+        super().__init__(env, app_key, app_secret, sandbox_url, live_url, **kwargs)
+
+
+class AsyncReversal(AsyncMpesaBase, Reversal):
+    """
+    Asynchronous reversal client; `reverse()` returns an awaitable.
+    """
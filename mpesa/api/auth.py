@@ -1,6 +1,85 @@
-from typing import Optional
+import logging
+import threading
+import time
+from typing import Optional, Dict, Any, Tuple
 import httpx
 
+from mpesa.api import serialization
+from mpesa.api.circuit_breaker import CircuitBreaker, CircuitOpenError
+from mpesa.api.constants import (
+    AUTH_PATH,
+    CONNECT_TIMEOUT_SECONDS,
+    KEEPALIVE_EXPIRY,
+    LIVE_URL,
+    MAX_CONNECTIONS,
+    MAX_KEEPALIVE_CONNECTIONS,
+    SANDBOX_URL,
+    TIMEOUT_SECONDS,
+)
+from mpesa.api.credentials import (
+    SecurityCredentialCache,
+    default_security_credential_cache,
+)
+from mpesa.api.endpoints import Endpoint
+from mpesa.api.idempotency import (
+    AMBIGUOUS_STATUSES,
+    IdempotencyRecord,
+    IdempotencyStore,
+    fingerprint,
+    is_definite_failure,
+)
+from mpesa.api.instrumentation import Instrumentation, PhaseTimer
+from mpesa.api.rate_limit import RateLimiter
+from mpesa.api.responses import (
+    JSON,
+    RESPONSE_MODES,
+    build_response,
+    replayed_response,
+    response_data,
+)
+from mpesa.api.retry import RetryPolicy
+from mpesa.api.token_cache import TokenCache, TokenKey, default_token_cache
+from mpesa.api.validation import PayloadValidator
+
+logger = logging.getLogger(__name__)
+
+# Error code Daraja returns alongside 400/401/404 responses for expired tokens
+INVALID_TOKEN_ERROR_CODE = "404.001.03"
+
+
+def token_cache_key(
+    env: str,
+    app_key: Optional[str],
+    sandbox_url: str = SANDBOX_URL,
+    live_url: str = LIVE_URL,
+) -> TokenKey:
+    """
+    Returns the key under which the access token of a consumer key is cached: the
+    environment, the consumer key and the base URL of that environment.
+    """
+    base_url = live_url if env == "production" else sandbox_url
+    return (env, app_key or "", base_url)
+
+
+def _error_status(error: BaseException) -> Optional[int]:
+    """Returns the status code of the response behind an HTTP error, if any."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    return None
+
+
+def _token_rejected(response: httpx.Response) -> bool:
+    """Returns True if Mpesa rejected the request's access token."""
+    if response.status_code == 401:
+        return True
+    if response.status_code not in (400, 404):
+        return False
+    try:
+        error_code = response.json().get("errorCode")
+    except (ValueError, AttributeError):
+        return False
+    return error_code == INVALID_TOKEN_ERROR_CODE
+
 
 class MpesaBase:
     """
@@ -15,10 +94,44 @@ class MpesaBase:
         sandbox_url (str): Base URL for Mpesa's sandbox environment.
         live_url (str): Base URL for Mpesa's production environment.
         token (Optional[str]): Access token obtained upon successful authentication.
+        token_cache (TokenCache): Cache of access tokens shared between instances.
+        client (httpx.Client): Long-lived pooled HTTP client reused by every request
+        made through this instance.
+        rate_limiter (Optional[RateLimiter]): Per-endpoint rate limiter applied
+        before each API request.
+        retry_policy (RetryPolicy): Policy deciding when failed API requests are
+        retried.
+        timeout (httpx.Timeout): Connect, read, write and pool timeouts of the
+        client created by this instance.
+        idempotency_store (Optional[IdempotencyStore]): Store suppressing duplicate
+        B2C and reversal submissions.
+        transport (Optional[httpx.BaseTransport]): Transport used by the client
+        created by this instance, e.g. a DarajaSimulator transport.
+        instrumentation (Optional[Instrumentation]): Receives request, auth,
+        attempt, retry and completion events, e.g. a MetricsCollector.
+        circuit_breaker (Optional[CircuitBreaker]): Per-endpoint circuit breaker
+        consulted before each attempt.
+        initiator_password (Optional[str]): Initiator password used to generate
+        SecurityCredential values.
+        certificate_path (Optional[str]): Safaricom certificate of this
+        environment used to encrypt the initiator password.
+        credential_cache (SecurityCredentialCache): Cache of generated
+        SecurityCredential values shared between instances.
+        validator (Optional[PayloadValidator]): Checks each request payload
+        before it is sent.
+        response_mode (str): Form of the returned responses; "json", "model" or
+        "raw".
 
     Methods:
         authenticate() -> Optional[str]: Authenticates with Mpesa and retrieves a
         access token.
+        get_token() -> Optional[str]: Returns a cached access token, authenticating
+        only when no fresh token is available.
+        warmup() -> Optional[str]: Fetches the access token ahead of the first
+        request.
+        security_credential() -> str: Returns the SecurityCredential generated from
+        the initiator password.
+        close(): Closes the pooled HTTP client if this instance created it.
     """
 
     def __init__(
@@ -28,6 +141,22 @@ class MpesaBase:
         app_secret: Optional[str] = None,
         sandbox_url: str = "https://sandbox.safaricom.co.ke",
         live_url: str = "https://safaricom.co.ke",
+        token_cache: Optional[TokenCache] = None,
+        http_client: Optional[httpx.Client] = None,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        idempotency_store: Optional[IdempotencyStore] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        initiator_password: Optional[str] = None,
+        certificate_path: Optional[str] = None,
+        credential_cache: Optional[SecurityCredentialCache] = None,
+        validator: Optional[PayloadValidator] = None,
+        response_mode: str = JSON,
     ):
         """
         Initializes an instance of MpesaBase with the specified environment and
@@ -41,7 +170,55 @@ class MpesaBase:
             sandbox).
             live_url (str): URL for the live production environment (default is
             Safaricom's live URL).
+            token_cache (Optional[TokenCache]): Cache used to share access tokens;
+            defaults to the process-wide cache.
+            http_client (Optional[httpx.Client]): Existing client to share between
+            instances; it is not closed by `close()`.
+            limits (Optional[httpx.Limits]): Connection pool limits for the client
+            created by this instance.
+            http2 (bool): Enables HTTP/2 on the client created by this instance;
+            requires the `h2` package.
+            rate_limiter (Optional[RateLimiter]): Limiter pacing requests per
+            endpoint; share one instance between clients using the same consumer key.
+            retry_policy (Optional[RetryPolicy]): Retry policy for API requests;
+            defaults to RETRY_COUNT retries with exponential backoff and jitter.
+            timeout (Optional[httpx.Timeout]): Timeouts of the client created by
+            this instance; defaults to TIMEOUT_SECONDS with a shorter connect
+            timeout.
+            idempotency_store (Optional[IdempotencyStore]): Records B2C payments and
+            reversals by OriginatorConversationID and TransactionID so that a
+            retried call returns the cached response instead of paying twice.
+            transport (Optional[httpx.BaseTransport]): Transport of the client
+            created by this instance; defaults to httpx's network transport. Use
+            `DarajaSimulator.transport()` to run against the local simulator.
+            instrumentation (Optional[Instrumentation]): Hooks called on the
+            request path; share one MetricsCollector between clients to aggregate
+            per-endpoint metrics.
+            circuit_breaker (Optional[CircuitBreaker]): Fails requests fast with
+            CircuitOpenError while an endpoint keeps failing; share one instance
+            between clients so they see the same endpoint health.
+            initiator_password (Optional[str]): Initiator password from which the
+            SecurityCredential of B2C, balance, transaction status and reversal
+            requests is generated when they are called with
+            security_credential=None.
+            certificate_path (Optional[str]): Path of Safaricom's sandbox or
+            production certificate matching env; requires the `cryptography`
+            package.
+            credential_cache (Optional[SecurityCredentialCache]): Cache of
+            generated credentials; defaults to the process-wide cache.
+            validator (Optional[PayloadValidator]): Rejects invalid payloads with
+            ValidationError before they are sent, e.g. malformed phone numbers,
+            out of range amounts or over-long remarks.
+            response_mode (str): "json" returns decoded dicts; "model" returns
+            MpesaResponse objects that decode the body only when a field is
+            read; "raw" returns the response body as bytes, e.g. to store or
+            forward it unparsed.
         """
+        if response_mode not in RESPONSE_MODES:
+            raise ValueError(
+                f"Unknown response_mode {response_mode}; expected one of "
+                f"{', '.join(RESPONSE_MODES)}."
+            )
 
         self.env = env
         self.app_key = app_key
@@ -49,12 +226,160 @@ class MpesaBase:
         self.sandbox_url = sandbox_url
         self.live_url = live_url
         self.token: Optional[str] = None
+        self.token_cache = (
+            token_cache if token_cache is not None else default_token_cache
+        )
+        self.limits = limits or httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+        self.http2 = http2
+        self._client: Optional[httpx.Client] = http_client
+        self._owns_client = http_client is None
+        self._client_lock = threading.Lock()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.timeout = timeout or httpx.Timeout(
+            TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS
+        )
+        self.idempotency_store = idempotency_store
+        self.transport = transport
+        self.instrumentation = instrumentation
+        self.circuit_breaker = circuit_breaker
+        self.initiator_password = initiator_password
+        self.certificate_path = certificate_path
+        self.credential_cache = (
+            credential_cache
+            if credential_cache is not None
+            else default_security_credential_cache
+        )
+        self.validator = validator
+        self.response_mode = response_mode
+        # Per-instance request state reused across calls: resolved endpoint URLs
+        # and the headers built for the current access token.
+        self._urls: Dict[str, str] = {}
+        self._cached_headers: Tuple[Optional[str], Dict[str, str]] = (None, {})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def client(self) -> httpx.Client:
+        """Returns the pooled HTTP client, creating it on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        limits=self.limits,
+                        http2=self.http2,
+                        timeout=self.timeout,
+                        transport=self.transport,
+                    )
+        return self._client
+
+    def close(self) -> None:
+        """Closes the pooled HTTP client if it was created by this instance."""
+        with self._client_lock:
+            if self._client is not None and self._owns_client:
+                self._client.close()
+                self._client = None
+
+    @property
+    def authentication_token(self) -> Optional[str]:
+        """Returns the most recently obtained access token, if any."""
+        return self.token
+
+    def warmup(self) -> Optional[str]:
+        """
+        Fetches an access token and opens a pooled connection before the first API
+        request. Constructors perform no network I/O, so call this at startup to
+        move the authentication round-trip off the first request's latency.
+
+        Returns:
+            Optional[str]: The access token.
+
+        Raises:
+            ValueError: Raised if app_key or app_secret is not provided.
+            httpx.HTTPStatusError: Raised if the authentication request fails.
+        """
+        return self.get_token()
+
+    def security_credential(self) -> str:
+        """
+        Returns the SecurityCredential for the configured initiator password,
+        encrypting it with the configured certificate on first use.
+
+        Returns:
+            str: Base64 encoded encryption of the initiator password.
+
+        Raises:
+            ValueError: Raised if initiator_password or certificate_path is missing.
+            ImportError: Raised if the cryptography package is not installed.
+        """
+        if not self.initiator_password or not self.certificate_path:
+            raise ValueError(
+                "initiator_password and certificate_path must be provided to "
+                "generate a security credential."
+            )
+        return self.credential_cache.get(
+            self.env, self.initiator_password, self.certificate_path
+        )
+
+    def _security_credential(self, security_credential: Optional[str]) -> str:
+        """Returns security_credential, generating it when it is None."""
+        if security_credential is None:
+            return self.security_credential()
+        return security_credential
+
+    @property
+    def base_url(self) -> str:
+        """Returns the base URL for the configured environment."""
+        return self.live_url if self.env == "production" else self.sandbox_url
+
+    def _token_key(self) -> TokenKey:
+        """Returns the key under which this instance's token is cached."""
+        return token_cache_key(self.env, self.app_key, self.sandbox_url, self.live_url)
+
+    def get_token(self) -> Optional[str]:
+        """
+        Returns an access token, reusing a cached one while it is still fresh.
+
+        A new token is requested through `authenticate()` only when the cache holds
+        no token for this environment, consumer key and base URL, or when the cached
+        token is about to expire. Concurrent callers share a single refresh.
+
+        Returns:
+            Optional[str]: The access token for the "Bearer" authorization header.
+
+        Raises:
+            ValueError: Raised if app_key or app_secret is not provided.
+            httpx.HTTPStatusError: Raised if the authentication request returns a
+            non-200 status code.
+        """
+        self._require_credentials()
+
+        key = self._token_key()
+        token = self.token_cache.get(key)
+        if token is None:
+            # Single-flight: only the first caller to take the lock authenticates,
+            # the others find its token in the cache once the lock is released.
+            with self.token_cache.refresh_lock(key):
+                token = self.token_cache.get(key)
+                if token is None:
+                    return self.authenticate()
+
+        self.token = token
+        return token
 
     def authenticate(self) -> Optional[str]:
         """
         Authenticates with the Mpesa API using Basic Auth and fetches an access token.
-        The token obtained is stored in the `self.token` attribute for reuse in other
-        API calls.
+        The token obtained is stored in the `self.token` attribute and in the token
+        cache for reuse in other API calls, together with its `expires_in` lifetime.
 
         The method dynamically chooses the appropriate environment URL based on the
         `env` attribute.
@@ -70,43 +395,507 @@ class MpesaBase:
             httpx.HTTPStatusError: Raised if the authentication request returns a
             non-200 status code.
         """
-        # Validation for required credentials
+        self._require_credentials()
+
+        try:
+            response = self.client.get(self._url(AUTH_PATH), auth=self._basic_auth())
+        except httpx.RequestError as err:
+            raise self._authentication_error(err)
+        return self._accept_token(response)
+
+    def _require_credentials(self) -> None:
+        """Raises ValueError if app_key or app_secret is not provided."""
         if not self.app_key or not self.app_secret:
             raise ValueError(
                 "App key and app secret must be provided for authentication."
             )
 
-        # Determine the base URL based on the environment
-        base_url = self.live_url if self.env == "production" else self.sandbox_url
-        auth_url = f"{base_url}/oauth/v1/generate?grant_type=client_credentials"
+    def _basic_auth(self) -> httpx.BasicAuth:
+        """Returns the Basic Auth credentials of the authentication request."""
+        return httpx.BasicAuth(username=self.app_key, password=self.app_secret)
+
+    def _accept_token(self, response: httpx.Response) -> str:
+        """
+        Reads the access token from an authentication response and stores it in
+        `self.token` and in the token cache, together with its `expires_in`
+        lifetime.
+
+        Raises:
+            httpx.HTTPStatusError: Raised if the response has a non-200 status code.
+            ValueError: Raised if the response does not contain an access token.
+        """
+        try:
+            response.raise_for_status()
+            token_data = response.json()
+            token = token_data.get("access_token")
+            if not token:
+                raise ValueError(
+                    "Authentication failed: access_token not found in response."
+                )
+        except (httpx.HTTPStatusError, ValueError) as err:
+            raise self._authentication_error(err)
+
+        self.token = token
+        expires_in = token_data.get("expires_in", 3599)
+        self.token_cache.set(self._token_key(), token, expires_in)
+        return token
+
+    def _authentication_error(self, error: Exception) -> Exception:
+        """Reports a failed authentication and returns error to be re-raised."""
+        if isinstance(error, httpx.HTTPStatusError):
+            logger.warning(
+                "Authentication failed with status %s: %s",
+                error.response.status_code,
+                error.request.url,
+            )
+        else:
+            logger.warning("An error occurred during authentication: %s", error)
+        return error
+
+    def _headers(self, token: Optional[str]) -> Dict[str, str]:
+        """
+        Returns the headers of an authenticated JSON request. The dict is rebuilt
+        only when the access token changes and must not be modified.
+        """
+        cached_token, headers = self._cached_headers
+        if token != cached_token or not headers:
+            headers = {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            }
+            self._cached_headers = (token, headers)
+        return headers
+
+    def _url(self, path: str) -> str:
+        """
+        Returns the absolute URL of an endpoint path. URLs are resolved once per
+        instance, so env, sandbox_url and live_url must not change after the
+        first request.
+        """
+        url = self._urls.get(path)
+        if url is None:
+            url = self._urls[path] = f"{self.base_url}{path}"
+        return url
+
+    def _call(
+        self,
+        endpoint: Endpoint,
+        *values: Any,
+        idempotency_key: Optional[str] = None,
+    ) -> Any:
+        """
+        Sends a request to endpoint with values filled into its payload template.
+
+        Args:
+            endpoint (Endpoint): Descriptor of the operation.
+            *values (Any): Values of the endpoint's variable fields.
+            idempotency_key (Optional[str]): Key under which the request is recorded
+            in the idempotency store, if one is configured.
+
+        Returns:
+            Any: Parsed JSON response from the Mpesa API.
+
+        Raises:
+            ValidationError: Raised if the validator rejects the payload.
+        """
+        payload = endpoint.payload(*values)
+        if self.validator is not None:
+            self.validator.validate(endpoint.path, payload, endpoint.operation)
+        return self._post(
+            endpoint.path,
+            payload,
+            endpoint.operation,
+            idempotency_key=idempotency_key,
+        )
+
+    def _send(
+        self,
+        path: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+    ) -> httpx.Response:
+        """
+        Sends a POST request to a Mpesa endpoint, retrying transient failures
+        according to the retry policy.
+
+        Args:
+            path (str): Endpoint path relative to the environment's base URL.
+            headers (Dict[str, str]): Request headers.
+            payload (Dict[str, Any]): JSON body of the request.
+            idempotency_key (Optional[str]): Idempotency key of the request; keyed
+            requests are not retried after an ambiguous gateway error, which
+            Mpesa may have processed.
+
+        Returns:
+            httpx.Response: The final response, which may still be an error.
+
+        Raises:
+            httpx.RequestError: Raised when the last attempt fails in transport.
+            CircuitOpenError: Raised if the endpoint's circuit is open.
+        """
+        policy = self.retry_policy
+        deadline = policy.start()
+        url = self._url(path)
+        # Serialized once, so retries resend the same bytes.
+        body = serialization.dumps(payload)
+        attempt = 0
+        response: Optional[httpx.Response] = None
+        error: Optional[httpx.RequestError] = None
+
+        while True:
+            probe = self._admit_retry(path, attempt, error)
+            if probe is None:
+                return response
 
-        # Setting up Basic Auth credentials
-        auth = httpx.BasicAuth(username=self.app_key, password=self.app_secret)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(path)
 
-        with httpx.Client() as client:
+            timer = self._phase_timer()
+            started = time.perf_counter()
             try:
-                response = client.get(auth_url, auth=auth)
-                response.raise_for_status()
+                response = self.client.post(
+                    url,
+                    headers=headers,
+                    content=body,
+                    timeout=policy.bound_timeout(self.timeout, deadline),
+                    extensions=None if timer is None else {"trace": timer},
+                )
+                error = None
+            except httpx.RequestError as err:
+                response, error = None, err
 
-                # Parsing access token from JSON response
-                token_data = response.json()
-                self.token = token_data.get("access_token")
+            delay = self._retry_delay(
+                path,
+                attempt,
+                deadline,
+                started,
+                timer,
+                probe,
+                response,
+                error,
+                idempotency_key,
+            )
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            time.sleep(delay)
+            attempt += 1
 
-                if not self.token:
-                    raise ValueError(
-                        "Authentication failed: access_token not found in response."
-                    )
+    def _admit_retry(
+        self, path: str, attempt: int, error: Optional[httpx.RequestError]
+    ) -> Optional[bool]:
+        """
+        Asks the circuit breaker, if any, to admit an attempt of a request.
+
+        Args:
+            path (str): Endpoint path of the request.
+            attempt (int): Zero-based index of the attempt.
+            error (Optional[httpx.RequestError]): Transport error of the previous
+            attempt, if any.
+
+        Returns:
+            Optional[bool]: True if the attempt is a half-open probe, or None if
+            the circuit opened while backing off and the previous response should
+            be returned.
+
+        Raises:
+            CircuitOpenError: Raised if the circuit is open before the first
+            attempt.
+            httpx.RequestError: The error of the previous attempt, raised if the
+            circuit opened while backing off.
+        """
+        try:
+            return self._admit(path)
+        except CircuitOpenError:
+            if attempt == 0:
+                raise
+            # Give up with the outcome of the last attempt.
+            if error is not None:
+                raise error
+            return None
+
+    def _retry_delay(
+        self,
+        path: str,
+        attempt: int,
+        deadline: Optional[float],
+        started: float,
+        timer: Optional[PhaseTimer],
+        probe: bool,
+        response: Optional[httpx.Response],
+        error: Optional[httpx.RequestError],
+        idempotency_key: Optional[str],
+    ) -> Optional[float]:
+        """
+        Records a finished attempt and returns the seconds to wait before the next
+        one, or None if the outcome of this attempt is final.
+        """
+        self._attempt_finished(path, attempt, started, timer, response, error, probe)
+        if error is not None:
+            delay = self.retry_policy.next_delay(attempt, deadline, error=error)
+        elif idempotency_key is not None and response.status_code in AMBIGUOUS_STATUSES:
+            # Mpesa may have processed the request; the idempotency store must see
+            # the outcome instead of a blind resend.
+            delay = None
+        else:
+            delay = self.retry_policy.next_delay(attempt, deadline, response=response)
+        if delay is not None and self.instrumentation is not None:
+            self.instrumentation.retry_scheduled(path, attempt, delay)
+        return delay
+
+    def _admit(self, path: str) -> bool:
+        """
+        Asks the circuit breaker, if any, to admit an attempt.
+
+        Returns:
+            bool: True if the attempt is a half-open probe.
+
+        Raises:
+            CircuitOpenError: Raised if the endpoint's circuit is open.
+        """
+        if self.circuit_breaker is None:
+            return False
+        return self.circuit_breaker.allow(self.env, path)
 
-                return self.token
+    def _phase_timer(self) -> Optional[PhaseTimer]:
+        """Returns a timer for the next attempt if phase timings are wanted."""
+        if self.instrumentation is None or not self.instrumentation.trace_phases:
+            return None
+        return PhaseTimer()
 
-            except httpx.HTTPStatusError as http_err:
-                # Handle and log any HTTP errors, providing feedback on status code and
-                # URL
-                print(f"{http_err.response.status_code} - {http_err.request.url}")
-                raise http_err
+    def _attempt_finished(
+        self,
+        path: str,
+        attempt: int,
+        started: float,
+        timer: Optional[PhaseTimer],
+        response: Optional[httpx.Response],
+        error: Optional[BaseException],
+        probe: bool = False,
+    ) -> None:
+        """
+        Reports a finished HTTP attempt to the circuit breaker and the
+        instrumentation, if any.
+        """
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(self.env, path, probe, response, error)
+        if self.instrumentation is None:
+            return
+        self.instrumentation.attempt_finished(
+            path,
+            attempt,
+            None if response is None else response.status_code,
+            error,
+            time.perf_counter() - started,
+            {} if timer is None else timer.phases,
+        )
+
+    def _claim(
+        self, idempotency_key: Optional[str], payload: Dict[str, Any]
+    ) -> Optional[IdempotencyRecord]:
+        """
+        Claims idempotency_key for a request about to be sent.
+
+        Returns:
+            Optional[IdempotencyRecord]: The record of an earlier request with the
+            same key, or None if the request may be sent.
+        """
+        if idempotency_key is None or self.idempotency_store is None:
+            return None
+        return self.idempotency_store.claim(idempotency_key, fingerprint(payload))
+
+    def _settle(
+        self,
+        idempotency_key: Optional[str],
+        data: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Records the outcome of a request sent under idempotency_key, given the
+        decoded response body as data. Keys of requests Mpesa definitely rejected
+        are released; keys whose outcome is unknown stay pending until they are
+        reconciled.
+        """
+        if idempotency_key is None or self.idempotency_store is None:
+            return
+        if error is None:
+            self.idempotency_store.complete(idempotency_key, data)
+        elif is_definite_failure(error):
+            self.idempotency_store.release(idempotency_key)
+
+    def _post(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        operation: str,
+        idempotency_key: Optional[str] = None,
+    ) -> Any:
+        """
+        Sends a request through `_request()` and reports it to the instrumentation.
 
-            except (httpx.RequestError, ValueError) as e:
-                # Handle general request or parsing errors, with descriptive
-                # error logging
-                print(f"An error occurred during authentication: {e}")
-                raise e
+        Args:
+            path (str): Endpoint path relative to the environment's base URL.
+            payload (Dict[str, Any]): JSON body of the request.
+            operation (str): Human readable name of the operation used in errors.
+            idempotency_key (Optional[str]): Key under which the request is recorded
+            in the idempotency store, if one is configured.
+
+        Returns:
+            Any: Parsed JSON response from the Mpesa API.
+
+        Raises:
+            httpx.HTTPStatusError: Raised for HTTP errors during the request.
+            ValueError: Raised for invalid or unsuccessful response from Mpesa API.
+        """
+        if self.instrumentation is None:
+            return self._request(path, payload, operation, idempotency_key)[0]
+
+        started = self._request_started(path, operation)
+        try:
+            result, status_code = self._request(
+                path, payload, operation, idempotency_key
+            )
+        except Exception as err:
+            self._request_finished(path, operation, started, error=err)
+            raise
+        self._request_finished(path, operation, started, status_code)
+        return result
+
+    def _request_started(self, path: str, operation: str) -> float:
+        """Reports a request to the instrumentation and returns its start time."""
+        self.instrumentation.request_started(path, operation)
+        return time.perf_counter()
+
+    def _request_finished(
+        self,
+        path: str,
+        operation: str,
+        started: float,
+        status_code: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Reports the outcome of a request to the instrumentation."""
+        if error is not None:
+            status_code = _error_status(error)
+        self.instrumentation.request_finished(
+            path, operation, status_code, error, time.perf_counter() - started
+        )
+
+    def _request(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        operation: str,
+        idempotency_key: Optional[str] = None,
+    ) -> Tuple[Any, Optional[int]]:
+        """
+        Sends an authenticated JSON POST request to a Mpesa endpoint over the pooled
+        client and returns the parsed JSON response. A request rejected because of
+        an expired access token is replayed once with a refreshed token.
+
+        Args:
+            path (str): Endpoint path relative to the environment's base URL.
+            payload (Dict[str, Any]): JSON body of the request.
+            operation (str): Human readable name of the operation used in errors.
+            idempotency_key (Optional[str]): Key under which the request is recorded
+            in the idempotency store, if one is configured.
+
+        Returns:
+            Tuple[Any, Optional[int]]: Parsed JSON response from the Mpesa API and
+            its status code, which is None for an idempotent replay.
+
+        Raises:
+            httpx.HTTPStatusError: Raised for HTTP errors during the request.
+            DuplicateRequestError: Raised if a request with the same idempotency key
+            is still pending or had a different payload.
+            CircuitOpenError: Raised if the endpoint's circuit is open.
+            ValueError: Raised for invalid or unsuccessful response from Mpesa API.
+        """
+        started = time.perf_counter()
+        token = self.get_token()
+        self._auth_acquired(path, started)
+
+        record = self._claim(idempotency_key, payload)
+        if record is not None:
+            return self._replay(path, payload, record), None
+
+        try:
+            response = self._send(path, self._headers(token), payload, idempotency_key)
+            if self._refresh_rejected(response, token):
+                response = self._send(
+                    path, self._headers(self.get_token()), payload, idempotency_key
+                )
+            result, data = self._result(path, response, idempotency_key)
+        except (httpx.HTTPError, ValueError) as err:
+            self._settle(idempotency_key, error=err)
+            raise self._request_error(operation, err)
+
+        self._settle(idempotency_key, data)
+        return result, response.status_code
+
+    def _auth_acquired(self, path: str, started: float) -> None:
+        """Reports the time spent obtaining the access token of a request."""
+        if self.instrumentation is not None:
+            self.instrumentation.auth_acquired(path, time.perf_counter() - started)
+
+    def _replay(
+        self, path: str, payload: Dict[str, Any], record: IdempotencyRecord
+    ) -> Any:
+        """
+        Returns the recorded response of an earlier request with the same
+        idempotency key.
+
+        Raises:
+            DuplicateRequestError: Raised if the earlier request is still pending or
+            had a different payload.
+        """
+        return replayed_response(self.response_mode, path, record.replay(payload))
+
+    def _refresh_rejected(self, response: httpx.Response, token: Optional[str]) -> bool:
+        """
+        Returns True if Mpesa rejected the request's access token, which expired or
+        was revoked before its reported lifetime. The token is dropped from the
+        cache, so that the request can be replayed once with a fresh one.
+        """
+        if not _token_rejected(response):
+            return False
+        self.token_cache.invalidate(self._token_key(), token)
+        return True
+
+    def _result(
+        self, path: str, response: httpx.Response, idempotency_key: Optional[str]
+    ) -> Tuple[Any, Any]:
+        """
+        Returns the body of a final response in the configured response mode, and
+        its decoded form if it is to be recorded under idempotency_key.
+
+        Raises:
+            httpx.HTTPStatusError: Raised if the status is not 2xx.
+            MalformedResponseError: Raised if the body is not valid JSON in "json"
+            mode, or in any mode when the response is recorded.
+        """
+        response.raise_for_status()
+        result = build_response(
+            self.response_mode, path, response.content, response.status_code
+        )
+        if idempotency_key is None or self.idempotency_store is None:
+            return result, None
+        return result, response_data(result)
+
+    def _request_error(self, operation: str, error: Exception) -> Exception:
+        """
+        Reports a failed request and returns the exception to raise: HTTP status
+        and circuit breaker errors as they are, and a ValueError caused by error
+        for transport and parsing errors.
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            logger.warning("HTTP error during %s: %s", operation, error)
+            return error
+        logger.warning("Error occurred during %s: %s", operation, error)
+        if isinstance(error, CircuitOpenError):
+            return error
+        wrapped = ValueError(f"An error occurred during the {operation}.")
+        wrapped.__cause__ = error
+        return wrapped
@@ -1,6 +1,6 @@
 from typing import Optional, Dict, Any
-import httpx
 from mpesa.api.auth import MpesaBase
+from mpesa.api.endpoints import B2C_PAYMENT
 
 
 class B2C(MpesaBase):
@@ -24,9 +24,10 @@ class B2C(MpesaBase):
         app_secret: Optional[str] = None,
         sandbox_url: str = "https://sandbox.safaricom.co.ke",
         live_url: str = "https://safaricom.co.ke",
+        **kwargs: Any,
     ):
         """
-        Initializes the B2C instance and authenticates using the MpesaBase class.
+        Initializes the B2C instance; authentication happens on the first request.
 
         Args:
             env (str): The environment in which to run; options are "sandbox" or
@@ -35,15 +36,15 @@ class B2C(MpesaBase):
             app_secret (Optional[str]): Consumer secret for the Mpesa API.
             sandbox_url (str): URL for Mpesa's sandbox environment.
             live_url (str): URL for Mpesa's production environment.
+            **kwargs: Additional options forwarded to MpesaBase, e.g. token_cache.
         """
-        super().__init__(env, app_key, app_secret, sandbox_url, live_url)
-        self.authentication_token: Optional[str] = self.authenticate()
+        super().__init__(env, app_key, app_secret, sandbox_url, live_url, **kwargs)
 
     def transact(
         self,
         originator_conversation_id: str,
         initiator_name: str,
-        security_credential: str,
+        security_credential: Optional[str],
         command_id: str,
         amount: str,
         party_a: int,
@@ -59,7 +60,8 @@ class B2C(MpesaBase):
         Args:
             originator_conversation_id (str): Unique ID to track the transaction.
             initiator_name (str): Username for transaction authentication.
-            security_credential (str): Encrypted credential from the developer portal.
+            security_credential (Optional[str]): Encrypted initiator password; pass
+            None to generate it from the client's initiator_password.
             command_id (str): Type of payment; options include "SalaryPayment",
             "BusinessPayment", "PromotionPayment".
             amount (str): Amount to be sent to the customer.
@@ -75,45 +77,22 @@ class B2C(MpesaBase):
 
         Raises:
             ValueError: Raised for invalid or unsuccessful response from Mpesa API.
+            DuplicateRequestError: Raised when an idempotency store is configured
+            and a payment with the same originator_conversation_id is pending.
             httpx.HTTPStatusError: Raised for HTTP errors during the request.
         """
-        payload = {
-            "OriginatorConversationID": originator_conversation_id,
-            "InitiatorName": initiator_name,
-            "SecurityCredential": security_credential,
-            "CommandID": command_id,
-            "Amount": amount,
-            "PartyA": party_a,
-            "PartyB": party_b,
-            "Remarks": remarks,
-            "QueueTimeOutURL": queue_timeout_url,
-            "ResultURL": result_url,
-            "Occassion": occassion,
-        }
-
-        headers = {
-            "Authorization": f"Bearer {self.authentication_token}",
-            "Content-Type": "application/json",
-        }
-
-        # Define URL based on environment
-        base_url = self.live_url if self.env == "production" else self.sandbox_url
-        saf_url = f"{base_url}/mpesa/b2c/v3/paymentrequest"
-
-        # Execute the request
-        with httpx.Client() as client:
-            try:
-                response = client.post(saf_url, headers=headers, json=payload)
-                response.raise_for_status()  # Ensures HTTP errors are raised
-
-                return response.json()
-
-            except httpx.HTTPStatusError as exc:
-                print(f"HTTP error during B2C transaction: {response.json()}")
-                raise exc
-
-            except (ValueError, httpx.RequestError) as e:
-                print(f"Error occurred during B2C transaction: {e}")
-                raise ValueError(
-                    "An error occurred during the transaction process."
-                ) from e
+        return self._call(
+            B2C_PAYMENT,
+            originator_conversation_id,
+            initiator_name,
+            self._security_credential(security_credential),
+            command_id,
+            amount,
+            party_a,
+            party_b,
+            remarks,
+            queue_timeout_url,
+            result_url,
+            occassion,
+            idempotency_key=originator_conversation_id,
+        )
@@ -0,0 +1,263 @@
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from mpesa.api.b2c import B2C
+
+
+class DisbursementResult(NamedTuple):
+    """Outcome of a single payout submitted by BulkDisbursement."""
+
+    originator_conversation_id: str
+    payout: Dict[str, Any]
+    response: Optional[Dict[str, Any]]
+    error: Optional[BaseException]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class DisbursementStats:
+    """
+    Thread-safe counters describing the progress of a bulk disbursement.
+
+    Attributes:
+        submitted (int): Payouts handed to the B2C API.
+        succeeded (int): Payouts acknowledged by Mpesa.
+        failed (int): Payouts that raised an error.
+        started_at (Optional[float]): Monotonic time the run started.
+        finished_at (Optional[float]): Monotonic time the run finished.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def _record(self, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds spent on the run so far."""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Completed payouts per second."""
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of completed payouts that failed."""
+        return self.failed / self.completed if self.completed else 0.0
+
+
+class BulkDisbursement:
+    """
+    BulkDisbursement submits large numbers of B2C payouts with bounded concurrency
+    over the connection pool of a single B2C instance.
+
+    Payout records are dictionaries of `B2C.transact()` keyword arguments. Fields
+    shared by every payout (initiator, security credential, callback URLs, ...) can
+    be supplied once through `defaults`. Records without an
+    `originator_conversation_id` are assigned a random one.
+
+    Records are consumed lazily, so arbitrarily large streams can be processed while
+    at most `concurrency` payouts are in flight.
+
+    Attributes:
+        b2c (B2C): Client used to submit payouts; an AsyncB2C instance is required
+        for `arun()`.
+        concurrency (int): Maximum number of payouts in flight.
+        defaults (Dict[str, Any]): Keyword arguments applied to every payout.
+        stats (DisbursementStats): Counters for the current or last run.
+
+    Methods:
+        run(payouts) -> Iterator[DisbursementResult]: Submits payouts from worker
+        threads and yields results as they complete.
+        arun(payouts) -> AsyncIterator[DisbursementResult]: Submits payouts as
+        asyncio tasks and yields results as they complete.
+    """
+
+    def __init__(
+        self,
+        b2c: B2C,
+        concurrency: int = 10,
+        defaults: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initializes the bulk disbursement engine.
+
+        Args:
+            b2c (B2C): B2C or AsyncB2C client whose connection pool is shared by all
+            payouts. Its pool limits should allow `concurrency` connections.
+            concurrency (int): Maximum number of payouts in flight.
+            defaults (Optional[Dict[str, Any]]): Keyword arguments of
+            `B2C.transact()` applied to every payout unless overridden by a record.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+
+        self.b2c = b2c
+        self.concurrency = concurrency
+        self.defaults = dict(defaults or {})
+        self.stats = DisbursementStats()
+
+    def _prepare(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Merges a payout record with the defaults and assigns a conversation ID."""
+        payout = {**self.defaults, **record}
+        if not payout.get("originator_conversation_id"):
+            payout["originator_conversation_id"] = uuid.uuid4().hex
+        return payout
+
+    def _start(self) -> None:
+        self.stats = DisbursementStats()
+        self.stats.started_at = time.monotonic()
+
+    def _finish(self) -> None:
+        self.stats.finished_at = time.monotonic()
+
+    def _submit(self, payout: Dict[str, Any]) -> DisbursementResult:
+        """Submits a single payout, capturing any error in the result."""
+        try:
+            response = self.b2c.transact(**payout)
+        except Exception as err:
+            self.stats._record(False)
+            return DisbursementResult(
+                payout["originator_conversation_id"], payout, None, err
+            )
+        self.stats._record(True)
+        return DisbursementResult(
+            payout["originator_conversation_id"], payout, response, None
+        )
+
+    def run(self, payouts: Iterable[Dict[str, Any]]) -> Iterator[DisbursementResult]:
+        """
+        Submits payouts from a pool of worker threads.
+
+        Args:
+            payouts (Iterable[Dict[str, Any]]): Payout records, consumed lazily.
+
+        Yields:
+            DisbursementResult: The outcome of each payout in completion order.
+        """
+        self._start()
+        records = iter(payouts)
+        pending = set()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                while True:
+                    for record in records:
+                        payout = self._prepare(record)
+                        pending.add(executor.submit(self._submit, payout))
+                        self.stats.submitted += 1
+                        if len(pending) >= self.concurrency:
+                            break
+
+                    if not pending:
+                        break
+
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+                self._finish()
+
+    async def _asubmit(self, payout: Dict[str, Any]) -> DisbursementResult:
+        """Submits a single payout through an AsyncB2C client."""
+        try:
+            response = await self.b2c.transact(**payout)
+        except Exception as err:
+            self.stats._record(False)
+            return DisbursementResult(
+                payout["originator_conversation_id"], payout, None, err
+            )
+        self.stats._record(True)
+        return DisbursementResult(
+            payout["originator_conversation_id"], payout, response, None
+        )
+
+    async def arun(
+        self,
+        payouts: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+    ) -> AsyncIterator[DisbursementResult]:
+        """
+        Submits payouts as asyncio tasks through an AsyncB2C client.
+
+        Args:
+            payouts (Union[Iterable, AsyncIterable]): Payout records, consumed lazily.
+
+        Yields:
+            DisbursementResult: The outcome of each payout in completion order.
+        """
+        self._start()
+        if hasattr(payouts, "__aiter__"):
+            records = payouts.__aiter__()
+        else:
+            records = _aiter_sync(payouts)
+        pending = set()
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < self.concurrency:
+                    try:
+                        record = await records.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    payout = self._prepare(record)
+                    pending.add(asyncio.ensure_future(self._asubmit(payout)))
+                    self.stats.submitted += 1
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            self._finish()
+
+
+async def _aiter_sync(iterable: Iterable[Any]) -> AsyncIterator[Any]:
+    """Adapts a synchronous iterable to the async iterator protocol."""
+    for item in iterable:
+        yield item
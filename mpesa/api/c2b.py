@@ -1,6 +1,6 @@
 from typing import Optional, Dict, Any
-import httpx
 from mpesa.api.auth import MpesaBase
+from mpesa.api.endpoints import C2B_REGISTER, C2B_SIMULATE
 
 
 class C2B(MpesaBase):
@@ -25,9 +25,10 @@ class C2B(MpesaBase):
         app_secret: Optional[str] = None,
         sandbox_url: Optional[str] = "https://sandbox.safaricom.co.ke",
         live_url: Optional[str] = "https://safaricom.co.ke",
+        **kwargs: Any,
     ):
         """
-        Initializes the C2B instance and authenticates using the MpesaBase class.
+        Initializes the C2B instance; authentication happens on the first request.
 
         Args:
             env (str): The environment in which to run; options are "sandbox" or
@@ -36,9 +37,9 @@ class C2B(MpesaBase):
             app_secret (Optional[str]): Consumer secret for the Mpesa API.
             sandbox_url (Optional[str]): URL for Mpesa's sandbox environment.
             live_url (Optional[str]): URL for Mpesa's production environment.
+            **kwargs: Additional options forwarded to MpesaBase, e.g. token_cache.
         """
-        super().__init__(env, app_key, app_secret, sandbox_url, live_url)
-        self.authentication_token: Optional[str] = self.authenticate()
+        super().__init__(env, app_key, app_secret, sandbox_url, live_url, **kwargs)
 
     def register(
         self,
@@ -67,29 +68,9 @@ class C2B(MpesaBase):
             ValueError: Raised for invalid or unsuccessful response from Mpesa API.
             httpx.HTTPStatusError: Raised for HTTP errors during the request.
         """
-        payload = {
-            "ShortCode": shortcode,
-            "ResponseType": response_type,
-            "ConfirmationURL": confirmation_url,
-            "ValidationURL": validation_url,
-        }
-
-        headers = {
-            "Authorization": f"Bearer {self.authentication_token}",
-            "Content-Type": "application/json",
-        }
-
-        base_url = self.live_url if self.env == "production" else self.sandbox_url
-        saf_url = f"{base_url}/mpesa/c2b/v1/registerurl"
-
-        with httpx.Client() as client:
-            try:
-                response = client.post(saf_url, headers=headers, json=payload)
-                response.raise_for_status()  # Raises HTTP errors if status is not 200
-                return response.json()
-            except httpx.HTTPStatusError as exc:
-                print(f"HTTP error during C2B registration: {exc}")
-                raise exc
+        return self._call(
+            C2B_REGISTER, shortcode, response_type, confirmation_url, validation_url
+        )
 
     def simulate(
         self,
@@ -120,27 +101,6 @@ class C2B(MpesaBase):
             ValueError: Raised for invalid or unsuccessful response from Mpesa API.
             httpx.HTTPStatusError: Raised for HTTP errors during the request.
         """
-        payload = {
-            "ShortCode": shortcode,
-            "CommandID": command_id,
-            "Amount": amount,
-            "Msisdn": msisdn,
-            "BillRefNumber": bill_ref_number,
-        }
-
-        headers = {
-            "Authorization": f"Bearer {self.authentication_token}",
-            "Content-Type": "application/json",
-        }
-
-        base_url = self.live_url if self.env == "production" else self.sandbox_url
-        saf_url = f"{base_url}/mpesa/c2b/v1/simulate"
-
-        with httpx.Client() as client:
-            try:
-                response = client.post(saf_url, headers=headers, json=payload)
-                response.raise_for_status()  # Raises HTTP errors if status is not 200
-                return response.json()
-            except httpx.HTTPStatusError as exc:
-                print(f"HTTP error during C2B transaction simulation: {exc}")
-                raise exc
+        return self._call(
+            C2B_SIMULATE, shortcode, command_id, amount, msisdn, bill_ref_number
+        )
@@ -0,0 +1,391 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from mpesa.api import serialization
+
+ACCEPTED = {"ResultCode": 0, "ResultDesc": "Accepted"}
+REJECTED = {"ResultCode": "C2B00016", "ResultDesc": "Rejected"}
+
+
+def _flatten(items: Optional[Iterable[Dict[str, Any]]], name: str) -> Dict[str, Any]:
+    """Turns Daraja's list of {name: ..., "Value": ...} items into a dict."""
+    if not items:
+        return {}
+    if isinstance(items, dict):  # Single items are sometimes sent unwrapped
+        items = [items]
+    return {item.get(name): item.get("Value") for item in items}
+
+
+class StkCallback:
+    """
+    Result of an STK push delivered to the `callback_url` given to `stk_push()`.
+
+    The CallbackMetadata item list is flattened once into `metadata`, so the
+    accessors below are dictionary lookups.
+    """
+
+    __slots__ = (
+        "merchant_request_id",
+        "checkout_request_id",
+        "result_code",
+        "result_desc",
+        "metadata",
+    )
+
+    def __init__(self, body: Dict[str, Any]):
+        callback = body["Body"]["stkCallback"]
+        self.merchant_request_id: str = callback.get("MerchantRequestID")
+        self.checkout_request_id: str = callback.get("CheckoutRequestID")
+        self.result_code: int = int(callback.get("ResultCode", -1))
+        self.result_desc: str = callback.get("ResultDesc")
+        metadata = callback.get("CallbackMetadata") or {}
+        self.metadata: Dict[str, Any] = _flatten(metadata.get("Item"), "Name")
+
+    def __repr__(self) -> str:
+        return (
+            f"StkCallback(checkout_request_id={self.checkout_request_id!r}, "
+            f"result_code={self.result_code!r})"
+        )
+
+    @property
+    def ok(self) -> bool:
+        return self.result_code == 0
+
+    @property
+    def amount(self) -> Optional[float]:
+        return self.metadata.get("Amount")
+
+    @property
+    def mpesa_receipt_number(self) -> Optional[str]:
+        return self.metadata.get("MpesaReceiptNumber")
+
+    @property
+    def transaction_date(self) -> Optional[int]:
+        return self.metadata.get("TransactionDate")
+
+    @property
+    def phone_number(self) -> Optional[int]:
+        return self.metadata.get("PhoneNumber")
+
+
+class C2BNotification:
+    """
+    C2B validation or confirmation request sent to the URLs registered with
+    `C2B.register()`.
+    """
+
+    __slots__ = (
+        "kind",
+        "transaction_type",
+        "trans_id",
+        "trans_time",
+        "trans_amount",
+        "business_short_code",
+        "bill_ref_number",
+        "invoice_number",
+        "org_account_balance",
+        "third_party_trans_id",
+        "msisdn",
+        "first_name",
+        "middle_name",
+        "last_name",
+    )
+
+    def __init__(self, body: Dict[str, Any], kind: str = "confirmation"):
+        self.kind = kind
+        self.transaction_type: str = body.get("TransactionType")
+        self.trans_id: str = body.get("TransID")
+        self.trans_time: str = body.get("TransTime")
+        self.trans_amount: str = body.get("TransAmount")
+        self.business_short_code: str = body.get("BusinessShortCode")
+        self.bill_ref_number: str = body.get("BillRefNumber")
+        self.invoice_number: str = body.get("InvoiceNumber")
+        self.org_account_balance: str = body.get("OrgAccountBalance")
+        self.third_party_trans_id: str = body.get("ThirdPartyTransID")
+        self.msisdn: str = body.get("MSISDN")
+        self.first_name: str = body.get("FirstName")
+        self.middle_name: str = body.get("MiddleName")
+        self.last_name: str = body.get("LastName")
+
+    def __repr__(self) -> str:
+        return f"C2BNotification(kind={self.kind!r}, trans_id={self.trans_id!r})"
+
+
+class ResultCallback:
+    """
+    Asynchronous result delivered to the `result_url` of B2C, reversal, account
+    balance and transaction status requests.
+
+    ResultParameters and ReferenceData item lists are flattened once into
+    `parameters` and `reference_data`.
+    """
+
+    __slots__ = (
+        "result_type",
+        "result_code",
+        "result_desc",
+        "originator_conversation_id",
+        "conversation_id",
+        "transaction_id",
+        "parameters",
+        "reference_data",
+    )
+
+    def __init__(self, body: Dict[str, Any]):
+        result = body["Result"]
+        self.result_type: int = result.get("ResultType")
+        self.result_code: int = int(result.get("ResultCode", -1))
+        self.result_desc: str = result.get("ResultDesc")
+        self.originator_conversation_id: str = result.get("OriginatorConversationID")
+        self.conversation_id: str = result.get("ConversationID")
+        self.transaction_id: str = result.get("TransactionID")
+        parameters = result.get("ResultParameters") or {}
+        self.parameters: Dict[str, Any] = _flatten(
+            parameters.get("ResultParameter"), "Key"
+        )
+        reference = result.get("ReferenceData") or {}
+        self.reference_data: Dict[str, Any] = _flatten(
+            reference.get("ReferenceItem"), "Key"
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(conversation_id={self.conversation_id!r}, "
+            f"result_code={self.result_code!r})"
+        )
+
+    @property
+    def ok(self) -> bool:
+        return self.result_code == 0
+
+
+class B2CResult(ResultCallback):
+    """Result of a `B2C.transact()` request."""
+
+    __slots__ = ()
+
+    @property
+    def transaction_amount(self) -> Optional[float]:
+        return self.parameters.get("TransactionAmount")
+
+    @property
+    def transaction_receipt(self) -> Optional[str]:
+        return self.parameters.get("TransactionReceipt")
+
+    @property
+    def receiver_party_public_name(self) -> Optional[str]:
+        return self.parameters.get("ReceiverPartyPublicName")
+
+
+class ReversalResult(ResultCallback):
+    """Result of a `Reversal.reverse()` request."""
+
+    __slots__ = ()
+
+
+class TransactionStatusResult(ResultCallback):
+    """Result of a `TransactionStatus.check_transaction_status()` request."""
+
+    __slots__ = ()
+
+
+class BalanceResult(ResultCallback):
+    """Result of a `Balance.get_balance()` request."""
+
+    __slots__ = ()
+
+    @property
+    def accounts(self) -> List[Tuple[str, str, str]]:
+        """Returns (account name, currency, available balance) for each account."""
+        balance = self.parameters.get("AccountBalance") or ""
+        accounts = []
+        for account in balance.split("&"):
+            fields = account.split("|")
+            if len(fields) >= 3:
+                accounts.append((fields[0], fields[1], fields[2]))
+        return accounts
+
+
+class TimeoutNotification(ResultCallback):
+    """Notification sent to a `queue_timeout_url` when a request timed out."""
+
+    __slots__ = ()
+
+
+# Parsers for each kind of callback handled by CallbackReceiver
+PARSERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "stk": StkCallback,
+    "c2b_validation": lambda body: C2BNotification(body, "validation"),
+    "c2b_confirmation": lambda body: C2BNotification(body, "confirmation"),
+    "b2c": B2CResult,
+    "reversal": ReversalResult,
+    "balance": BalanceResult,
+    "status": TransactionStatusResult,
+    "timeout": TimeoutNotification,
+}
+
+
+def parse_callback(kind: str, body: Union[bytes, str, Dict[str, Any]]) -> Any:
+    """
+    Parses a callback body into its typed result object.
+
+    Args:
+        kind (str): Kind of callback; one of the keys of PARSERS.
+        body (Union[bytes, str, Dict[str, Any]]): Raw or decoded JSON body.
+
+    Returns:
+        Any: StkCallback, C2BNotification or a ResultCallback subclass.
+
+    Raises:
+        ValueError: Raised for unknown kinds or malformed bodies.
+    """
+    parser = PARSERS.get(kind)
+    if parser is None:
+        raise ValueError(f"Unknown callback kind: {kind}.")
+    if not isinstance(body, dict):
+        body = serialization.loads(body)
+    try:
+        return parser(body)
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Malformed {kind} callback body.") from e
+
+
+class CallbackReceiver:
+    """
+    CallbackReceiver is an ASGI and WSGI application that receives Mpesa callbacks,
+    parses them into typed result objects and hands them to the application.
+
+    Each route maps a request path to a callback kind (see PARSERS). Parsed results
+    are passed to `handler` and/or put on `queue` (a `queue.Queue` for WSGI servers
+    or an `asyncio.Queue` for ASGI servers) and Mpesa receives an acknowledgement
+    straight away.
+
+    Attributes:
+        routes (Dict[str, str]): Callback kind keyed by request path.
+        handler (Optional[Callable[[Any], Any]]): Called with each parsed result.
+        queue (Optional[Any]): Queue receiving each parsed result via put_nowait.
+        validator (Optional[Callable[[C2BNotification], bool]]): Decides whether a
+        C2B validation request is accepted; accepts everything when None.
+
+    Methods:
+        dispatch(path, body) -> Tuple[int, Dict[str, Any]]: Parses and hands off a
+        callback, returning the HTTP status and acknowledgement body.
+        wsgi_app(environ, start_response): WSGI entry point.
+    """
+
+    def __init__(
+        self,
+        routes: Dict[str, str],
+        handler: Optional[Callable[[Any], Any]] = None,
+        queue: Optional[Any] = None,
+        validator: Optional[Callable[[C2BNotification], bool]] = None,
+    ):
+        """
+        Initializes the receiver.
+
+        Args:
+            routes (Dict[str, str]): Callback kind keyed by request path, e.g.
+            {"/mpesa/stk": "stk", "/mpesa/b2c/result": "b2c"}.
+            handler (Optional[Callable[[Any], Any]]): Called with each result.
+            queue (Optional[Any]): Queue receiving each result via put_nowait.
+            validator (Optional[Callable[[C2BNotification], bool]]): Accepts or
+            rejects C2B validation requests.
+        """
+        unknown = set(routes.values()) - set(PARSERS)
+        if unknown:
+            raise ValueError(f"Unknown callback kinds: {', '.join(sorted(unknown))}.")
+
+        self.routes = dict(routes)
+        self.handler = handler
+        self.queue = queue
+        self.validator = validator
+
+    def dispatch(self, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """
+        Parses a callback and hands it off to the handler and queue.
+
+        Args:
+            path (str): Request path the callback was delivered to.
+            body (bytes): Raw request body.
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: HTTP status code and JSON response body.
+        """
+        kind = self.routes.get(path)
+        if kind is None:
+            return 404, {"ResultCode": 1, "ResultDesc": "Not Found"}
+
+        try:
+            result = parse_callback(kind, body)
+        except ValueError:
+            return 400, {"ResultCode": 1, "ResultDesc": "Malformed callback"}
+
+        if kind == "c2b_validation" and self.validator is not None:
+            if not self.validator(result):
+                return 200, REJECTED
+
+        if self.handler is not None:
+            self.handler(result)
+        if self.queue is not None:
+            self.queue.put_nowait(result)
+        return 200, ACCEPTED
+
+    async def __call__(self, scope, receive, send) -> None:
+        """ASGI entry point."""
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        if scope["type"] != "http":
+            return
+
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        if scope["method"] != "POST":
+            status, payload = 405, {"ResultCode": 1, "ResultDesc": "Method Not Allowed"}
+        else:
+            status, payload = self.dispatch(scope["path"], b"".join(chunks))
+
+        body = serialization.dumps(payload)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    def wsgi_app(self, environ, start_response) -> List[bytes]:
+        """WSGI entry point."""
+        if environ.get("REQUEST_METHOD") != "POST":
+            status, payload = 405, {"ResultCode": 1, "ResultDesc": "Method Not Allowed"}
+        else:
+            try:
+                length = int(environ.get("CONTENT_LENGTH") or 0)
+            except ValueError:
+                length = 0
+            body = environ["wsgi.input"].read(length) if length else b""
+            status, payload = self.dispatch(environ.get("PATH_INFO", ""), body)
+
+        body = serialization.dumps(payload)
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found"}.get(
+            status, "Method Not Allowed"
+        )
+        start_response(
+            f"{status} {reason}",
+            [("Content-Type", "application/json"), ("Content-Length", str(len(body)))],
+        )
+        return [body]
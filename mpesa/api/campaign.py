@@ -0,0 +1,404 @@
+import asyncio
+import csv
+import heapq
+import itertools
+import json
+import os
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import (
+    IO,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from mpesa.api import serialization
+from mpesa.api.mpesa_express import MpesaExpress
+from mpesa.api.rate_limit import TokenBucket
+from mpesa.api.responses import response_data
+from mpesa.api.validation import ValidationError, normalize_msisdn
+
+SUBMITTED = "submitted"
+REJECTED = "rejected"
+INVALID = "invalid"
+ERROR = "error"
+
+# Columns of the CSV report written with write_report(..., fields=RESULT_FIELDS).
+RESULT_FIELDS = (
+    "index",
+    "msisdn",
+    "status",
+    "merchant_request_id",
+    "checkout_request_id",
+    "response_code",
+    "response_description",
+    "error",
+)
+
+# stk_push() arguments a campaign record may override.
+_STK_FIELDS = frozenset(
+    {
+        "short_code",
+        "pass_key",
+        "transaction_type",
+        "amount",
+        "callback_url",
+        "transaction_desc",
+        "account_ref",
+    }
+)
+
+
+def read_records(
+    source: Union[str, IO[str]], format: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Reads campaign records from a CSV or JSON lines file lazily.
+
+    Args:
+        source (Union[str, IO[str]]): Path of the file or an open text file.
+        format (Optional[str]): "csv" or "jsonl"; inferred from the file
+        extension when omitted, defaulting to CSV.
+
+    Yields:
+        Dict[str, Any]: Each record in file order.
+
+    Raises:
+        ValueError: Raised if format is unknown.
+    """
+    if format is None:
+        name = source if isinstance(source, str) else getattr(source, "name", "")
+        extension = os.path.splitext(str(name))[1].lower()
+        format = "jsonl" if extension in (".jsonl", ".ndjson") else "csv"
+    if format not in ("csv", "jsonl"):
+        raise ValueError(f"Unknown record format {format}; expected csv or jsonl.")
+
+    if isinstance(source, str):
+        with open(source, newline="") as file:
+            yield from read_records(file, format)
+        return
+
+    if format == "csv":
+        yield from csv.DictReader(source)
+        return
+    for line in source:
+        if line.strip():
+            yield serialization.loads(line)
+
+
+class CampaignResult(NamedTuple):
+    """Outcome of the STK push sent for one campaign record."""
+
+    index: int
+    msisdn: Optional[str]
+    record: Dict[str, Any]
+    status: str
+    response: Any
+    error: Optional[BaseException]
+
+    @property
+    def ok(self) -> bool:
+        return self.status == SUBMITTED
+
+    def row(self) -> Dict[str, Any]:
+        """Returns the result as a report row keyed by RESULT_FIELDS."""
+        response = response_data(self.response) or {}
+        return {
+            "index": self.index,
+            "msisdn": self.msisdn,
+            "status": self.status,
+            "merchant_request_id": response.get("MerchantRequestID"),
+            "checkout_request_id": response.get("CheckoutRequestID"),
+            "response_code": response.get("ResponseCode"),
+            "response_description": response.get("ResponseDescription"),
+            "error": None if self.error is None else str(self.error),
+        }
+
+
+class StkCampaign:
+    """
+    StkCampaign sends STK push prompts to every MSISDN of a campaign file. Records
+    are read lazily, numbers are normalized before sending, submissions are paced
+    to `rate` prompts per second with at most `concurrency` in flight, and results
+    are yielded as they complete, so memory use does not grow with the size of
+    the campaign.
+
+    With a `checkpoint` path, the number of leading records whose results have
+    been consumed is saved every `checkpoint_every` records; running the campaign
+    again skips them. Records that were in flight when the process stopped are
+    sent again, so up to `concurrency` customers may get a second prompt.
+
+    Records are dicts holding the customer's number under `msisdn_field` and,
+    optionally, any of amount, account_ref, transaction_desc, callback_url,
+    short_code, pass_key and transaction_type, which override `defaults`.
+
+    Attributes:
+        mpesa_express (MpesaExpress): Client used to send the prompts; an
+        AsyncMpesaExpress instance is required for `arun()`.
+        defaults (Dict[str, Any]): Keyword arguments of `stk_push()` applied to
+        every record.
+        concurrency (int): Maximum number of prompts in flight.
+        rate (Optional[float]): Maximum prompts sent per second.
+        checkpoint (Optional[str]): Path of the checkpoint file.
+        checkpoint_every (int): Records between checkpoint writes.
+        stats (Counter): Number of results per status in the current or last run.
+
+    Methods:
+        position() -> int: Returns the number of records already processed.
+        run(records) -> Iterator[CampaignResult]: Sends prompts from worker
+        threads and yields results as they complete.
+        arun(records) -> AsyncIterator[CampaignResult]: Sends prompts as asyncio
+        tasks and yields results as they complete.
+    """
+
+    def __init__(
+        self,
+        mpesa_express: MpesaExpress,
+        defaults: Optional[Dict[str, Any]] = None,
+        concurrency: int = 10,
+        rate: Optional[float] = None,
+        checkpoint: Optional[str] = None,
+        checkpoint_every: int = 100,
+        msisdn_field: str = "msisdn",
+    ):
+        """
+        Initializes the campaign runner.
+
+        Args:
+            mpesa_express (MpesaExpress): MpesaExpress or AsyncMpesaExpress client
+            whose connection pool is shared by all prompts.
+            defaults (Optional[Dict[str, Any]]): Keyword arguments of `stk_push()`
+            shared by every record, e.g. short_code, pass_key, transaction_type,
+            amount, callback_url, transaction_desc and account_ref.
+            concurrency (int): Maximum number of prompts in flight.
+            rate (Optional[float]): Maximum prompts sent per second; None sends
+            as fast as `concurrency` allows.
+            checkpoint (Optional[str]): Path of the file progress is saved to.
+            checkpoint_every (int): Records between checkpoint writes.
+            msisdn_field (str): Record field holding the customer's number.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be at least 1.")
+
+        self.mpesa_express = mpesa_express
+        self.defaults = dict(defaults or {})
+        self.concurrency = concurrency
+        self.rate = rate
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.msisdn_field = msisdn_field
+        self.stats: Counter = Counter()
+        self._bucket = TokenBucket(rate, capacity=1) if rate is not None else None
+        self._position = 0
+        self._saved = 0
+        self._done: List[int] = []
+
+    def position(self) -> int:
+        """Returns the number of leading records recorded in the checkpoint."""
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return 0
+        with open(self.checkpoint) as file:
+            return int(json.load(file)["position"])
+
+    def _save(self) -> None:
+        """Atomically replaces the checkpoint with the current position."""
+        if self.checkpoint is None or self._saved == self._position:
+            return
+        temporary = f"{self.checkpoint}.tmp"
+        with open(temporary, "w") as file:
+            json.dump({"position": self._position, "stats": self.stats}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.checkpoint)
+        self._saved = self._position
+
+    def _start(self) -> int:
+        self.stats = Counter()
+        self._position = self._saved = self.position()
+        self._done = []
+        return self._position
+
+    def _consumed(self, result: CampaignResult) -> None:
+        """
+        Advances the checkpoint past every leading record whose result has been
+        consumed, i.e. the caller asked for the next one or closed the generator.
+        Results complete out of order, so later ones wait in a heap.
+        """
+        self.stats[result.status] += 1
+        heapq.heappush(self._done, result.index)
+        while self._done and self._done[0] == self._position:
+            heapq.heappop(self._done)
+            self._position += 1
+        if self._position - self._saved >= self.checkpoint_every:
+            self._save()
+
+    def _prepare(
+        self, index: int, record: Dict[str, Any]
+    ) -> Union[CampaignResult, Dict[str, Any]]:
+        """
+        Builds the stk_push() keyword arguments of a record, or an invalid result
+        if its number is not a valid MSISDN.
+        """
+        try:
+            msisdn = normalize_msisdn(record.get(self.msisdn_field) or "")
+        except ValueError as err:
+            return CampaignResult(index, None, record, INVALID, None, err)
+        push = {**self.defaults}
+        push.update((key, value) for key, value in record.items() if key in _STK_FIELDS)
+        push["sender_msisdn"] = push["receiver_msisdn"] = int(msisdn)
+        return push
+
+    def _result(
+        self,
+        index: int,
+        record: Dict[str, Any],
+        push: Dict[str, Any],
+        response: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> CampaignResult:
+        msisdn = str(push["receiver_msisdn"])
+        if error is not None:
+            # Records rejected by the client's validator never left the process.
+            status = INVALID if isinstance(error, ValidationError) else ERROR
+            return CampaignResult(index, msisdn, record, status, None, error)
+        accepted = str(response_data(response).get("ResponseCode")) == "0"
+        status = SUBMITTED if accepted else REJECTED
+        return CampaignResult(index, msisdn, record, status, response, None)
+
+    def _push(
+        self, index: int, record: Dict[str, Any], push: Dict[str, Any]
+    ) -> CampaignResult:
+        """Sends one prompt, capturing any error in the result."""
+        try:
+            response = self.mpesa_express.stk_push(**push)
+        except Exception as err:
+            return self._result(index, record, push, error=err)
+        return self._result(index, record, push, response)
+
+    async def _apush(
+        self, index: int, record: Dict[str, Any], push: Dict[str, Any]
+    ) -> CampaignResult:
+        """Sends one prompt through an AsyncMpesaExpress client."""
+        try:
+            response = await self.mpesa_express.stk_push(**push)
+        except Exception as err:
+            return self._result(index, record, push, error=err)
+        return self._result(index, record, push, response)
+
+    def run(self, records: Iterable[Dict[str, Any]]) -> Iterator[CampaignResult]:
+        """
+        Sends STK push prompts from a pool of worker threads.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Campaign records, e.g. from
+            `read_records()`, consumed lazily; records before the checkpoint are
+            skipped.
+
+        Yields:
+            CampaignResult: The outcome of each record in completion order.
+        """
+        start = self._start()
+        numbered = enumerate(itertools.islice(records, start, None), start)
+        in_flight = set()
+        exhausted = False
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                while True:
+                    while not exhausted and len(in_flight) < self.concurrency:
+                        try:
+                            index, record = next(numbered)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        push = self._prepare(index, record)
+                        if isinstance(push, CampaignResult):
+                            try:
+                                yield push
+                            finally:
+                                self._consumed(push)
+                            continue
+                        if self._bucket is not None:
+                            self._bucket.acquire()
+                        in_flight.add(executor.submit(self._push, index, record, push))
+
+                    if not in_flight:
+                        break
+
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        try:
+                            yield result
+                        finally:
+                            self._consumed(result)
+            finally:
+                for future in in_flight:
+                    future.cancel()
+                self._save()
+
+    async def arun(
+        self, records: Iterable[Dict[str, Any]]
+    ) -> AsyncIterator[CampaignResult]:
+        """
+        Sends STK push prompts as asyncio tasks through an AsyncMpesaExpress
+        client.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Campaign records, consumed lazily;
+            records before the checkpoint are skipped.
+
+        Yields:
+            CampaignResult: The outcome of each record in completion order.
+        """
+        start = self._start()
+        numbered = enumerate(itertools.islice(records, start, None), start)
+        in_flight = set()
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(in_flight) < self.concurrency:
+                    try:
+                        index, record = next(numbered)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    push = self._prepare(index, record)
+                    if isinstance(push, CampaignResult):
+                        try:
+                            yield push
+                        finally:
+                            self._consumed(push)
+                        continue
+                    if self._bucket is not None:
+                        await self._bucket.acquire_async()
+                    in_flight.add(
+                        asyncio.ensure_future(self._apush(index, record, push))
+                    )
+
+                if not in_flight:
+                    break
+
+                done, in_flight = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    result = task.result()
+                    try:
+                        yield result
+                    finally:
+                        self._consumed(result)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            self._save()
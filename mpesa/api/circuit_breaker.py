@@ -0,0 +1,239 @@
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import httpx
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Responses that indicate the endpoint itself is unhealthy. Daraja also answers
+# business errors, such as a pending STK query, with status 500, so 500 is left out.
+DEFAULT_FAILURE_STATUSES = (502, 503, 504)
+
+CircuitKey = Tuple[str, str]
+
+
+class CircuitOpenError(ValueError):
+    """
+    Raised instead of sending a request to an endpoint whose circuit is open.
+
+    Attributes:
+        env (str): Environment of the endpoint.
+        path (str): Endpoint path.
+        retry_after (float): Seconds until the circuit lets a probe through.
+    """
+
+    def __init__(self, env: str, path: str, retry_after: float):
+        super().__init__(
+            f"Circuit for {path} ({env}) is open; retry in {retry_after:.1f}s."
+        )
+        self.env = env
+        self.path = path
+        self.retry_after = retry_after
+
+
+class _Circuit:
+    """Mutable state of one endpoint's circuit; guarded by the breaker's lock."""
+
+    __slots__ = ("state", "failures", "successes", "probes", "opened_at")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.successes = 0
+        self.probes = 0
+        self.opened_at = 0.0
+
+
+class CircuitBreaker:
+    """
+    CircuitBreaker stops requests to a Mpesa endpoint that keeps failing, so that
+    workers fail fast instead of blocking for the full timeout while Safaricom
+    degrades that endpoint. Each (env, path) pair has its own circuit:
+
+    - closed: requests flow; `failure_threshold` consecutive failures open it.
+    - open: requests raise CircuitOpenError for `recovery_timeout` seconds.
+    - half open: up to `half_open_max_calls` probe requests are let through;
+      `success_threshold` successful probes close the circuit, a failed probe
+      opens it again.
+
+    Transport errors, including timeouts, and responses with a status in
+    `failure_statuses` count as failures. A single CircuitBreaker can be shared
+    by any number of API class instances, threads and asyncio tasks.
+
+    Attributes:
+        failure_threshold (int): Consecutive failures that open a circuit.
+        recovery_timeout (float): Seconds a circuit stays open before probing.
+        half_open_max_calls (int): Concurrent probes allowed while half open.
+        success_threshold (int): Successful probes needed to close a circuit.
+        failure_statuses (Tuple[int, ...]): Status codes counted as failures.
+
+    Methods:
+        allow(env, path) -> bool: Admits a request or raises CircuitOpenError.
+        record(env, path, probe, response, error): Records a request's outcome.
+        state(env, path) -> str: Returns "closed", "open" or "half_open".
+        states() -> Dict[Tuple[str, str], str]: Returns every known circuit state.
+        reset(env, path): Closes matching circuits.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        success_threshold: int = 1,
+        failure_statuses: Iterable[int] = DEFAULT_FAILURE_STATUSES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the circuit breaker with every circuit closed.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open a circuit.
+            recovery_timeout (float): Seconds an open circuit rejects requests.
+            half_open_max_calls (int): Concurrent probes allowed while half open.
+            success_threshold (int): Successful probes needed to close a circuit.
+            failure_statuses (Iterable[int]): Status codes counted as failures.
+            clock (Callable[[], float]): Monotonic clock used to time recovery.
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1.")
+        if half_open_max_calls < 1 or success_threshold < 1:
+            raise ValueError(
+                "half_open_max_calls and success_threshold must be at least 1."
+            )
+        if recovery_timeout < 0:
+            raise ValueError("recovery_timeout must not be negative.")
+
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = float(recovery_timeout)
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self.failure_statuses = tuple(failure_statuses)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._circuits: Dict[CircuitKey, _Circuit] = {}
+
+    def _circuit(self, key: CircuitKey) -> _Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit()
+        return circuit
+
+    def _refresh(self, circuit: _Circuit, now: float) -> None:
+        """Moves an open circuit to half open once its recovery time passed."""
+        if circuit.state == OPEN and now - circuit.opened_at >= self.recovery_timeout:
+            circuit.state = HALF_OPEN
+            circuit.successes = 0
+            circuit.probes = 0
+
+    def allow(self, env: str, path: str) -> bool:
+        """
+        Admits a request to an endpoint.
+
+        Args:
+            env (str): Environment of the endpoint.
+            path (str): Endpoint path.
+
+        Returns:
+            bool: True if the request is a half-open probe, whose outcome decides
+            whether the circuit closes.
+
+        Raises:
+            CircuitOpenError: Raised if the circuit is open, or half open with all
+            probes in flight.
+        """
+        with self._lock:
+            now = self._clock()
+            circuit = self._circuit((env, path))
+            self._refresh(circuit, now)
+            if circuit.state == CLOSED:
+                return False
+            if circuit.state == HALF_OPEN and circuit.probes < self.half_open_max_calls:
+                circuit.probes += 1
+                return True
+            retry_after = max(circuit.opened_at + self.recovery_timeout - now, 0.0)
+        raise CircuitOpenError(env, path, retry_after)
+
+    def is_failure(
+        self,
+        response: Optional[httpx.Response] = None,
+        error: Optional[BaseException] = None,
+    ) -> bool:
+        """Returns True if a response or transport error counts as a failure."""
+        if error is not None:
+            return isinstance(error, httpx.TransportError)
+        return response is not None and response.status_code in self.failure_statuses
+
+    def record(
+        self,
+        env: str,
+        path: str,
+        probe: bool = False,
+        response: Optional[httpx.Response] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Records the outcome of a request admitted by `allow()`.
+
+        Args:
+            env (str): Environment of the endpoint.
+            path (str): Endpoint path.
+            probe (bool): Value returned by `allow()` for the request.
+            response (Optional[httpx.Response]): Response, if one was received.
+            error (Optional[BaseException]): Transport error, if the request failed.
+        """
+        failed = self.is_failure(response, error)
+        with self._lock:
+            circuit = self._circuit((env, path))
+            if circuit.state == CLOSED:
+                if not failed:
+                    circuit.failures = 0
+                    return
+                circuit.failures += 1
+                if circuit.failures >= self.failure_threshold:
+                    self._open(circuit)
+            elif circuit.state == HALF_OPEN and probe:
+                # Requests admitted before the circuit opened are ignored, only
+                # probes decide whether the endpoint recovered.
+                circuit.probes = max(circuit.probes - 1, 0)
+                if failed:
+                    self._open(circuit)
+                    return
+                circuit.successes += 1
+                if circuit.successes >= self.success_threshold:
+                    circuit.state = CLOSED
+                    circuit.failures = 0
+
+    def _open(self, circuit: _Circuit) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = self._clock()
+        circuit.failures = 0
+        circuit.successes = 0
+        circuit.probes = 0
+
+    def state(self, env: str, path: str) -> str:
+        """Returns the state of an endpoint's circuit."""
+        with self._lock:
+            circuit = self._circuits.get((env, path))
+            if circuit is None:
+                return CLOSED
+            self._refresh(circuit, self._clock())
+            return circuit.state
+
+    def states(self) -> Dict[CircuitKey, str]:
+        """Returns the state of every circuit keyed by (env, path)."""
+        with self._lock:
+            now = self._clock()
+            for circuit in self._circuits.values():
+                self._refresh(circuit, now)
+            return {key: circuit.state for key, circuit in self._circuits.items()}
+
+    def reset(self, env: Optional[str] = None, path: Optional[str] = None) -> None:
+        """Closes the circuits matching env and path; omitted arguments match all."""
+        with self._lock:
+            for key in list(self._circuits):
+                if (env is None or key[0] == env) and (path is None or key[1] == path):
+                    del self._circuits[key]
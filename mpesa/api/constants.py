@@ -19,6 +19,17 @@ else:
 AUTH_ENDPOINT = f"{SANDBOX_URL}/oauth/v1/generate?grant_type=client_credentials"
 ACCOUNT_BALANCE_ENDPOINT = f"{SANDBOX_URL}/mpesa/accountbalance/v1/query"
 
+# API Paths relative to the environment's base URL
+AUTH_PATH = "/oauth/v1/generate?grant_type=client_credentials"
+C2B_REGISTER_PATH = "/mpesa/c2b/v1/registerurl"
+C2B_SIMULATE_PATH = "/mpesa/c2b/v1/simulate"
+B2C_PAYMENT_PATH = "/mpesa/b2c/v3/paymentrequest"
+ACCOUNT_BALANCE_PATH = "/mpesa/accountbalance/v1/query"
+TRANSACTION_STATUS_PATH = "/mpesa/transactionstatus/v1/query"
+STK_PUSH_PATH = "/mpesa/stkpush/v1/processrequest"
+STK_QUERY_PATH = "/mpesa/stkpushquery/v1/query"
+REVERSAL_PATH = "/mpesa/reversal/v1/request"
+
 # Application Credentials
 APP_KEY = "your_app_key"  # Replace with your actual app key
 APP_SECRET = "your_app_secret"  # Replace with your actual app secret
@@ -26,3 +37,9 @@ APP_SECRET = "your_app_secret"  # Replace with your actual app secret
 # Other Constants
 RETRY_COUNT = 3
 TIMEOUT_SECONDS = 30
+CONNECT_TIMEOUT_SECONDS = 10
+
+# Connection pool defaults
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 30
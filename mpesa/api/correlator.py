@@ -0,0 +1,392 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from mpesa.api.callbacks import ResultCallback, TimeoutNotification
+from mpesa.api.responses import response_data
+
+
+class ResultTimeoutError(ValueError):
+    """
+    Raised when the result of a request did not arrive: Mpesa called the request's
+    queue_timeout_url, or no result arrived within the correlator's ttl.
+
+    Attributes:
+        notification (Optional[TimeoutNotification]): The notification sent to the
+        queue_timeout_url, or None if the wait expired locally.
+    """
+
+    def __init__(
+        self, message: str, notification: Optional[TimeoutNotification] = None
+    ):
+        super().__init__(message)
+        self.notification = notification
+
+
+class _Entry:
+    """A request waiting for its result; guarded by the correlator's lock."""
+
+    __slots__ = ("keys", "future", "deadline")
+
+    def __init__(self, keys: List[str], deadline: float):
+        self.keys = keys
+        self.future: Future = Future()
+        self.deadline = deadline
+
+
+def acknowledgement_ids(acknowledgement: Any) -> Tuple[str, ...]:
+    """Returns the OriginatorConversationID and ConversationID of a response."""
+    acknowledgement = response_data(acknowledgement)
+    if not isinstance(acknowledgement, dict):
+        return ()
+    return tuple(
+        key
+        for key in (
+            acknowledgement.get("OriginatorConversationID"),
+            acknowledgement.get("ConversationID"),
+        )
+        if key
+    )
+
+
+class ResultCorrelator:
+    """
+    ResultCorrelator matches the results Mpesa delivers to the `result_url` and
+    `queue_timeout_url` of B2C, balance, transaction status and reversal requests
+    back to the requests, and resolves a future for each one. Code that made a
+    request can then block on or await the real outcome instead of polling.
+
+    Requests are registered under their OriginatorConversationID and/or the
+    ConversationID from Mpesa's acknowledgement; a result matching either key
+    resolves the request's future. Hand every received result to `deliver()`,
+    e.g. as the handler of a CallbackReceiver. Results that arrive before their
+    request was registered are held for up to `ttl` seconds.
+
+    Pending requests are kept in registration order and expire `ttl` seconds
+    after they were registered, or earlier when more than `max_pending` are
+    waiting. Expired futures fail with ResultTimeoutError, as do futures whose
+    request was reported to the queue_timeout_url. Expiry happens lazily on
+    every call, so nothing has to run in the background.
+
+    Attributes:
+        ttl (float): Seconds a request waits for its result.
+        max_pending (Optional[int]): Maximum number of waiting requests; None
+        leaves the table unbounded.
+
+    Methods:
+        expect(*keys) -> Future: Registers a request under its IDs.
+        alias(key, *aliases): Adds IDs to a registered request.
+        track(acknowledgement) -> Future: Registers a request by the IDs in its
+        acknowledgement.
+        deliver(result) -> bool: Resolves the request a result belongs to.
+        discard(key): Forgets a request without resolving it.
+        result(acknowledgement, timeout) -> ResultCallback: Blocks for a result.
+        wait(acknowledgement, timeout) -> ResultCallback: Coroutine awaiting a
+        result.
+        expire() -> int: Fails requests whose ttl has passed.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_pending: Optional[int] = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes an empty correlator.
+
+        Args:
+            ttl (float): Seconds a request waits for its result.
+            max_pending (Optional[int]): Maximum number of waiting requests; the
+            oldest ones fail with ResultTimeoutError beyond it.
+            clock (Callable[[], float]): Monotonic clock used for expiry.
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be greater than zero.")
+        if max_pending is not None and max_pending < 1:
+            raise ValueError("max_pending must be at least 1.")
+
+        self.ttl = float(ttl)
+        self.max_pending = max_pending
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Waiting requests in registration, and therefore deadline, order.
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._keys: Dict[str, _Entry] = {}
+        self._early: "OrderedDict[str, Tuple[float, ResultCallback]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def expect(self, *keys: str) -> Future:
+        """
+        Registers a request under its OriginatorConversationID and/or
+        ConversationID; registering a key again returns the existing future.
+
+        Args:
+            *keys (str): IDs the request's result will carry.
+
+        Returns:
+            Future: Resolved with the request's ResultCallback.
+        """
+        keys = [key for key in keys if key]
+        if not keys:
+            raise ValueError(
+                "A request needs an OriginatorConversationID or ConversationID."
+            )
+
+        now = self._clock()
+        with self._lock:
+            entry = next((self._keys[key] for key in keys if key in self._keys), None)
+            if entry is None:
+                entry = _Entry([], now + self.ttl)
+                self._entries[id(entry)] = entry
+            result = self._link(entry, keys)
+            expired = self._expired(now)
+        self._fail_expired(expired)
+        if result is not None:
+            self._resolve(entry, result)
+        return entry.future
+
+    def alias(self, key: str, *aliases: str) -> None:
+        """
+        Adds IDs to the request registered under key, e.g. the ConversationID
+        from its acknowledgement.
+
+        Raises:
+            ValueError: Raised if no request is registered under key.
+        """
+        with self._lock:
+            entry = self._keys.get(key)
+            if entry is None:
+                raise ValueError(f"No request is waiting under {key}.")
+            result = self._link(entry, [alias for alias in aliases if alias])
+        if result is not None:
+            self._resolve(entry, result)
+
+    def _link(self, entry: _Entry, keys: List[str]) -> Optional[ResultCallback]:
+        """Maps keys to entry and returns a result that arrived early, if any."""
+        early = None
+        for key in keys:
+            if key not in entry.keys:
+                entry.keys.append(key)
+                self._keys[key] = entry
+            held = self._early.pop(key, None)
+            if held is not None and early is None:
+                early = held[1]
+        if early is not None:
+            # The result was held under each of its IDs.
+            self._early.pop(early.originator_conversation_id, None)
+            self._early.pop(early.conversation_id, None)
+            self._remove(entry)
+        return early
+
+    def _remove(self, entry: _Entry) -> None:
+        self._entries.pop(id(entry), None)
+        for key in entry.keys:
+            if self._keys.get(key) is entry:
+                del self._keys[key]
+
+    def track(self, acknowledgement: Any) -> Future:
+        """
+        Registers a request by the OriginatorConversationID and ConversationID
+        of its acknowledgement.
+
+        Args:
+            acknowledgement (Any): Response of B2C.transact, Balance.get_balance,
+            TransactionStatus.check_transaction_status or Reversal.reverse.
+
+        Returns:
+            Future: Resolved with the request's ResultCallback.
+
+        Raises:
+            ValueError: Raised if the acknowledgement carries neither ID.
+        """
+        return self.expect(*acknowledgement_ids(acknowledgement))
+
+    def discard(self, key: str) -> bool:
+        """
+        Forgets the request registered under key without resolving it, e.g.
+        after Mpesa rejected the request.
+
+        Returns:
+            bool: True if a waiting request was removed.
+        """
+        with self._lock:
+            entry = self._keys.get(key)
+            if entry is None:
+                return False
+            self._remove(entry)
+            return True
+
+    def deliver(self, result: Any) -> bool:
+        """
+        Resolves the request a result or timeout notification belongs to.
+
+        Args:
+            result (Any): ResultCallback parsed by CallbackReceiver; other
+            callbacks are ignored.
+
+        Returns:
+            bool: True if the result matched a waiting request.
+        """
+        if not isinstance(result, ResultCallback):
+            return False
+
+        keys = [
+            key
+            for key in (result.originator_conversation_id, result.conversation_id)
+            if key
+        ]
+        now = self._clock()
+        with self._lock:
+            entry = next((self._keys[key] for key in keys if key in self._keys), None)
+            if entry is None:
+                for key in keys:
+                    self._early[key] = (now + self.ttl, result)
+                    self._early.move_to_end(key)
+            else:
+                self._remove(entry)
+            expired = self._expired(now)
+        self._fail_expired(expired)
+        if entry is None:
+            return False
+        self._resolve(entry, result)
+        return True
+
+    def _resolve(self, entry: _Entry, result: ResultCallback) -> None:
+        if entry.future.done():
+            return
+        if isinstance(result, TimeoutNotification):
+            entry.future.set_exception(
+                ResultTimeoutError(
+                    f"Mpesa reported a timeout: {result.result_desc}", result
+                )
+            )
+        else:
+            entry.future.set_result(result)
+
+    def expire(self) -> int:
+        """
+        Fails the futures of requests whose ttl has passed.
+
+        Returns:
+            int: Number of requests that expired.
+        """
+        with self._lock:
+            expired = self._expired(self._clock())
+        self._fail_expired(expired)
+        return len(expired)
+
+    def _expired(self, now: float) -> List[_Entry]:
+        """Removes expired and surplus entries; the caller fails them unlocked."""
+        expired = []
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            surplus = self.max_pending is not None and (
+                len(self._entries) > self.max_pending
+            )
+            if not surplus and entry.deadline > now:
+                break
+            self._remove(entry)
+            expired.append(entry)
+
+        while self._early:
+            key, (deadline, _) = next(iter(self._early.items()))
+            surplus = self.max_pending is not None and (
+                len(self._early) > self.max_pending
+            )
+            if not surplus and deadline > now:
+                break
+            del self._early[key]
+        return expired
+
+    def _fail_expired(self, expired: List[_Entry]) -> None:
+        for entry in expired:
+            if not entry.future.done():
+                entry.future.set_exception(
+                    ResultTimeoutError(
+                        f"No result arrived for {', '.join(entry.keys)}."
+                    )
+                )
+
+    def _remaining(self, keys: Tuple[str, ...]) -> float:
+        """Seconds until the request registered under keys expires."""
+        with self._lock:
+            entry = next((self._keys[key] for key in keys if key in self._keys), None)
+            if entry is None:
+                return 0.0
+            return max(entry.deadline - self._clock(), 0.0)
+
+    def result(
+        self, acknowledgement: Any, timeout: Optional[float] = None
+    ) -> ResultCallback:
+        """
+        Blocks until the result of an acknowledged request arrives.
+
+        Args:
+            acknowledgement (Any): Response of the request.
+            timeout (Optional[float]): Seconds to wait; defaults to the request's
+            remaining ttl.
+
+        Returns:
+            ResultCallback: The request's result.
+
+        Raises:
+            ResultTimeoutError: Raised if the result does not arrive in time or
+            Mpesa reported a timeout.
+        """
+        keys = acknowledgement_ids(acknowledgement)
+        future = self.expect(*keys)
+        try:
+            return future.result(self._remaining(keys) if timeout is None else timeout)
+        except FutureTimeoutError:
+            self.expire()
+            if future.done():
+                return future.result()
+            raise ResultTimeoutError(
+                f"No result arrived for {', '.join(keys)}."
+            ) from None
+
+    async def wait(
+        self,
+        acknowledgement: Union[Any, Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> ResultCallback:
+        """
+        Awaits the result of a request.
+
+        Args:
+            acknowledgement (Union[Any, Awaitable[Any]]): Response of the request,
+            or the awaitable returned by an Async API class method.
+            timeout (Optional[float]): Seconds to wait; defaults to the request's
+            remaining ttl.
+
+        Returns:
+            ResultCallback: The request's result.
+
+        Raises:
+            ResultTimeoutError: Raised if the result does not arrive in time or
+            Mpesa reported a timeout.
+        """
+        if hasattr(acknowledgement, "__await__"):
+            acknowledgement = await acknowledgement
+        keys = acknowledgement_ids(acknowledgement)
+        future = self.expect(*keys)
+        try:
+            # Shielded, so that a timed out wait leaves the request registered.
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)),
+                self._remaining(keys) if timeout is None else timeout,
+            )
+        except asyncio.TimeoutError:
+            self.expire()
+            if future.done():
+                return future.result()
+            raise ResultTimeoutError(
+                f"No result arrived for {', '.join(keys)}."
+            ) from None
@@ -0,0 +1,209 @@
+import base64
+import functools
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:  # cryptography is optional; only SecurityCredential generation needs it
+    from cryptography import x509
+    from cryptography.hazmat.primitives.asymmetric import padding
+except ImportError:  # pragma: no cover - exercised when cryptography is missing
+    x509 = None
+    padding = None
+
+
+class TimestampClock:
+    """
+    TimestampClock returns the current time as a Daraja timestamp
+    (YYYYMMDDHHMMSS, local time). The formatted value is cached for the current
+    second, so callers within the same second share a single strftime call.
+
+    Methods:
+        now() -> Tuple[int, str]: Returns the current epoch second and timestamp.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        """
+        Initializes the clock.
+
+        Args:
+            clock (Callable[[], float]): Wall clock returning epoch seconds.
+        """
+        self._clock = clock
+        self._cached: Tuple[int, str] = (-1, "")
+
+    def now(self) -> Tuple[int, str]:
+        second = int(self._clock())
+        cached = self._cached
+        if cached[0] != second:
+            # Tuple assignment is atomic, so concurrent callers at worst format the
+            # same second twice.
+            cached = self._cached = (
+                second,
+                time.strftime("%Y%m%d%H%M%S", time.localtime(second)),
+            )
+        return cached
+
+
+# Process-wide clock shared by every STK password generator.
+default_timestamp_clock = TimestampClock()
+
+
+class StkPasswordGenerator:
+    """
+    StkPasswordGenerator produces the Password and Timestamp fields of Lipa na
+    Mpesa requests for one shortcode and pass key. The encoded shortcode and pass
+    key prefix is computed once, and the password is recomputed at most once per
+    second, so the returned pair always refers to the same second.
+
+    Attributes:
+        short_code (str): Organization shortcode.
+
+    Methods:
+        generate() -> Tuple[str, str]: Returns the current (password, timestamp).
+    """
+
+    def __init__(
+        self,
+        short_code: int,
+        pass_key: str,
+        clock: TimestampClock = default_timestamp_clock,
+    ):
+        """
+        Initializes the generator.
+
+        Args:
+            short_code (int): Organization shortcode.
+            pass_key (str): Lipa na Mpesa pass key.
+            clock (TimestampClock): Clock providing cached timestamps.
+        """
+        self.short_code = str(short_code)
+        self._prefix = f"{short_code}{pass_key}".encode()
+        self._clock = clock
+        self._cached: Tuple[int, str, str] = (-1, "", "")
+
+    def generate(self) -> Tuple[str, str]:
+        """
+        Returns the password and timestamp for the current second.
+
+        Returns:
+            Tuple[str, str]: Base64 encoded shortcode+pass_key+timestamp and the
+            timestamp it was built from.
+        """
+        second, timestamp = self._clock.now()
+        cached = self._cached
+        if cached[0] != second:
+            password = base64.b64encode(self._prefix + timestamp.encode()).decode()
+            cached = self._cached = (second, password, timestamp)
+        return cached[1], cached[2]
+
+
+@functools.lru_cache(maxsize=256)
+def stk_password_generator(short_code: int, pass_key: str) -> StkPasswordGenerator:
+    """Returns the process-wide generator for a shortcode and pass key."""
+    return StkPasswordGenerator(short_code, pass_key)
+
+
+class SecurityCredentialCache:
+    """
+    SecurityCredentialCache generates the SecurityCredential field of B2C,
+    balance, transaction status and reversal requests by encrypting the
+    initiator password with Safaricom's public certificate (RSA PKCS#1 v1.5,
+    base64 encoded). Each certificate is parsed once, and each credential is
+    encrypted once and then reused, since Mpesa accepts any valid encryption of
+    the password. Requires the `cryptography` package.
+
+    Download the sandbox and production certificates from the Daraja portal.
+
+    Methods:
+        get(env, initiator_password, certificate_path) -> str: Returns the cached
+        credential, encrypting it on first use.
+        invalidate(env, initiator_password): Drops cached credentials, e.g. after
+        the initiator password was changed.
+        clear(): Drops every cached credential and certificate.
+    """
+
+    def __init__(self):
+        """Initializes an empty cache."""
+        self._lock = threading.Lock()
+        self._public_keys: Dict[str, Any] = {}
+        self._credentials: Dict[Tuple[str, str, str], str] = {}
+
+    def get(self, env: str, initiator_password: str, certificate_path: str) -> str:
+        """
+        Returns the SecurityCredential for an initiator password.
+
+        Args:
+            env (str): Environment the certificate belongs to.
+            initiator_password (str): Plain text password of the API initiator.
+            certificate_path (str): Path of the PEM or DER encoded certificate.
+
+        Returns:
+            str: Base64 encoded RSA encryption of the password.
+
+        Raises:
+            ImportError: Raised if the cryptography package is not installed.
+            ValueError: Raised if the certificate cannot be parsed.
+        """
+        key = (env, certificate_path, _digest(initiator_password))
+        credential = self._credentials.get(key)
+        if credential is None:
+            public_key = self._public_key(certificate_path)
+            encrypted = public_key.encrypt(
+                initiator_password.encode(), padding.PKCS1v15()
+            )
+            credential = base64.b64encode(encrypted).decode()
+            with self._lock:
+                credential = self._credentials.setdefault(key, credential)
+        return credential
+
+    def invalidate(
+        self, env: Optional[str] = None, initiator_password: Optional[str] = None
+    ) -> None:
+        """
+        Drops cached credentials matching env and initiator_password; omitted
+        arguments match everything.
+        """
+        digest = None if initiator_password is None else _digest(initiator_password)
+        with self._lock:
+            for key in list(self._credentials):
+                if (env is None or key[0] == env) and (
+                    digest is None or key[2] == digest
+                ):
+                    del self._credentials[key]
+
+    def clear(self) -> None:
+        """Drops every cached credential and parsed certificate."""
+        with self._lock:
+            self._credentials.clear()
+            self._public_keys.clear()
+
+    def _public_key(self, certificate_path: str) -> Any:
+        public_key = self._public_keys.get(certificate_path)
+        if public_key is not None:
+            return public_key
+        if x509 is None:
+            raise ImportError(
+                "Generating security credentials requires the cryptography package."
+            )
+
+        with open(certificate_path, "rb") as certificate_file:
+            data = certificate_file.read()
+        if b"-----BEGIN CERTIFICATE-----" in data:
+            certificate = x509.load_pem_x509_certificate(data)
+        else:
+            certificate = x509.load_der_x509_certificate(data)
+
+        public_key = certificate.public_key()
+        with self._lock:
+            return self._public_keys.setdefault(certificate_path, public_key)
+
+
+def _digest(initiator_password: str) -> str:
+    """Keys cached credentials without keeping the plain text password."""
+    return hashlib.sha256(initiator_password.encode()).hexdigest()
+
+
+# Process-wide cache used by MpesaBase unless a dedicated one is supplied.
+default_security_credential_cache = SecurityCredentialCache()
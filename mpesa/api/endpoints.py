@@ -0,0 +1,198 @@
+from typing import Any, Dict, Optional, Tuple
+
+from mpesa.api.constants import (
+    ACCOUNT_BALANCE_PATH,
+    B2C_PAYMENT_PATH,
+    C2B_REGISTER_PATH,
+    C2B_SIMULATE_PATH,
+    REVERSAL_PATH,
+    STK_PUSH_PATH,
+    STK_QUERY_PATH,
+    TRANSACTION_STATUS_PATH,
+)
+
+
+class Endpoint:
+    """
+    Endpoint describes one Mpesa API operation: its path, the name used in error
+    messages and the fields of its JSON body. Fields with a constant value, such
+    as the CommandID of balance and reversal requests, are stored in a template
+    built once, so each request only copies the template and fills in the
+    variable fields.
+
+    Attributes:
+        path (str): Endpoint path relative to the environment's base URL.
+        operation (str): Human readable name of the operation used in errors.
+        fields (Tuple[str, ...]): Names of the variable fields, in the order their
+        values are passed to `payload()`.
+        constants (Dict[str, Any]): Fields sent with the same value on every
+        request.
+
+    Methods:
+        payload(*values) -> Dict[str, Any]: Returns the JSON body for values.
+    """
+
+    __slots__ = ("path", "operation", "fields", "constants", "_template")
+
+    def __init__(
+        self,
+        path: str,
+        operation: str,
+        fields: Tuple[str, ...],
+        constants: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initializes the endpoint.
+
+        Args:
+            path (str): Endpoint path relative to the environment's base URL.
+            operation (str): Human readable name of the operation used in errors.
+            fields (Tuple[str, ...]): Every field of the body in the order Daraja
+            documents them, including the constant ones.
+            constants (Optional[Dict[str, Any]]): Values of the constant fields.
+        """
+        constants = dict(constants or {})
+        unknown = set(constants) - set(fields)
+        if unknown:
+            raise ValueError(f"Constant fields {sorted(unknown)} are not in fields.")
+
+        self.path = path
+        self.operation = operation
+        self.fields = tuple(field for field in fields if field not in constants)
+        self.constants = constants
+        # The template fixes the key order; payload() only replaces values.
+        self._template = {field: constants.get(field) for field in fields}
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.path!r}, {self.operation!r})"
+
+    def payload(self, *values: Any) -> Dict[str, Any]:
+        """
+        Returns the JSON body of a request.
+
+        Args:
+            *values (Any): Values of the variable fields, in the order of `fields`.
+
+        Returns:
+            Dict[str, Any]: A new dict holding the constant and variable fields.
+
+        Raises:
+            ValueError: Raised if the number of values does not match `fields`.
+        """
+        if len(values) != len(self.fields):
+            raise ValueError(
+                f"{self.operation} takes {len(self.fields)} fields, "
+                f"got {len(values)}."
+            )
+        payload = self._template.copy()
+        payload.update(zip(self.fields, values))
+        return payload
+
+
+C2B_REGISTER = Endpoint(
+    C2B_REGISTER_PATH,
+    "C2B registration",
+    ("ShortCode", "ResponseType", "ConfirmationURL", "ValidationURL"),
+)
+
+C2B_SIMULATE = Endpoint(
+    C2B_SIMULATE_PATH,
+    "C2B transaction simulation",
+    ("ShortCode", "CommandID", "Amount", "Msisdn", "BillRefNumber"),
+)
+
+B2C_PAYMENT = Endpoint(
+    B2C_PAYMENT_PATH,
+    "B2C transaction",
+    (
+        "OriginatorConversationID",
+        "InitiatorName",
+        "SecurityCredential",
+        "CommandID",
+        "Amount",
+        "PartyA",
+        "PartyB",
+        "Remarks",
+        "QueueTimeOutURL",
+        "ResultURL",
+        "Occassion",
+    ),
+)
+
+ACCOUNT_BALANCE = Endpoint(
+    ACCOUNT_BALANCE_PATH,
+    "balance query",
+    (
+        "Initiator",
+        "SecurityCredential",
+        "CommandID",
+        "PartyA",
+        "IdentifierType",
+        "Remarks",
+        "QueueTimeOutURL",
+        "ResultURL",
+    ),
+    {"CommandID": "AccountBalance"},
+)
+
+TRANSACTION_STATUS = Endpoint(
+    TRANSACTION_STATUS_PATH,
+    "retrieval of transaction status",
+    (
+        "Securitycredential",
+        "OriginatorconversationID",
+        "CommandID",
+        "PartyA",
+        "IdentifierType",
+        "Remarks",
+        "Initiator",
+        "QueueTimeOutURL",
+        "ResultURL",
+        "TransactionID",
+        "Occasion",
+    ),
+    {"CommandID": "TransactionStatusQuery"},
+)
+
+STK_PUSH = Endpoint(
+    STK_PUSH_PATH,
+    "Lipa na Mpesa transaction",
+    (
+        "BusinessShortCode",
+        "Password",
+        "Timestamp",
+        "TransactionType",
+        "Amount",
+        "PartyA",
+        "PartyB",
+        "PhoneNumber",
+        "CallBackURL",
+        "AccountReference",
+        "TransactionDesc",
+    ),
+)
+
+STK_QUERY = Endpoint(
+    STK_QUERY_PATH,
+    "Lipa na Mpesa status query",
+    ("BusinessShortCode", "Password", "Timestamp", "CheckoutRequestID"),
+)
+
+REVERSAL = Endpoint(
+    REVERSAL_PATH,
+    "reversal request",
+    (
+        "Initiator",
+        "SecurityCredential",
+        "CommandID",
+        "TransactionID",
+        "Amount",
+        "ReceiverParty",
+        "RecieverIdentifierType",
+        "ResultURL",
+        "QueueTimeOutURL",
+        "Remarks",
+        "Occasion",
+    ),
+    {"CommandID": "TransactionReversal"},
+)
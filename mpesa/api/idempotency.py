@@ -0,0 +1,270 @@
+import hashlib
+import itertools
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+import httpx
+
+from mpesa.api import serialization
+from mpesa.api.circuit_breaker import CircuitOpenError
+from mpesa.api.responses import MalformedResponseError
+from mpesa.api.retry import RETRYABLE_EXCEPTIONS
+
+PENDING = "pending"
+SUCCEEDED = "succeeded"
+
+# Gateway errors after which Mpesa may or may not have processed the request.
+AMBIGUOUS_STATUSES = (502, 504)
+
+
+class DuplicateRequestError(ValueError):
+    """
+    Raised when a request reuses an idempotency key whose earlier submission is
+    still in flight or ended with an unknown outcome, or whose payload differs.
+    """
+
+
+class IdempotencyRecord(NamedTuple):
+    """State of a request submitted under an idempotency key."""
+
+    key: str
+    state: str
+    fingerprint: str
+    response: Optional[Any]
+    updated_at: float
+
+    def replay(self, payload: Dict[str, Any]) -> Any:
+        """
+        Returns the cached response of a completed request.
+
+        Args:
+            payload (Dict[str, Any]): Payload of the request being replayed.
+
+        Raises:
+            DuplicateRequestError: Raised if the request is still pending or the
+            payload does not match the original request.
+        """
+        if fingerprint(payload) != self.fingerprint:
+            raise DuplicateRequestError(
+                f"Idempotency key {self.key} was already used for a different request."
+            )
+        if self.state != SUCCEEDED:
+            raise DuplicateRequestError(
+                f"A request with idempotency key {self.key} is already pending; "
+                "query its transaction status before submitting it again."
+            )
+        return self.response
+
+
+# Payload fields that legitimately differ between submissions of one request;
+# RSA PKCS#1 v1.5 encryption of the initiator password is randomized.
+VOLATILE_FIELDS = frozenset({"SecurityCredential"})
+
+
+def fingerprint(payload: Dict[str, Any]) -> str:
+    """Returns a stable digest of a request payload."""
+    canonical = serialization.dumps(
+        {key: payload[key] for key in sorted(payload) if key not in VOLATILE_FIELDS}
+    )
+    return hashlib.sha256(canonical).hexdigest()
+
+
+def is_definite_failure(error: BaseException) -> bool:
+    """
+    Returns True if error proves Mpesa did not accept the request, so its
+    idempotency key can be released and the request submitted again.
+    """
+    if isinstance(error, CircuitOpenError):
+        return True  # the request was never sent
+    if isinstance(error, MalformedResponseError):
+        return True  # the answer did not come from Mpesa's API
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code not in AMBIGUOUS_STATUSES
+    if isinstance(error, httpx.RequestError):
+        return isinstance(error, RETRYABLE_EXCEPTIONS)
+    return False
+
+
+class IdempotencyStore(ABC):
+    """
+    IdempotencyStore records the state of B2C and reversal requests keyed on their
+    OriginatorConversationID or TransactionID, so that a retried call never
+    submits the same payout twice.
+
+    A key is claimed as pending before the request is sent. It is completed with
+    the response once Mpesa accepts the request, and released when Mpesa
+    definitely rejected it. Requests that time out stay pending until they are
+    reconciled, e.g. with a transaction status query, and then completed or
+    released by hand.
+
+    Methods:
+        claim(key, fingerprint) -> Optional[IdempotencyRecord]: Claims key, or
+        returns the existing record if it was already claimed.
+        get(key) -> Optional[IdempotencyRecord]: Returns the record for key.
+        complete(key, response): Marks key as succeeded with its response.
+        release(key): Forgets key so that the request may be submitted again.
+    """
+
+    @abstractmethod
+    def claim(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[IdempotencyRecord]:
+        pass
+
+    @abstractmethod
+    def complete(self, key: str, response: Any) -> None:
+        pass
+
+    @abstractmethod
+    def release(self, key: str) -> None:
+        pass
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """
+    MemoryIdempotencyStore keeps idempotency records in process memory and evicts
+    the least recently used succeeded ones once `max_entries` is exceeded. Pending
+    records are never evicted, since forgetting them would let an unreconciled
+    payout be submitted again.
+
+    Attributes:
+        max_entries (int): Maximum number of succeeded records kept.
+    """
+
+    def __init__(self, max_entries: int = 10000, clock=time.time):
+        """
+        Initializes an empty store.
+
+        Args:
+            max_entries (int): Maximum number of records kept.
+            clock (Callable[[], float]): Wall clock used to timestamp records.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._records: "OrderedDict[str, IdempotencyRecord]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def claim(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None:
+                self._records.move_to_end(key)
+                return record
+            self._records[key] = IdempotencyRecord(
+                key, PENDING, fingerprint, None, self._clock()
+            )
+            excess = len(self._records) - self.max_entries
+            if excess > 0:
+                succeeded = (
+                    stale
+                    for stale, stale_record in self._records.items()
+                    if stale_record.state == SUCCEEDED
+                )
+                for stale in list(itertools.islice(succeeded, excess)):
+                    del self._records[stale]
+            return None
+
+    def get(self, key: str) -> Optional[IdempotencyRecord]:
+        with self._lock:
+            return self._records.get(key)
+
+    def complete(self, key: str, response: Any) -> None:
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None:
+                self._records[key] = record._replace(
+                    state=SUCCEEDED, response=response, updated_at=self._clock()
+                )
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            self._records.pop(key, None)
+
+
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """
+    SQLiteIdempotencyStore persists idempotency records in a SQLite database, so
+    pending payouts survive restarts and can be shared between processes on the
+    same host.
+
+    Attributes:
+        path (str): Path of the SQLite database file.
+    """
+
+    def __init__(self, path: str, clock=time.time):
+        """
+        Opens (and if needed creates) the idempotency database.
+
+        Args:
+            path (str): Path of the SQLite database file, or ":memory:".
+            clock (Callable[[], float]): Wall clock used to timestamp records.
+        """
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS idempotency ("
+            "key TEXT PRIMARY KEY, state TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+            "response BLOB, updated_at REAL NOT NULL)"
+        )
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def claim(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO idempotency "
+                "(key, state, fingerprint, response, updated_at) "
+                "VALUES (?, ?, ?, NULL, ?)",
+                (key, PENDING, fingerprint, self._clock()),
+            )
+            if cursor.rowcount == 1:
+                return None
+            return self._select(key)
+
+    def get(self, key: str) -> Optional[IdempotencyRecord]:
+        with self._lock:
+            return self._select(key)
+
+    def complete(self, key: str, response: Any) -> None:
+        with self._lock:
+            self._connection.execute(
+                "UPDATE idempotency SET state = ?, response = ?, updated_at = ? "
+                "WHERE key = ?",
+                (SUCCEEDED, serialization.dumps(response), self._clock(), key),
+            )
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM idempotency WHERE key = ?", (key,))
+
+    def _select(self, key: str) -> Optional[IdempotencyRecord]:
+        row = self._connection.execute(
+            "SELECT key, state, fingerprint, response, updated_at "
+            "FROM idempotency WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        key, state, digest, response, updated_at = row
+        if response is not None:
+            response = serialization.loads(response)
+        return IdempotencyRecord(key, state, digest, response, updated_at)
@@ -0,0 +1,452 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:  # OpenTelemetry is optional; only OpenTelemetryInstrumentation needs it
+    from opentelemetry import metrics as otel_metrics
+except ImportError:  # pragma: no cover - exercised when opentelemetry is missing
+    otel_metrics = None
+
+# Upper bounds in seconds of the latency histogram buckets.
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# httpcore trace events mapped to the request phase they time. DNS resolution is
+# part of "connect" because httpcore resolves names while opening the socket.
+TRACE_PHASES = {
+    "connection.connect_tcp": "connect",
+    "connection.connect_unix_socket": "connect",
+    "connection.start_tls": "tls",
+    "http11.send_request_headers": "send",
+    "http11.send_request_body": "send",
+    "http2.send_request_headers": "send",
+    "http2.send_request_body": "send",
+    "http11.receive_response_headers": "wait",
+    "http2.receive_response_headers": "wait",
+    "http11.receive_response_body": "receive",
+    "http2.receive_response_body": "receive",
+}
+
+
+class PhaseTimer:
+    """
+    PhaseTimer is an httpx "trace" extension that measures how long a request
+    spends connecting, negotiating TLS, sending, waiting for the first byte and
+    receiving the body.
+
+    Attributes:
+        phases (Dict[str, float]): Seconds spent in each phase of the request.
+    """
+
+    __slots__ = ("phases", "_started")
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self._started: Dict[str, float] = {}
+
+    def __call__(self, event: str, info: Dict[str, Any]) -> None:
+        name, _, stage = event.rpartition(".")
+        phase = TRACE_PHASES.get(name)
+        if phase is None:
+            return
+        if stage == "started":
+            self._started[name] = time.perf_counter()
+        else:
+            started = self._started.pop(name, None)
+            if started is not None:
+                elapsed = time.perf_counter() - started
+                self.phases[phase] = self.phases.get(phase, 0.0) + elapsed
+
+    async def atrace(self, event: str, info: Dict[str, Any]) -> None:
+        """Asynchronous form of the callback required by httpx.AsyncClient."""
+        self(event, info)
+
+
+class Instrumentation:
+    """
+    Instrumentation receives events from the request path shared by every API
+    class. Subclasses override the hooks they need; the base implementations do
+    nothing. Hooks run synchronously on the request path, so they should be cheap.
+
+    Attributes:
+        trace_phases (bool): Whether per-phase timings are collected through the
+        httpx trace extension and passed to `attempt_finished()`.
+
+    Methods:
+        request_started(path, operation): An API call began.
+        auth_acquired(path, seconds): An access token is available.
+        attempt_finished(path, attempt, status_code, error, seconds, phases): One
+        HTTP attempt completed or failed.
+        retry_scheduled(path, attempt, delay): A failed attempt will be retried.
+        request_finished(path, operation, status_code, error, seconds): The API
+        call returned or raised.
+    """
+
+    trace_phases = False
+
+    def request_started(self, path: str, operation: str) -> None:
+        """Called before the access token is looked up."""
+
+    def auth_acquired(self, path: str, seconds: float) -> None:
+        """Called with the seconds spent obtaining the access token."""
+
+    def attempt_finished(
+        self,
+        path: str,
+        attempt: int,
+        status_code: Optional[int],
+        error: Optional[BaseException],
+        seconds: float,
+        phases: Dict[str, float],
+    ) -> None:
+        """
+        Called after each HTTP attempt, including retries and token replays.
+
+        Args:
+            path (str): Endpoint path.
+            attempt (int): Zero-based attempt number within the call.
+            status_code (Optional[int]): Response status, None on transport errors.
+            error (Optional[BaseException]): Transport error of the attempt.
+            seconds (float): Duration of the attempt.
+            phases (Dict[str, float]): Seconds per phase ("connect", "tls", "send",
+            "wait", "receive") when `trace_phases` is enabled.
+        """
+
+    def retry_scheduled(self, path: str, attempt: int, delay: float) -> None:
+        """Called when attempt failed and the next one starts after delay seconds."""
+
+    def request_finished(
+        self,
+        path: str,
+        operation: str,
+        status_code: Optional[int],
+        error: Optional[BaseException],
+        seconds: float,
+    ) -> None:
+        """
+        Called when an API call returns or raises.
+
+        Args:
+            path (str): Endpoint path.
+            operation (str): Human readable name of the operation.
+            status_code (Optional[int]): Final status, None when no response was
+            received or an idempotent replay was served from the store.
+            error (Optional[BaseException]): Exception raised to the caller.
+            seconds (float): Duration of the call including authentication and
+            retries.
+        """
+
+
+def status_label(status_code: Optional[int], error: Optional[BaseException]) -> str:
+    """Returns the status reported for a finished call."""
+    if status_code is not None:
+        return str(status_code)
+    return "error" if error is not None else "replayed"
+
+
+class Histogram:
+    """
+    Histogram counts observations in cumulative latency buckets.
+
+    Attributes:
+        buckets (Tuple[float, ...]): Upper bounds of the buckets in seconds.
+        counts (List[int]): Observations per bucket, the last one being +Inf.
+        sum (float): Sum of all observations.
+        count (int): Number of observations.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Returns the upper bound of the bucket containing the q-quantile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = []
+        seen = 0
+        for count in self.counts:
+            seen += count
+            cumulative.append(seen)
+        return {
+            "buckets": list(self.buckets),
+            "cumulative_counts": cumulative,
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class EndpointMetrics:
+    """Counters and histograms of a single endpoint."""
+
+    __slots__ = (
+        "requests",
+        "errors",
+        "retries",
+        "attempts",
+        "statuses",
+        "latency",
+        "auth",
+        "phases",
+    )
+
+    def __init__(self, buckets: Sequence[float]):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.attempts = 0
+        self.statuses: Dict[str, int] = {}
+        self.latency = Histogram(buckets)
+        self.auth = Histogram(buckets)
+        self.phases: Dict[str, Histogram] = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "attempts": self.attempts,
+            "statuses": dict(self.statuses),
+            "latency": self.latency.snapshot(),
+            "auth": self.auth.snapshot(),
+            "phases": {name: h.snapshot() for name, h in self.phases.items()},
+        }
+
+
+class MetricsCollector(Instrumentation):
+    """
+    MetricsCollector aggregates per-endpoint request, error, retry and status
+    counters together with histograms of call latency, authentication time and
+    request phases. Pass it as `instrumentation` to any API class and read it
+    with `snapshot()` or export it with `render_prometheus()`.
+
+    Attributes:
+        buckets (Tuple[float, ...]): Histogram bucket upper bounds in seconds.
+
+    Methods:
+        endpoint(path) -> EndpointMetrics: Returns the metrics of an endpoint.
+        snapshot() -> Dict[str, Any]: Returns all metrics as plain data.
+        reset(): Drops all collected metrics.
+    """
+
+    trace_phases = True
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initializes an empty collector.
+
+        Args:
+            buckets (Sequence[float]): Histogram bucket upper bounds in seconds.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+
+    def endpoint(self, path: str) -> EndpointMetrics:
+        with self._lock:
+            return self._endpoint(path)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {path: m.snapshot() for path, m in self._endpoints.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def auth_acquired(self, path: str, seconds: float) -> None:
+        with self._lock:
+            self._endpoint(path).auth.observe(seconds)
+
+    def attempt_finished(self, path, attempt, status_code, error, seconds, phases):
+        with self._lock:
+            metrics = self._endpoint(path)
+            metrics.attempts += 1
+            for phase, elapsed in phases.items():
+                histogram = metrics.phases.get(phase)
+                if histogram is None:
+                    histogram = metrics.phases[phase] = Histogram(self.buckets)
+                histogram.observe(elapsed)
+
+    def retry_scheduled(self, path: str, attempt: int, delay: float) -> None:
+        with self._lock:
+            self._endpoint(path).retries += 1
+
+    def request_finished(self, path, operation, status_code, error, seconds):
+        status = status_label(status_code, error)
+        with self._lock:
+            metrics = self._endpoint(path)
+            metrics.requests += 1
+            if error is not None:
+                metrics.errors += 1
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            metrics.latency.observe(seconds)
+
+    def _endpoint(self, path: str) -> EndpointMetrics:
+        metrics = self._endpoints.get(path)
+        if metrics is None:
+            metrics = self._endpoints[path] = EndpointMetrics(self.buckets)
+        return metrics
+
+
+def render_prometheus(collector: MetricsCollector, prefix: str = "mpesa") -> str:
+    """
+    Renders a collector in the Prometheus text exposition format, e.g. for a
+    `/metrics` endpoint. No Prometheus client library is required.
+
+    Args:
+        collector (MetricsCollector): Collector to export.
+        prefix (str): Prefix of every metric name.
+
+    Returns:
+        str: Metrics in Prometheus text format.
+    """
+    snapshot = collector.snapshot()
+    lines: List[str] = []
+
+    def counter(name: str, help_text: str, key: str) -> None:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} counter")
+        for path, metrics in snapshot.items():
+            lines.append(f'{prefix}_{name}{{endpoint="{path}"}} {metrics[key]}')
+
+    def histogram(name: str, help_text: str, series: List[Tuple[str, Dict]]) -> None:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} histogram")
+        for labels, data in series:
+            bounds = [repr(b) for b in data["buckets"]] + ["+Inf"]
+            for bound, count in zip(bounds, data["cumulative_counts"]):
+                lines.append(f'{prefix}_{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{prefix}_{name}_sum{{{labels}}} {data['sum']}")
+            lines.append(f"{prefix}_{name}_count{{{labels}}} {data['count']}")
+
+    counter("requests_total", "API calls made.", "requests")
+    counter("errors_total", "API calls that raised.", "errors")
+    counter("retries_total", "Retried attempts.", "retries")
+    counter("attempts_total", "HTTP attempts sent.", "attempts")
+
+    lines.append(f"# HELP {prefix}_responses_total API calls by final status.")
+    lines.append(f"# TYPE {prefix}_responses_total counter")
+    for path, metrics in snapshot.items():
+        for status, count in metrics["statuses"].items():
+            lines.append(
+                f'{prefix}_responses_total{{endpoint="{path}",status="{status}"}} '
+                f"{count}"
+            )
+
+    histogram(
+        "request_duration_seconds",
+        "API call latency including authentication and retries.",
+        [(f'endpoint="{path}"', m["latency"]) for path, m in snapshot.items()],
+    )
+    histogram(
+        "auth_duration_seconds",
+        "Time spent obtaining an access token.",
+        [(f'endpoint="{path}"', m["auth"]) for path, m in snapshot.items()],
+    )
+    histogram(
+        "phase_duration_seconds",
+        "Time per HTTP phase (connect, tls, send, wait, receive).",
+        [
+            (f'endpoint="{path}",phase="{phase}"', data)
+            for path, m in snapshot.items()
+            for phase, data in m["phases"].items()
+        ],
+    )
+    return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    OpenTelemetryInstrumentation records request metrics with the OpenTelemetry
+    metrics API. Requires the `opentelemetry-api` package.
+
+    Attributes:
+        meter: OpenTelemetry meter used to create the instruments.
+    """
+
+    trace_phases = True
+
+    def __init__(self, meter: Any = None):
+        """
+        Creates the OpenTelemetry instruments.
+
+        Args:
+            meter: Meter to use; defaults to the global meter provider's "mpesa"
+            meter.
+
+        Raises:
+            ImportError: Raised if opentelemetry-api is not installed.
+        """
+        if meter is None:
+            if otel_metrics is None:
+                raise ImportError(
+                    "OpenTelemetryInstrumentation requires the opentelemetry-api "
+                    "package."
+                )
+            meter = otel_metrics.get_meter("mpesa")
+        self.meter = meter
+        self._requests = meter.create_counter(
+            "mpesa.requests", description="API calls made."
+        )
+        self._retries = meter.create_counter(
+            "mpesa.retries", description="Retried attempts."
+        )
+        self._duration = meter.create_histogram(
+            "mpesa.request.duration", unit="s", description="API call latency."
+        )
+        self._auth = meter.create_histogram(
+            "mpesa.auth.duration", unit="s", description="Access token latency."
+        )
+        self._phases = meter.create_histogram(
+            "mpesa.request.phase.duration", unit="s", description="HTTP phases."
+        )
+
+    def auth_acquired(self, path: str, seconds: float) -> None:
+        self._auth.record(seconds, {"endpoint": path})
+
+    def attempt_finished(self, path, attempt, status_code, error, seconds, phases):
+        for phase, elapsed in phases.items():
+            self._phases.record(elapsed, {"endpoint": path, "phase": phase})
+
+    def retry_scheduled(self, path: str, attempt: int, delay: float) -> None:
+        self._retries.add(1, {"endpoint": path})
+
+    def request_finished(self, path, operation, status_code, error, seconds):
+        attributes = {
+            "endpoint": path,
+            "status": status_label(status_code, error),
+        }
+        self._requests.add(1, attributes)
+        self._duration.record(seconds, attributes)
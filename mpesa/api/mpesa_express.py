@@ -1,10 +1,8 @@
-import httpx
-import time
-import base64
-from datetime import datetime
 from typing import Dict, Any
 
 from mpesa.api.auth import MpesaBase
+from mpesa.api.credentials import default_timestamp_clock, stk_password_generator
+from mpesa.api.endpoints import STK_PUSH, STK_QUERY
 
 class MpesaExpress(MpesaBase):
     """
@@ -24,10 +22,10 @@ class MpesaExpress(MpesaBase):
             app_secret: str=None,
             env="sandbox",
             sandbox_url: str="https://sandbox.safaricom.co.ke",
-            live_url: str="https://safaricom.co.ke"
+            live_url: str="https://safaricom.co.ke",
+            **kwargs: Any,
         ):
-        super().__init__(env, app_key, app_secret, sandbox_url, live_url)
-        self.authentication_token: Optional[str] = self.authenticate()
+        super().__init__(env, app_key, app_secret, sandbox_url, live_url, **kwargs)
 
     def stk_push(
             self,
@@ -63,74 +61,43 @@ class MpesaExpress(MpesaBase):
             httpx.HTTPStatusError: Raised for HTTP errors during the request
             ValueError: Raised for invalid or unsuccessful response from Mpesa API
         """
-        password = self.create_password(short_code, pass_key)
-        timestamp = self.create_timestamp()
-        
-        payload = {
-            "BusinessShortCode": short_code,
-            "Password": password,
-            "Timestamp": timestamp,
-            "TransactionType": transaction_type,
-            "Amount": amount,
-            "PartyA": sender_msisdn,
-            "PartyB": short_code,
-            "PhoneNumber": receiver_msisdn,
-            "CallBackURL": callback_url,
-            "AccountReference": account_ref,
-            "TransactionDesc": transaction_desc
-        }
-
-        headers = {
-            "Authorization": f"Bearer {self.authentication_token}",
-            "Content-Type": "application/json"
-        }
-
-        base_url = self.live_url if self.env == "production" else self.sandbox_url
-        api_url = f"{base_url}/mpesa/stkpush/v1/processrequest"
-
-        with httpx.Client() as client:
-            try:
-                response = client.post(api_url, headers=headers, json=payload)
-                response.raise_for_status()
-
-                return response.json()
-
-            except httpx.HTTPStatusError as http_err:
-                raise http_err
-
-            except (ValueError, httpx.RequestError) as err:
-                print(f"An error occured during Lipa na Mpesa transaction: {err}")
-                raise (
-                    "An error occured during the tranaction process"
-                    ) from err
+        password, timestamp = stk_password_generator(short_code, pass_key).generate()
+
+        return self._call(
+            STK_PUSH,
+            short_code,
+            password,
+            timestamp,
+            transaction_type,
+            amount,
+            sender_msisdn,
+            short_code,
+            receiver_msisdn,
+            callback_url,
+            account_ref,
+            transaction_desc
+        )
 
     def create_timestamp(self) -> str:
         """
         Creates a timestamp when a transaction was initiated
-        
+
         Returns:
             (str): The created timestamp
         """
-        timestamp = time.time()
-        formatted_timestamp = datetime.fromtimestamp(timestamp).strftime("%Y%m%d%H%M%S")
-
-        return formatted_timestamp
+        return default_timestamp_clock.now()[1]
 
-    def create_password(self, pass_key: str, short_code: int) -> str:
+    def create_password(self, short_code: int, pass_key: str) -> str:
         """Creates a password used for encrypting the request sent
 
+        The password is built for the current second; use
+        `stk_password_generator(short_code, pass_key).generate()` to obtain the
+        password together with the timestamp it was built from.
+
         Returns:
             Base64 encoded combination of short_code+pass_key+timestamp
         """
-        try:
-            timestamp = self.create_timestamp()
-            # String to be encoded and used as password
-            to_encode=f"{str(short_code)}{pass_key}{timestamp}"
-            password = base64.b64encode(to_encode.encode())
-
-            return str(password)
-        except Exception as e:
-            raise e
+        return stk_password_generator(short_code, pass_key).generate()[0]
 
     def status(
             self,
@@ -154,36 +121,8 @@ class MpesaExpress(MpesaBase):
             ValueError: Raised for invalid or unsuccessful response from Mpesa API
         """
 
-        password = self.create_password(short_code, pass_key)
-        timestamp = self.create_timestamp()
-
-        headers = {
-            "Authorization": f"Bearer {self.authentication_token}",
-            "Content-Type": "application/json"
-        }
-
-        payload = {
-            "BusinessShortCode": short_code,
-            "Password": password,
-            "Timestamp": timestamp,
-            "CheckoutRequestID": checkout_request_id
-        }
-
-        base_url = self.live_url if self.env == "production" else self.sandbox_url
-        api_url = f"{base_url}/mpesa/stkpushquery/v1/query"
-        
-        with httpx.Client() as client:
-            try:
-                response = client.post(api_url, headers=headers, json=payload)
-                response.raise_for_status()
-
-                return response.json()
-
-            except httpx.HTTPStatusError as http_err:
-                print(f"{http_err.response.status_code} - {http_err.request.url}")
-                raise http_err
-
-            except (ValueError, httpx.RequestError) as err:
-               raise (
-                    "An error occured during checking trnsaction status."
-                    ) from err
+        password, timestamp = stk_password_generator(short_code, pass_key).generate()
+
+        return self._call(
+            STK_QUERY, short_code, password, timestamp, checkout_request_id
+        )
@@ -0,0 +1,459 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from mpesa.api import serialization
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+FAILED = "failed"
+
+# Journal operations buffered for the writer thread.
+_INSERT = "insert"
+_ACK = "ack"
+_FAIL = "fail"
+_REQUEUE = "requeue"
+
+
+class OutboundEntry(NamedTuple):
+    """A request recorded in the outbound journal."""
+
+    id: str
+    api: str
+    method: str
+    kwargs: Dict[str, Any]
+    enqueued_at: float
+    error: Optional[str] = None
+
+
+class OutboundResult(NamedTuple):
+    """Outcome of a journaled request, passed to the queue's handler."""
+
+    entry: OutboundEntry
+    response: Any
+    error: Optional[BaseException]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _Batch:
+    """Enqueues committed by one journal transaction; callers wait on `done`."""
+
+    __slots__ = ("done", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+class OutboundQueue:
+    """
+    OutboundQueue journals requests to a local SQLite database before sending
+    them, so that requests accepted by `enqueue()` survive crashes and pod
+    restarts. Entries are sent by `concurrency` worker threads and removed from
+    the journal once they completed; entries still in the journal when the queue
+    starts are replayed.
+
+    A single writer thread commits the journal in batches: every enqueue,
+    acknowledgement and failure buffered while the previous transaction was
+    being written goes into the next one, so many enqueues share one fsync.
+
+    Delivery is at least once: an entry sent just before a crash is sent again
+    on replay. B2C payments and reversals are protected by the clients'
+    idempotency store; use SQLiteIdempotencyStore for them so that a replayed
+    payout returns the recorded response instead of paying twice.
+
+    Failed entries stay in the journal marked as failed until `requeue()` is
+    called. The API clients must be the synchronous classes; they are shared by
+    the worker threads.
+
+    Attributes:
+        path (str): Path of the SQLite journal.
+        clients (Dict[str, Any]): API clients by name, e.g. {"b2c": B2C(...)}.
+        concurrency (int): Number of worker threads sending entries.
+        handler (Optional[Callable[[OutboundResult], Any]]): Called with the
+        outcome of every entry.
+        flush_interval (float): Seconds the writer waits to gather a batch.
+
+    Methods:
+        start(): Starts the workers and replays unfinished entries.
+        enqueue(api, method, kwargs, wait) -> str: Journals a request.
+        flush(): Waits until buffered journal writes are committed.
+        join(timeout) -> bool: Waits until every entry has been processed.
+        failed() -> List[OutboundEntry]: Returns the failed entries.
+        requeue(entry_id) -> int: Sends failed entries again.
+        close(drain): Stops the workers and closes the journal.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        clients: Dict[str, Any],
+        concurrency: int = 4,
+        handler: Optional[Callable[[OutboundResult], Any]] = None,
+        flush_interval: float = 0.001,
+        synchronous: str = "FULL",
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Opens (and if needed creates) the journal.
+
+        Args:
+            path (str): Path of the SQLite journal file.
+            clients (Dict[str, Any]): API clients by the name passed to
+            `enqueue()`.
+            concurrency (int): Number of worker threads sending entries.
+            handler (Optional[Callable[[OutboundResult], Any]]): Called from the
+            worker threads with the outcome of every entry.
+            flush_interval (float): Seconds the writer waits for more writes
+            before committing a small batch.
+            synchronous (str): SQLite synchronous mode; "FULL" fsyncs every
+            commit, "NORMAL" survives process crashes but not power loss.
+            clock (Callable[[], float]): Wall clock used to timestamp entries.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        if synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Unknown synchronous mode {synchronous}.")
+
+        self.path = path
+        self.clients = dict(clients)
+        self.concurrency = concurrency
+        self.handler = handler
+        self.flush_interval = flush_interval
+        self._clock = clock
+
+        self._db_lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA synchronous={synchronous.upper()}")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS outbound ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, "
+            "api TEXT NOT NULL, method TEXT NOT NULL, kwargs BLOB NOT NULL, "
+            "state TEXT NOT NULL, enqueued_at REAL NOT NULL, error TEXT)"
+        )
+
+        self._cond = threading.Condition()
+        self._buffer: List[Tuple[str, Any]] = []
+        self._batch = _Batch()
+        self._write_error: Optional[BaseException] = None
+        self._unfinished = 0
+        self._work: "queue.Queue[Optional[OutboundEntry]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._started = False
+        self._closed = False
+        self._halted = False
+        self._stopping = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """Number of entries enqueued or replayed but not yet processed."""
+        return self._unfinished
+
+    def start(self) -> None:
+        """Starts the writer and worker threads and replays unfinished entries."""
+        with self._cond:
+            if self._started:
+                return
+            if self._closed:
+                raise ValueError("The outbound queue is closed.")
+            self._started = True
+
+        replayed = self._select(PENDING)
+        with self._cond:
+            self._unfinished += len(replayed)
+        for entry in replayed:
+            self._work.put(entry)
+
+        self._threads.append(
+            threading.Thread(target=self._write_loop, name="mpesa-outbound-writer")
+        )
+        for number in range(self.concurrency):
+            self._threads.append(
+                threading.Thread(
+                    target=self._work_loop, name=f"mpesa-outbound-{number}"
+                )
+            )
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def enqueue(
+        self,
+        api: str,
+        method: str,
+        kwargs: Optional[Dict[str, Any]] = None,
+        wait: bool = True,
+    ) -> str:
+        """
+        Journals a request and schedules it for sending.
+
+        Args:
+            api (str): Name of the client in `clients`, e.g. "b2c".
+            method (str): Name of the client method, e.g. "transact".
+            kwargs (Optional[Dict[str, Any]]): JSON serializable keyword arguments
+            of the method.
+            wait (bool): Blocks until the entry is committed to the journal; with
+            False, a failed write is only reported by `flush()`.
+
+        Returns:
+            str: ID of the journal entry.
+
+        Raises:
+            ValueError: Raised if the queue is not running or api or method is
+            unknown.
+        """
+        client = self.clients.get(api)
+        if client is None:
+            raise ValueError(
+                f"Unknown API {api}; expected one of {sorted(self.clients)}."
+            )
+        if method.startswith("_") or not callable(getattr(client, method, None)):
+            raise ValueError(f"{type(client).__name__} has no method {method}.")
+
+        kwargs = kwargs or {}
+        entry = OutboundEntry(uuid.uuid4().hex, api, method, kwargs, self._clock())
+        row = (
+            entry.id,
+            api,
+            method,
+            serialization.dumps(kwargs),
+            PENDING,
+            entry.enqueued_at,
+        )
+        with self._cond:
+            if self._closed or not self._started:
+                raise ValueError("The outbound queue is not running.")
+            self._buffer.append((_INSERT, (entry, row)))
+            self._unfinished += 1
+            batch = self._batch
+            self._cond.notify_all()
+        if wait:
+            batch.done.wait()
+            if batch.error is not None:
+                raise batch.error
+        return entry.id
+
+    def flush(self) -> None:
+        """
+        Waits until every journal write buffered so far is committed.
+
+        Raises:
+            sqlite3.Error: Raised if a write failed since the last flush.
+        """
+        with self._cond:
+            batch = self._batch if self._buffer else None
+        if batch is not None:
+            batch.done.wait()
+        with self._cond:
+            error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every enqueued entry has been sent and its outcome journaled.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait; None waits indefinitely.
+
+        Returns:
+            bool: True if the queue drained within timeout.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._unfinished == 0, timeout):
+                return False
+        self.flush()
+        return True
+
+    def failed(self) -> List[OutboundEntry]:
+        """Returns the entries whose request failed, oldest first."""
+        return self._select(FAILED)
+
+    def requeue(self, entry_id: Optional[str] = None) -> int:
+        """
+        Schedules failed entries to be sent again.
+
+        Args:
+            entry_id (Optional[str]): Entry to requeue; None requeues every failed
+            entry.
+
+        Returns:
+            int: Number of entries requeued.
+        """
+        entries = [
+            entry for entry in self.failed() if entry_id is None or entry.id == entry_id
+        ]
+        with self._cond:
+            if self._closed or not self._started:
+                raise ValueError("The outbound queue is not running.")
+            for entry in entries:
+                self._buffer.append((_REQUEUE, entry._replace(error=None)))
+            self._unfinished += len(entries)
+            self._cond.notify_all()
+        return len(entries)
+
+    def close(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stops the queue and closes the journal. Entries that were not sent stay in
+        the journal and are replayed by the next queue opened on it; requests
+        already being sent are completed first.
+
+        Args:
+            drain (bool): Waits for enqueued entries to be sent first.
+            timeout (Optional[float]): Seconds to wait for draining, after which
+            the remaining entries are left in the journal.
+        """
+        drained = self._started and drain and self.join(timeout)
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            # Workers skip the entries still queued instead of sending them.
+            self._halted = not drained
+        workers, writer = self._threads[1:], self._threads[:1]
+        for _ in workers:
+            self._work.put(None)
+        for thread in workers:
+            thread.join()
+        # The writer commits the outcomes of the last entries before exiting.
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in writer:
+            thread.join()
+        with self._db_lock:
+            self._connection.close()
+
+    def _select(self, state: str) -> List[OutboundEntry]:
+        with self._db_lock:
+            rows = self._connection.execute(
+                "SELECT id, api, method, kwargs, enqueued_at, error FROM outbound "
+                "WHERE state = ? ORDER BY seq",
+                (state,),
+            ).fetchall()
+        return [
+            OutboundEntry(id, api, method, serialization.loads(kwargs), at, error)
+            for id, api, method, kwargs, at, error in rows
+        ]
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._buffer or self._stopping)
+                if not self._buffer:
+                    return
+            if self.flush_interval > 0:
+                # Lets concurrent enqueues join this transaction.
+                time.sleep(self.flush_interval)
+            with self._cond:
+                operations, self._buffer = self._buffer, []
+                batch, self._batch = self._batch, _Batch()
+
+            try:
+                self._write(operations)
+            except Exception as error:
+                batch.error = error
+                with self._cond:
+                    self._write_error = error
+                    # Entries that were not journaled are not sent either.
+                    self._unfinished -= sum(
+                        1 for kind, _ in operations if kind in (_INSERT, _REQUEUE)
+                    )
+                    self._cond.notify_all()
+            else:
+                for kind, value in operations:
+                    if kind == _INSERT:
+                        self._work.put(value[0])
+                    elif kind == _REQUEUE:
+                        self._work.put(value)
+            batch.done.set()
+
+    def _write(self, operations: List[Tuple[str, Any]]) -> None:
+        inserts, acks, failures, requeues = [], [], [], []
+        for kind, value in operations:
+            if kind == _INSERT:
+                inserts.append(value[1])
+            elif kind == _ACK:
+                acks.append((value,))
+            elif kind == _FAIL:
+                failures.append(value)
+            else:
+                requeues.append((PENDING, value.id))
+
+        with self._db_lock:
+            connection = self._connection
+            connection.execute("BEGIN")
+            try:
+                connection.executemany(
+                    "INSERT INTO outbound (id, api, method, kwargs, state, "
+                    "enqueued_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    inserts,
+                )
+                connection.executemany(
+                    "UPDATE outbound SET state = ?, error = NULL WHERE id = ?",
+                    requeues,
+                )
+                connection.executemany(
+                    "UPDATE outbound SET state = ?, error = ? WHERE id = ?", failures
+                )
+                connection.executemany("DELETE FROM outbound WHERE id = ?", acks)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def _work_loop(self) -> None:
+        while True:
+            entry = self._work.get()
+            if entry is None:
+                return
+            if self._halted:
+                with self._cond:
+                    self._unfinished -= 1
+                    self._cond.notify_all()
+                continue
+            result = self._send(entry)
+            with self._cond:
+                if result.ok:
+                    self._buffer.append((_ACK, entry.id))
+                else:
+                    self._buffer.append((_FAIL, (FAILED, repr(result.error), entry.id)))
+                self._cond.notify_all()
+
+            if self.handler is not None:
+                try:
+                    self.handler(result)
+                except Exception:
+                    logger.exception(
+                        "Outbound queue handler failed for entry %s", entry.id
+                    )
+
+            with self._cond:
+                self._unfinished -= 1
+                self._cond.notify_all()
+
+    def _send(self, entry: OutboundEntry) -> OutboundResult:
+        try:
+            client = self.clients[entry.api]
+            response = getattr(client, entry.method)(**entry.kwargs)
+        except Exception as error:
+            return OutboundResult(entry, None, error)
+        return OutboundResult(entry, response, None)
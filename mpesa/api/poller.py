@@ -0,0 +1,346 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+import httpx
+
+from mpesa.api.mpesa_express import MpesaExpress
+from mpesa.api.responses import response_data
+
+# Error code returned by the STK query endpoint while the customer has not yet
+# completed or cancelled the prompt.
+STK_PENDING_ERROR_CODE = "500.001.1001"
+
+
+class StkPushOutcome(NamedTuple):
+    """Final outcome of a tracked STK push."""
+
+    checkout_request_id: str
+    # Status query response in the response mode of the client.
+    response: Any
+    error: Optional[BaseException]
+
+    @property
+    def result_code(self) -> Optional[str]:
+        if self.response is None:
+            return None
+        result_code = response_data(self.response).get("ResultCode")
+        return None if result_code is None else str(result_code)
+
+    @property
+    def result_desc(self) -> Optional[str]:
+        if self.response is None:
+            return None
+        return response_data(self.response).get("ResultDesc")
+
+    @property
+    def ok(self) -> bool:
+        """True when the customer completed the payment."""
+        return self.result_code == "0"
+
+
+class _Tracked:
+    """Book-keeping for a single outstanding CheckoutRequestID."""
+
+    __slots__ = (
+        "short_code",
+        "pass_key",
+        "checkout_request_id",
+        "future",
+        "interval",
+        "expires_at",
+        "in_flight",
+    )
+
+    def __init__(self, short_code, pass_key, checkout_request_id, interval, expires_at):
+        self.short_code = short_code
+        self.pass_key = pass_key
+        self.checkout_request_id = checkout_request_id
+        self.future: "Future[StkPushOutcome]" = Future()
+        self.interval = interval
+        self.expires_at = expires_at
+        self.in_flight = False
+
+
+class StkPushPoller:
+    """
+    StkPushPoller tracks many outstanding STK pushes and queries their status until
+    the customer completes or cancels the prompt.
+
+    Queries are scheduled on a single timer heap with adaptive backoff: the first
+    query happens shortly after the push and subsequent ones are spaced out further
+    until `max_interval`. A CheckoutRequestID is never queried twice concurrently,
+    and tracking it again returns the existing future. Queries are executed by a
+    bounded worker pool, so thousands of pushes can be tracked by one process.
+
+    Outcomes are delivered through the future returned by `track()`, an optional
+    per-push callback, or the `outcomes()` async iterator.
+
+    Attributes:
+        express (MpesaExpress): Client used to query STK push status.
+        initial_delay (float): Seconds before the first status query.
+        backoff (float): Multiplier applied to the interval after each query.
+        max_interval (float): Upper bound for the interval between queries.
+        timeout (float): Seconds after which a push is reported as timed out.
+
+    Methods:
+        track(short_code, pass_key, checkout_request_id, callback) -> Future: Starts
+        tracking a push.
+        outcomes() -> AsyncIterator[StkPushOutcome]: Yields outcomes as they finish.
+        stop(): Stops polling and cancels outstanding futures.
+    """
+
+    def __init__(
+        self,
+        express: MpesaExpress,
+        workers: int = 8,
+        initial_delay: float = 3.0,
+        backoff: float = 1.5,
+        max_interval: float = 30.0,
+        timeout: float = 180.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the poller; its scheduler thread starts on the first `track()`.
+
+        Args:
+            express (MpesaExpress): Client used to query STK push status.
+            workers (int): Maximum number of concurrent status queries.
+            initial_delay (float): Seconds before the first status query.
+            backoff (float): Multiplier applied to the interval after each query.
+            max_interval (float): Upper bound for the interval between queries.
+            timeout (float): Seconds after which a push is reported as timed out.
+            clock (Callable[[], float]): Monotonic clock used for scheduling.
+        """
+        self.express = express
+        self.initial_delay = initial_delay
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="stk-poller"
+        )
+        self._condition = threading.Condition()
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._tracked: Dict[str, _Tracked] = {}
+        self._listeners: List[Callable[[StkPushOutcome, bool], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    @property
+    def pending(self) -> int:
+        """Number of pushes still awaiting a final outcome."""
+        with self._condition:
+            return len(self._tracked)
+
+    def track(
+        self,
+        short_code: int,
+        pass_key: str,
+        checkout_request_id: str,
+        callback: Optional[Callable[[StkPushOutcome], None]] = None,
+    ) -> "Future[StkPushOutcome]":
+        """
+        Starts tracking an STK push.
+
+        Args:
+            short_code (int): Organization shortcode used for the push.
+            pass_key (str): Lipa na Mpesa pass key.
+            checkout_request_id (str): CheckoutRequestID returned by `stk_push()`.
+            callback (Optional[Callable]): Called with the outcome once final; not
+            called for pushes cancelled by `stop()`.
+
+        Returns:
+            Future[StkPushOutcome]: Resolves with the final outcome of the push.
+        """
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("The poller has been stopped.")
+
+            tracked = self._tracked.get(checkout_request_id)
+            if tracked is None:
+                now = self._clock()
+                tracked = _Tracked(
+                    short_code,
+                    pass_key,
+                    checkout_request_id,
+                    self.initial_delay,
+                    now + self.timeout,
+                )
+                self._tracked[checkout_request_id] = tracked
+                self._schedule(checkout_request_id, now + self.initial_delay)
+            self._ensure_started()
+
+        if callback is not None:
+
+            def notify(future: "Future[StkPushOutcome]") -> None:
+                # Pushes cancelled by stop() have no outcome to report.
+                if not future.cancelled():
+                    callback(future.result())
+
+            tracked.future.add_done_callback(notify)
+        return tracked.future
+
+    async def outcomes(self) -> AsyncIterator[StkPushOutcome]:
+        """Yields outcomes as they become final until no push remains pending."""
+        loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[Tuple[StkPushOutcome, bool]]" = asyncio.Queue()
+
+        def listener(outcome: StkPushOutcome, drained: bool) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, (outcome, drained))
+
+        with self._condition:
+            if not self._tracked:
+                return
+            self._listeners.append(listener)
+        try:
+            while True:
+                outcome, drained = await queue.get()
+                yield outcome
+                if drained:
+                    break
+        finally:
+            with self._condition:
+                self._listeners.remove(listener)
+
+    def stop(self) -> None:
+        """Stops the scheduler and cancels the futures of pending pushes."""
+        with self._condition:
+            self._stopped = True
+            tracked = list(self._tracked.values())
+            self._tracked.clear()
+            self._heap.clear()
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+        for item in tracked:
+            item.future.cancel()
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="stk-poller-scheduler", daemon=True
+            )
+            self._thread.start()
+
+    def _schedule(self, checkout_request_id: str, due: float) -> None:
+        heapq.heappush(self._heap, (due, next(self._sequence), checkout_request_id))
+        self._condition.notify()
+
+    def _run(self) -> None:
+        """Scheduler loop dispatching due queries to the worker pool."""
+        with self._condition:
+            while not self._stopped:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+
+                due, _, checkout_request_id = self._heap[0]
+                wait = due - self._clock()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+
+                heapq.heappop(self._heap)
+                tracked = self._tracked.get(checkout_request_id)
+                if tracked is None or tracked.in_flight:
+                    continue
+                tracked.in_flight = True
+                self._executor.submit(self._query, tracked)
+
+    def _query(self, tracked: _Tracked) -> None:
+        """Queries the status of a push and either finishes or reschedules it."""
+        response: Any = None
+        completed = False
+        error: Optional[BaseException] = None
+        try:
+            response = self.express.status(
+                short_code=tracked.short_code,
+                checkout_request_id=tracked.checkout_request_id,
+                pass_key=tracked.pass_key,
+            )
+            completed = response_data(response).get("ResultCode") is not None
+        except httpx.HTTPStatusError as http_err:
+            if not _is_pending(http_err.response):
+                error = http_err
+        except ValueError as err:
+            # Transport errors are transient; keep polling until the timeout
+            error = None if isinstance(err.__cause__, httpx.RequestError) else err
+        except Exception as err:
+            # Finish the push so that it is not left in flight forever.
+            error = err
+
+        if completed:
+            self._finish(
+                tracked, StkPushOutcome(tracked.checkout_request_id, response, None)
+            )
+        elif error is not None:
+            self._finish(
+                tracked, StkPushOutcome(tracked.checkout_request_id, None, error)
+            )
+        else:
+            self._reschedule(tracked)
+
+    def _reschedule(self, tracked: _Tracked) -> None:
+        with self._condition:
+            tracked.in_flight = False
+            if self._tracked.get(tracked.checkout_request_id) is not tracked:
+                return
+            now = self._clock()
+            if now >= tracked.expires_at:
+                timeout = TimeoutError(
+                    f"STK push {tracked.checkout_request_id} did not complete within "
+                    f"{self.timeout} seconds."
+                )
+                outcome = StkPushOutcome(tracked.checkout_request_id, None, timeout)
+            else:
+                tracked.interval = min(
+                    tracked.interval * self.backoff, self.max_interval
+                )
+                due = min(now + tracked.interval, tracked.expires_at)
+                self._schedule(tracked.checkout_request_id, due)
+                return
+        self._finish(tracked, outcome)
+
+    def _finish(self, tracked: _Tracked, outcome: StkPushOutcome) -> None:
+        with self._condition:
+            if self._tracked.get(tracked.checkout_request_id) is tracked:
+                del self._tracked[tracked.checkout_request_id]
+            # Listeners only schedule work, so they are notified under the lock to
+            # keep the drained flag consistent with the order of outcomes.
+            drained = not self._tracked
+            for listener in self._listeners:
+                listener(outcome, drained)
+        if tracked.future.set_running_or_notify_cancel():
+            tracked.future.set_result(outcome)
+
+
+def _is_pending(response: httpx.Response) -> bool:
+    """Returns True if an STK query error means the push is still in progress."""
+    try:
+        return response.json().get("errorCode") == STK_PENDING_ERROR_CODE
+    except (ValueError, AttributeError):
+        return False
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class TokenBucket:
+    """
+    TokenBucket is a thread-safe token bucket that hands out reservations instead of
+    blocking while holding its lock. Callers reserve a token and then sleep for the
+    returned delay, which lets threads and asyncio tasks share a single bucket.
+
+    Attributes:
+        rate (float): Tokens added per second, i.e. the sustained request rate.
+        capacity (float): Maximum number of tokens, i.e. the allowed burst size.
+
+    Methods:
+        reserve(tokens) -> float: Reserves tokens and returns the seconds to wait.
+        acquire(tokens): Reserves tokens and sleeps until they are available.
+        acquire_async(tokens): Coroutine version of `acquire()`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes a full token bucket.
+
+        Args:
+            rate (float): Tokens added per second; must be positive.
+            capacity (Optional[float]): Burst size; defaults to one second's worth of
+            tokens, with a minimum of one.
+            clock (Callable[[], float]): Monotonic clock used to refill the bucket.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero.")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(rate, 1.0)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Reserves tokens and returns how many seconds the caller must wait."""
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+            # Tokens may go negative; later callers then queue behind this one.
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Blocks the calling thread until the reserved tokens are available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        """Suspends the calling task until the reserved tokens are available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    """
+    RateLimiter holds one token bucket per Mpesa endpoint so that each endpoint is
+    paced according to its own Daraja quota. Endpoints are identified by the API
+    paths in `mpesa.api.constants`, e.g. STK_PUSH_PATH or B2C_PAYMENT_PATH.
+
+    A single RateLimiter can be shared by any number of API class instances,
+    threads and asyncio tasks using the same consumer key.
+
+    Attributes:
+        limits (Dict[str, float]): Requests per second allowed for each endpoint.
+        default_rate (Optional[float]): Requests per second for endpoints without a
+        specific limit; None leaves them unthrottled.
+        burst (Optional[float]): Burst size for every bucket; defaults to one
+        second's worth of requests.
+
+    Methods:
+        bucket(path) -> Optional[TokenBucket]: Returns the bucket for an endpoint.
+        acquire(path): Blocks until a request to the endpoint may be sent.
+        acquire_async(path): Coroutine version of `acquire()`.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, float]] = None,
+        default_rate: Optional[float] = None,
+        burst: Optional[float] = None,
+    ):
+        """
+        Initializes the rate limiter.
+
+        Args:
+            limits (Optional[Dict[str, float]]): Requests per second keyed by
+            endpoint path.
+            default_rate (Optional[float]): Rate applied to endpoints missing from
+            `limits`; None leaves them unthrottled.
+            burst (Optional[float]): Burst size applied to every endpoint bucket.
+        """
+        self.limits = dict(limits or {})
+        self.default_rate = default_rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, path: str) -> Optional[TokenBucket]:
+        """Returns the token bucket for an endpoint, or None if unthrottled."""
+        bucket = self._buckets.get(path)
+        if bucket is not None:
+            return bucket
+
+        rate = self.limits.get(path, self.default_rate)
+        if rate is None:
+            return None
+
+        with self._lock:
+            bucket = self._buckets.get(path)
+            if bucket is None:
+                bucket = self._buckets[path] = TokenBucket(rate, self.burst)
+        return bucket
+
+    def acquire(self, path: str) -> None:
+        """Blocks until a request to the endpoint at path may be sent."""
+        bucket = self.bucket(path)
+        if bucket is not None:
+            bucket.acquire()
+
+    async def acquire_async(self, path: str) -> None:
+        """Suspends the calling task until a request to path may be sent."""
+        bucket = self.bucket(path)
+        if bucket is not None:
+            await bucket.acquire_async()
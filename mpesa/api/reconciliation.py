@@ -0,0 +1,439 @@
+import asyncio
+import csv
+import functools
+import queue
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    IO,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from mpesa.api.bulk import _aiter_sync
+from mpesa.api.callbacks import ResultCallback
+from mpesa.api.correlator import (
+    ResultCorrelator,
+    ResultTimeoutError,
+    acknowledgement_ids,
+)
+from mpesa.api.status import TransactionStatus
+
+COMPLETED = "completed"
+FAILED = "failed"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+# Columns of the CSV report written by write_report.
+REPORT_FIELDS = (
+    "transaction_id",
+    "status",
+    "result_code",
+    "result_desc",
+    "transaction_status",
+    "amount",
+    "finalised_time",
+    "originator_conversation_id",
+    "conversation_id",
+    "error",
+)
+
+Query = Union[str, Dict[str, Any]]
+
+
+class ReconciliationRecord(NamedTuple):
+    """Outcome of the status query of one transaction."""
+
+    transaction_id: str
+    originator_conversation_id: str
+    status: str
+    result: Optional[ResultCallback]
+    error: Optional[BaseException]
+
+    @property
+    def ok(self) -> bool:
+        return self.status == COMPLETED
+
+    def row(self) -> Dict[str, Any]:
+        """Returns the record as a report row keyed by REPORT_FIELDS."""
+        result = self.result
+        parameters = result.parameters if result is not None else {}
+        return {
+            "transaction_id": self.transaction_id,
+            "status": self.status,
+            "result_code": None if result is None else result.result_code,
+            "result_desc": None if result is None else result.result_desc,
+            "transaction_status": parameters.get("TransactionStatus"),
+            "amount": parameters.get("Amount"),
+            "finalised_time": parameters.get("FinalisedTime"),
+            "originator_conversation_id": self.originator_conversation_id,
+            "conversation_id": None if result is None else result.conversation_id,
+            "error": None if self.error is None else str(self.error),
+        }
+
+
+def read_transaction_ids(
+    source: Union[str, IO[str]], column: str = "TransactionID"
+) -> Iterator[str]:
+    """
+    Reads transaction IDs from a CSV file lazily.
+
+    Args:
+        source (Union[str, IO[str]]): Path of the CSV file or an open text file.
+        column (str): Header of the column holding the transaction IDs.
+
+    Yields:
+        str: Each non-empty transaction ID in file order.
+
+    Raises:
+        ValueError: Raised if the file has no such column.
+    """
+    if isinstance(source, str):
+        with open(source, newline="") as file:
+            yield from read_transaction_ids(file, column)
+        return
+
+    reader = csv.DictReader(source)
+    if reader.fieldnames is None or column not in reader.fieldnames:
+        raise ValueError(f"CSV file has no {column} column.")
+    for row in reader:
+        transaction_id = (row.get(column) or "").strip()
+        if transaction_id:
+            yield transaction_id
+
+
+def write_report(
+    records: Iterable[ReconciliationRecord],
+    file: IO[str],
+    fields: Tuple[str, ...] = REPORT_FIELDS,
+    header: bool = True,
+) -> Counter:
+    """
+    Streams records into a CSV report, flushing every row.
+
+    Args:
+        records (Iterable[ReconciliationRecord]): Records, e.g. from
+        `StatusReconciliation.run()` or `StkCampaign.run()`.
+        file (IO[str]): Text file the report is written to.
+        fields (Tuple[str, ...]): Report columns.
+        header (bool): Writes the header row first; pass False when appending
+        to an existing report.
+
+    Returns:
+        Counter: Number of records per status.
+    """
+    writer = csv.DictWriter(file, fieldnames=fields, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    counts: Counter = Counter()
+    for record in records:
+        writer.writerow(record.row())
+        file.flush()
+        counts[record.status] += 1
+    return counts
+
+
+class StatusReconciliation:
+    """
+    StatusReconciliation queries the status of many transactions and matches the
+    results Mpesa delivers to `result_url` back to the transactions they belong
+    to.
+
+    Every query is sent with a fresh OriginatorConversationID under which the
+    transaction is remembered until its result arrives. Feed the results received
+    by your CallbackReceiver to `deliver()`, e.g. with
+    `CallbackReceiver({"/status/result": "status", "/status/timeout": "timeout"},
+    handler=reconciliation.deliver)`. Queries whose result does not arrive within
+    `result_timeout` seconds are reported as timed out.
+
+    At most `concurrency` queries are in flight; pace them further with the
+    client's RateLimiter. Transactions are consumed lazily and records are
+    yielded as soon as their outcome is known, so thousands of transactions can
+    be reconciled in a single streaming pass.
+
+    Attributes:
+        status (TransactionStatus): Client used to send the queries; an
+        AsyncTransactionStatus instance is required for `arun()`.
+        concurrency (int): Maximum number of queries in flight.
+        defaults (Dict[str, Any]): Keyword arguments of
+        `check_transaction_status()` applied to every query.
+        result_timeout (float): Seconds to wait for each result.
+        stats (Counter): Number of records per status in the current or last run.
+
+    Methods:
+        deliver(result) -> bool: Hands a status result or timeout notification to
+        the run; returns True if it matched a pending query.
+        run(transactions) -> Iterator[ReconciliationRecord]: Sends queries from
+        worker threads and yields records as their results arrive.
+        arun(transactions) -> AsyncIterator[ReconciliationRecord]: Sends queries
+        as asyncio tasks and yields records as their results arrive.
+    """
+
+    def __init__(
+        self,
+        status: TransactionStatus,
+        defaults: Optional[Dict[str, Any]] = None,
+        concurrency: int = 10,
+        result_timeout: float = 300.0,
+        poll_interval: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the reconciliation runner.
+
+        Args:
+            status (TransactionStatus): TransactionStatus or AsyncTransactionStatus
+            client whose connection pool is shared by all queries.
+            defaults (Optional[Dict[str, Any]]): Keyword arguments of
+            `check_transaction_status()` shared by every query, e.g. initiator,
+            security_credential, party_a, identifier_type, remarks, result_url
+            and queue_timeout_url.
+            concurrency (int): Maximum number of queries in flight.
+            result_timeout (float): Seconds to wait for each query's result.
+            poll_interval (float): Seconds between checks for results and
+            timeouts while nothing else happens.
+            clock (Callable[[], float]): Monotonic clock used for timeouts.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+
+        self.status = status
+        self.defaults = dict(defaults or {})
+        self.concurrency = concurrency
+        self.result_timeout = result_timeout
+        self.poll_interval = poll_interval
+        self.stats: Counter = Counter()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self._correlator = ResultCorrelator(
+            result_timeout, max_pending=None, clock=clock
+        )
+        self._completed: "queue.Queue[ReconciliationRecord]" = queue.Queue()
+
+    @property
+    def pending(self) -> int:
+        """Number of queries whose outcome has not been reported yet."""
+        return self._outstanding
+
+    def deliver(self, result: Any) -> bool:
+        """
+        Matches a result callback to its query by OriginatorConversationID or
+        ConversationID.
+
+        Args:
+            result (Any): TransactionStatusResult or TimeoutNotification parsed
+            by CallbackReceiver; other results are ignored.
+
+        Returns:
+            bool: True if the result completed a pending query.
+        """
+        return self._correlator.deliver(result)
+
+    def _report(self, record: ReconciliationRecord) -> None:
+        self._completed.put(record)
+        with self._lock:
+            self._outstanding -= 1
+
+    def _resolved(self, query: Dict[str, Any], future: Future) -> None:
+        """Reports the outcome of a query whose result arrived or expired."""
+        error = future.exception()
+        if isinstance(error, ResultTimeoutError):
+            status, result = TIMEOUT, error.notification
+        else:
+            result = future.result()
+            status = COMPLETED if result.ok else FAILED
+        self._report(
+            ReconciliationRecord(
+                query["transaction_id"],
+                query["originator_conversation_id"],
+                status,
+                result,
+                None,
+            )
+        )
+
+    def _prepare(self, transaction: Query) -> Dict[str, Any]:
+        """Builds the keyword arguments of one status query."""
+        if isinstance(transaction, str):
+            transaction = {"transaction_id": transaction}
+        query = {**self.defaults, **transaction}
+        if not query.get("transaction_id"):
+            raise ValueError("Every transaction needs a transaction_id.")
+        if not query.get("originator_conversation_id"):
+            query["originator_conversation_id"] = uuid.uuid4().hex
+        return query
+
+    def _register(self, query: Dict[str, Any]) -> None:
+        """Remembers a query before it is sent; its result may arrive first."""
+        with self._lock:
+            self._outstanding += 1
+        future = self._correlator.expect(query["originator_conversation_id"])
+        future.add_done_callback(functools.partial(self._resolved, query))
+
+    def _acknowledged(self, query: Dict[str, Any], response: Any) -> None:
+        """Maps the IDs Mpesa assigned in its acknowledgement to the query."""
+        try:
+            self._correlator.alias(
+                query["originator_conversation_id"], *acknowledgement_ids(response)
+            )
+        except ValueError:
+            pass  # the result arrived before the acknowledgement
+
+    def _failed(self, query: Dict[str, Any], error: BaseException) -> None:
+        if self._correlator.discard(query["originator_conversation_id"]):
+            self._report(
+                ReconciliationRecord(
+                    query["transaction_id"],
+                    query["originator_conversation_id"],
+                    ERROR,
+                    None,
+                    error,
+                )
+            )
+
+    def _query(self, query: Dict[str, Any]) -> None:
+        """Sends one query, capturing any error in a record."""
+        try:
+            response = self.status.check_transaction_status(**query)
+        except Exception as err:
+            self._failed(query, err)
+        else:
+            self._acknowledged(query, response)
+
+    async def _aquery(self, query: Dict[str, Any]) -> None:
+        """Sends one query through an AsyncTransactionStatus client."""
+        try:
+            response = await self.status.check_transaction_status(**query)
+        except Exception as err:
+            self._failed(query, err)
+        else:
+            self._acknowledged(query, response)
+
+    def _drain(self) -> List[ReconciliationRecord]:
+        records = []
+        while True:
+            try:
+                record = self._completed.get_nowait()
+            except queue.Empty:
+                break
+            self.stats[record.status] += 1
+            records.append(record)
+        return records
+
+    def _start(self) -> None:
+        # Queries left over from an abandoned run are forgotten.
+        self.stats = Counter()
+        self._outstanding = 0
+        self._correlator = ResultCorrelator(
+            self.result_timeout, max_pending=None, clock=self._clock
+        )
+        self._completed = queue.Queue()
+
+    def run(self, transactions: Iterable[Query]) -> Iterator[ReconciliationRecord]:
+        """
+        Sends status queries from a pool of worker threads.
+
+        Args:
+            transactions (Iterable[Union[str, Dict[str, Any]]]): Transaction IDs,
+            or dicts of `check_transaction_status()` keyword arguments, consumed
+            lazily.
+
+        Yields:
+            ReconciliationRecord: The outcome of each transaction in completion
+            order.
+        """
+        self._start()
+        records = iter(transactions)
+        in_flight = set()
+        exhausted = False
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                while True:
+                    in_flight = {future for future in in_flight if not future.done()}
+                    while not exhausted and len(in_flight) < self.concurrency:
+                        try:
+                            query = self._prepare(next(records))
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        self._register(query)
+                        in_flight.add(executor.submit(self._query, query))
+
+                    self._correlator.expire()
+                    yield from self._drain()
+                    if exhausted and not in_flight and not self.pending:
+                        if self._completed.empty():
+                            break
+                        continue
+                    try:
+                        record = self._completed.get(timeout=self.poll_interval)
+                    except queue.Empty:
+                        continue
+                    self.stats[record.status] += 1
+                    yield record
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+    async def arun(
+        self,
+        transactions: Union[Iterable[Query], AsyncIterable[Query]],
+    ) -> AsyncIterator[ReconciliationRecord]:
+        """
+        Sends status queries as asyncio tasks through an AsyncTransactionStatus
+        client.
+
+        Args:
+            transactions (Union[Iterable, AsyncIterable]): Transaction IDs or
+            query dicts, consumed lazily.
+
+        Yields:
+            ReconciliationRecord: The outcome of each transaction in completion
+            order.
+        """
+        self._start()
+        if hasattr(transactions, "__aiter__"):
+            records = transactions.__aiter__()
+        else:
+            records = _aiter_sync(transactions)
+        in_flight = set()
+        exhausted = False
+
+        try:
+            while True:
+                in_flight = {task for task in in_flight if not task.done()}
+                while not exhausted and len(in_flight) < self.concurrency:
+                    try:
+                        query = self._prepare(await records.__anext__())
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    self._register(query)
+                    in_flight.add(asyncio.ensure_future(self._aquery(query)))
+
+                self._correlator.expire()
+                for record in self._drain():
+                    yield record
+                if exhausted and not in_flight and not self.pending:
+                    if self._completed.empty():
+                        break
+                    continue
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            for task in in_flight:
+                task.cancel()
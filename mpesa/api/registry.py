@@ -0,0 +1,416 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+
+from mpesa.api.aio import (
+    AsyncB2C,
+    AsyncBalance,
+    AsyncC2B,
+    AsyncMpesaExpress,
+    AsyncReversal,
+    AsyncTransactionStatus,
+)
+from mpesa.api.auth import MpesaBase, token_cache_key
+from mpesa.api.b2c import B2C
+from mpesa.api.balance import Balance
+from mpesa.api.c2b import C2B
+from mpesa.api.constants import (
+    CONNECT_TIMEOUT_SECONDS,
+    KEEPALIVE_EXPIRY,
+    MAX_CONNECTIONS,
+    MAX_KEEPALIVE_CONNECTIONS,
+    TIMEOUT_SECONDS,
+)
+from mpesa.api.mpesa_express import MpesaExpress
+from mpesa.api.reversal import Reversal
+from mpesa.api.status import TransactionStatus
+from mpesa.api.token_cache import TokenCache, TokenKey
+
+
+class TenantConfig(NamedTuple):
+    """Credentials and client options of one registered tenant."""
+
+    name: str
+    app_key: str
+    app_secret: str
+    env: str
+    options: Dict[str, Any]
+
+
+class Tenant:
+    """
+    Tenant exposes the API classes of one shortcode or consumer key. Each API
+    class is created on first access and shares the registry's connection pool,
+    token cache and options.
+
+    Attributes:
+        config (TenantConfig): Credentials and options of the tenant.
+        last_used (float): Monotonic time the tenant was last looked up.
+
+    Methods:
+        api(name) -> MpesaBase: Returns the API client registered under name.
+    """
+
+    def __init__(
+        self, config: TenantConfig, classes: Dict[str, type], shared: Dict[str, Any]
+    ):
+        self.config = config
+        self.last_used = 0.0
+        self._classes = classes
+        self._shared = shared
+        self._lock = threading.Lock()
+        self._clients: Dict[str, MpesaBase] = {}
+
+    def __repr__(self) -> str:
+        return f"Tenant({self.config.name!r}, apis={sorted(self._clients)})"
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+    def api(self, name: str) -> MpesaBase:
+        """
+        Returns the API client registered under name, creating it on first use.
+
+        Args:
+            name (str): One of "c2b", "b2c", "balance", "transaction_status",
+            "mpesa_express" or "reversal".
+
+        Raises:
+            ValueError: Raised if name is not a known API.
+        """
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+        if name not in self._classes:
+            raise ValueError(
+                f"Unknown API {name}; expected one of {sorted(self._classes)}."
+            )
+
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                config = self.config
+                client = self._clients[name] = self._classes[name](
+                    env=config.env,
+                    app_key=config.app_key,
+                    app_secret=config.app_secret,
+                    **{**self._shared, **config.options},
+                )
+        return client
+
+    @property
+    def c2b(self):
+        return self.api("c2b")
+
+    @property
+    def b2c(self):
+        return self.api("b2c")
+
+    @property
+    def balance(self):
+        return self.api("balance")
+
+    @property
+    def transaction_status(self):
+        return self.api("transaction_status")
+
+    @property
+    def mpesa_express(self):
+        return self.api("mpesa_express")
+
+    @property
+    def reversal(self):
+        return self.api("reversal")
+
+
+class ClientRegistry:
+    """
+    ClientRegistry serves many paybills and tills, each with its own consumer key,
+    from a single connection pool and token cache. Tenants are registered with
+    their credentials up front; their API clients are built lazily on first use
+    and dropped again once the tenant has been idle for `idle_timeout` seconds or
+    when more than `max_active` tenants are in use. Credentials stay registered,
+    so an evicted tenant is rebuilt transparently, reusing its cached token.
+
+    Attributes:
+        idle_timeout (Optional[float]): Seconds after which an unused tenant's
+        clients are dropped; None keeps them until `max_active` is exceeded.
+        max_active (Optional[int]): Maximum number of tenants with live clients.
+        token_cache (TokenCache): Token cache shared by every tenant.
+
+    Methods:
+        register(name, app_key, app_secret, env, **options): Adds or replaces a
+        tenant.
+        unregister(name): Removes a tenant and drops its cached token.
+        tenant(name) -> Tenant: Returns the tenant's API facade.
+        evict_idle() -> List[str]: Drops tenants idle for longer than idle_timeout.
+        close(): Closes the shared connection pool.
+    """
+
+    api_classes: Dict[str, type] = {
+        "c2b": C2B,
+        "b2c": B2C,
+        "balance": Balance,
+        "transaction_status": TransactionStatus,
+        "mpesa_express": MpesaExpress,
+        "reversal": Reversal,
+    }
+
+    def __init__(
+        self,
+        idle_timeout: Optional[float] = 900.0,
+        max_active: Optional[int] = None,
+        token_cache: Optional[TokenCache] = None,
+        http_client: Optional[Any] = None,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+        timeout: Optional[httpx.Timeout] = None,
+        transport: Optional[Any] = None,
+        clock: Callable[[], float] = time.monotonic,
+        **options: Any,
+    ):
+        """
+        Initializes an empty registry.
+
+        Args:
+            idle_timeout (Optional[float]): Seconds a tenant may stay unused before
+            its clients are dropped.
+            max_active (Optional[int]): Maximum number of tenants with live
+            clients; the least recently used tenant is dropped first.
+            token_cache (Optional[TokenCache]): Cache shared by every tenant;
+            defaults to a cache owned by the registry.
+            http_client (Optional[httpx.Client]): Existing client to share; it is
+            not closed by `close()`.
+            limits (Optional[httpx.Limits]): Limits of the shared connection pool.
+            http2 (bool): Enables HTTP/2 on the shared client.
+            timeout (Optional[httpx.Timeout]): Timeouts of the shared client.
+            transport (Optional[httpx.BaseTransport]): Transport of the shared
+            client, e.g. a DarajaSimulator transport.
+            clock (Callable[[], float]): Monotonic clock used to track idleness.
+            **options: Options forwarded to every API client, e.g. rate_limiter,
+            retry_policy or instrumentation.
+        """
+        if max_active is not None and max_active < 1:
+            raise ValueError("max_active must be at least 1.")
+        self.idle_timeout = idle_timeout
+        self.max_active = max_active
+        self.token_cache = token_cache if token_cache is not None else TokenCache()
+        self.limits = limits or httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+        self.http2 = http2
+        self.timeout = timeout or httpx.Timeout(
+            TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS
+        )
+        self.transport = transport
+        self.options = options
+        self._clock = clock
+        self._client = http_client
+        self._owns_client = http_client is None
+        self._lock = threading.Lock()
+        self._client_lock = threading.Lock()
+        self._configs: Dict[str, TenantConfig] = {}
+        self._active: "OrderedDict[str, Tenant]" = OrderedDict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._configs
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+    def __getitem__(self, name: str) -> Tenant:
+        return self.tenant(name)
+
+    @property
+    def active(self) -> List[str]:
+        """Names of the tenants with live clients, least recently used first."""
+        with self._lock:
+            return list(self._active)
+
+    @property
+    def client(self) -> Any:
+        """Returns the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> Any:
+        return httpx.Client(
+            limits=self.limits,
+            http2=self.http2,
+            timeout=self.timeout,
+            transport=self.transport,
+        )
+
+    def register(
+        self, name: str, app_key: str, app_secret: str, env: str = "sandbox", **options
+    ) -> None:
+        """
+        Registers a tenant; registering an existing name replaces its credentials.
+
+        Args:
+            name (str): Name the tenant is looked up by, e.g. its shortcode.
+            app_key (str): Consumer key of the tenant's Daraja app.
+            app_secret (str): Consumer secret of the tenant's Daraja app.
+            env (str): Environment of the tenant; "sandbox" or "production".
+            **options: Per-tenant options overriding the registry's, e.g.
+            initiator_password and certificate_path.
+
+        Raises:
+            ValueError: Raised if app_key or app_secret is missing.
+        """
+        if not app_key or not app_secret:
+            raise ValueError(
+                "App key and app secret must be provided for authentication."
+            )
+        with self._lock:
+            self._configs[name] = TenantConfig(name, app_key, app_secret, env, options)
+            self._active.pop(name, None)
+
+    def unregister(self, name: str) -> None:
+        """Removes a tenant, its clients and its cached access token."""
+        with self._lock:
+            config = self._configs.pop(name, None)
+            self._active.pop(name, None)
+        if config is not None:
+            self.token_cache.invalidate(self._token_key(config))
+
+    def tenant(self, name: str) -> Tenant:
+        """
+        Returns the API facade of a tenant, building it if it was evicted.
+
+        Raises:
+            ValueError: Raised if no tenant is registered under name.
+        """
+        now = self._clock()
+        client = self.client
+        with self._lock:
+            tenant = self._active.get(name)
+            if tenant is None:
+                config = self._configs.get(name)
+                if config is None:
+                    raise ValueError(f"No tenant is registered as {name}.")
+                tenant = self._active[name] = self._build(config, client)
+            else:
+                self._active.move_to_end(name)
+            tenant.last_used = now
+            self._evict(now)
+        return tenant
+
+    def evict_idle(self) -> List[str]:
+        """
+        Drops the clients of tenants idle for longer than idle_timeout.
+
+        Returns:
+            List[str]: Names of the evicted tenants.
+        """
+        with self._lock:
+            return self._evict(self._clock())
+
+    def _evict(self, now: float) -> List[str]:
+        # Tenants are ordered by last use, so only the head needs checking.
+        evicted = []
+        while self._active:
+            name, tenant = next(iter(self._active.items()))
+            over_limit = self.max_active is not None and (
+                len(self._active) > self.max_active
+            )
+            idle = (
+                self.idle_timeout is not None
+                and now - tenant.last_used > self.idle_timeout
+            )
+            if not (over_limit or idle):
+                break
+            del self._active[name]
+            evicted.append(name)
+        return evicted
+
+    def _token_key(self, config: TenantConfig) -> TokenKey:
+        """Returns the key under which every API class of a tenant caches its token."""
+        options = {**self.options, **config.options}
+        urls = {
+            name: options[name]
+            for name in ("sandbox_url", "live_url")
+            if name in options
+        }
+        return token_cache_key(config.env, config.app_key, **urls)
+
+    def _build(self, config: TenantConfig, client: Any = None) -> Tenant:
+        shared = {
+            "token_cache": self.token_cache,
+            "http_client": client if client is not None else self.client,
+            "timeout": self.timeout,
+            **self.options,
+        }
+        return Tenant(config, self.api_classes, shared)
+
+    def close(self) -> None:
+        """Drops every tenant's clients and closes the shared HTTP client."""
+        with self._lock:
+            self._active.clear()
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None and self._owns_client:
+            client.close()
+
+
+class AsyncClientRegistry(ClientRegistry):
+    """
+    Asyncio counterpart of ClientRegistry; tenants expose the Async API classes
+    over a shared `httpx.AsyncClient`.
+
+    Methods:
+        aclose(): Coroutine that closes the shared HTTP client.
+    """
+
+    api_classes: Dict[str, type] = {
+        "c2b": AsyncC2B,
+        "b2c": AsyncB2C,
+        "balance": AsyncBalance,
+        "transaction_status": AsyncTransactionStatus,
+        "mpesa_express": AsyncMpesaExpress,
+        "reversal": AsyncReversal,
+    }
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' with AsyncClientRegistry.")
+
+    def _create_client(self) -> Any:
+        return httpx.AsyncClient(
+            limits=self.limits,
+            http2=self.http2,
+            timeout=self.timeout,
+            transport=self.transport,
+        )
+
+    def close(self) -> None:
+        raise TypeError("Use 'await aclose()' with AsyncClientRegistry.")
+
+    async def aclose(self) -> None:
+        """Drops every tenant's clients and closes the shared async client."""
+        with self._lock:
+            self._active.clear()
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None and self._owns_client:
+            await client.aclose()
@@ -0,0 +1,215 @@
+from typing import Any, Dict, Optional, Union
+
+from mpesa.api import serialization
+from mpesa.api.constants import (
+    ACCOUNT_BALANCE_PATH,
+    B2C_PAYMENT_PATH,
+    C2B_REGISTER_PATH,
+    C2B_SIMULATE_PATH,
+    REVERSAL_PATH,
+    STK_PUSH_PATH,
+    STK_QUERY_PATH,
+    TRANSACTION_STATUS_PATH,
+)
+
+JSON = "json"
+MODEL = "model"
+RAW = "raw"
+RESPONSE_MODES = (JSON, MODEL, RAW)
+
+_UNPARSED = object()
+
+
+class MalformedResponseError(ValueError):
+    """
+    Raised when the body of a response is not valid JSON. Mpesa answers every
+    request with JSON, so such a body comes from a proxy or gateway in front of it,
+    e.g. an HTML error page.
+    """
+
+
+def _decode(content: bytes) -> Any:
+    try:
+        return serialization.loads(content)
+    except ValueError as err:
+        raise MalformedResponseError(
+            f"Response body is not valid JSON: {bytes(content[:64])!r}"
+        ) from err
+
+
+class _Field:
+    """Descriptor reading one key of a response, parsing the body on first use."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __get__(self, instance: Optional["MpesaResponse"], owner: type) -> Any:
+        if instance is None:
+            return self
+        return instance.data.get(self.key)
+
+
+class MpesaResponse:
+    """
+    MpesaResponse wraps the raw body of a Mpesa API response and only decodes the
+    JSON when a field is first read, using orjson when it is installed. Fields are
+    exposed as attributes; the decoded body is also readable like a dict.
+
+    Attributes:
+        content (bytes): Raw response body.
+        status_code (Optional[int]): HTTP status code, or None for an idempotent
+        replay.
+        data (Dict[str, Any]): Decoded body, parsed on first access.
+        response_code (Optional[str]): ResponseCode of the response.
+        response_description (Optional[str]): ResponseDescription of the response.
+
+    Methods:
+        get(key, default) -> Any: Returns a field of the decoded body.
+        to_dict() -> Dict[str, Any]: Returns a copy of the decoded body.
+    """
+
+    __slots__ = ("content", "status_code", "_data")
+
+    response_code = _Field("ResponseCode")
+    response_description = _Field("ResponseDescription")
+
+    def __init__(self, content: bytes, status_code: Optional[int] = None):
+        self.content = content
+        self.status_code = status_code
+        self._data: Any = _UNPARSED
+
+    @classmethod
+    def from_data(
+        cls, data: Dict[str, Any], status_code: Optional[int] = None
+    ) -> "MpesaResponse":
+        """Wraps an already decoded body, e.g. a response replayed from a store."""
+        response = cls(serialization.dumps(data), status_code)
+        response._data = data
+        return response
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is _UNPARSED:
+            self._data = _decode(self.content)
+        return self._data
+
+    @property
+    def ok(self) -> bool:
+        """True if Mpesa accepted the request for processing."""
+        return str(self.response_code) == "0"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.data
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.content!r})"
+
+
+class Acknowledgement(MpesaResponse):
+    """
+    Synchronous acknowledgement of a B2C, balance, transaction status or reversal
+    request; the outcome is delivered to its result_url later.
+    """
+
+    __slots__ = ()
+
+    conversation_id = _Field("ConversationID")
+    originator_conversation_id = _Field("OriginatorConversationID")
+
+
+class C2BResponse(MpesaResponse):
+    """Response of C2B URL registration and transaction simulation requests."""
+
+    __slots__ = ()
+
+    # Daraja misspells the key in C2B responses.
+    originator_conversation_id = _Field("OriginatorCoversationID")
+
+
+class StkPushResponse(MpesaResponse):
+    """Response of a Lipa na Mpesa (STK push) request."""
+
+    __slots__ = ()
+
+    merchant_request_id = _Field("MerchantRequestID")
+    checkout_request_id = _Field("CheckoutRequestID")
+    customer_message = _Field("CustomerMessage")
+
+
+class StkQueryResponse(StkPushResponse):
+    """Response of a Lipa na Mpesa status query."""
+
+    __slots__ = ()
+
+    result_code = _Field("ResultCode")
+    result_desc = _Field("ResultDesc")
+
+
+RESPONSE_MODELS: Dict[str, type] = {
+    C2B_REGISTER_PATH: C2BResponse,
+    C2B_SIMULATE_PATH: C2BResponse,
+    B2C_PAYMENT_PATH: Acknowledgement,
+    ACCOUNT_BALANCE_PATH: Acknowledgement,
+    TRANSACTION_STATUS_PATH: Acknowledgement,
+    STK_PUSH_PATH: StkPushResponse,
+    STK_QUERY_PATH: StkQueryResponse,
+    REVERSAL_PATH: Acknowledgement,
+}
+
+
+def build_response(
+    mode: str, path: str, content: bytes, status_code: Optional[int] = None
+) -> Any:
+    """
+    Returns a response body in the form selected by mode.
+
+    Args:
+        mode (str): "json" for a decoded dict, "model" for a lazily parsed
+        MpesaResponse subclass or "raw" for the body bytes.
+        path (str): Endpoint path, selecting the response model.
+        content (bytes): Raw response body.
+        status_code (Optional[int]): HTTP status code of the response.
+
+    Raises:
+        MalformedResponseError: Raised in "json" mode if the body is not valid
+        JSON.
+    """
+    if mode == JSON:
+        return _decode(content)
+    if mode == RAW:
+        return content
+    return RESPONSE_MODELS.get(path, MpesaResponse)(content, status_code)
+
+
+def replayed_response(mode: str, path: str, data: Any) -> Any:
+    """Returns a response recorded in an idempotency store in the form of mode."""
+    if mode == JSON:
+        return data
+    if mode == RAW:
+        return serialization.dumps(data)
+    return RESPONSE_MODELS.get(path, MpesaResponse).from_data(data)
+
+
+def response_data(response: Union[Dict[str, Any], MpesaResponse, bytes]) -> Any:
+    """
+    Returns the decoded body of a response in any mode.
+
+    Raises:
+        MalformedResponseError: Raised if the body is not valid JSON.
+    """
+    if isinstance(response, MpesaResponse):
+        return response.data
+    if isinstance(response, (bytes, bytearray)):
+        return _decode(response)
+    return response
@@ -0,0 +1,158 @@
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable, Optional, Tuple, Type
+
+import httpx
+
+from mpesa.api.constants import RETRY_COUNT
+
+# Errors raised before the request reached Mpesa, so retrying cannot duplicate it.
+RETRYABLE_EXCEPTIONS: Tuple[Type[Exception], ...] = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+)
+
+# Daraja reports business errors (e.g. an STK push that is still being processed)
+# with status 500, so only throttling and gateway errors are retried by default.
+RETRYABLE_STATUSES = (429, 502, 503, 504)
+
+
+class RetryPolicy:
+    """
+    RetryPolicy decides whether a failed Mpesa request is retried and how long to
+    wait before the next attempt. Delays grow exponentially with full jitter, a
+    `Retry-After` header takes precedence, and no retry is scheduled past the
+    per-call deadline.
+
+    Attributes:
+        max_retries (int): Retries allowed after the first attempt.
+        backoff_factor (float): Base delay in seconds; attempt n waits up to
+        backoff_factor * 2 ** n.
+        max_backoff (float): Upper bound for a single delay.
+        retry_statuses (Tuple[int, ...]): Response status codes that are retried.
+        retry_exceptions (Tuple[Type[Exception], ...]): Transport errors retried.
+        deadline (Optional[float]): Seconds allowed for a call including retries;
+        None disables the deadline.
+
+    Methods:
+        start() -> Optional[float]: Returns the absolute deadline for a new call.
+        next_delay(attempt, deadline, response, error) -> Optional[float]: Returns
+        the delay before the next attempt, or None if the call must not be retried.
+        bound_timeout(timeout, deadline) -> httpx.Timeout: Shrinks a timeout so an
+        attempt cannot outlive the deadline.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = RETRY_COUNT,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 10.0,
+        retry_statuses: Iterable[int] = RETRYABLE_STATUSES,
+        retry_exceptions: Tuple[Type[Exception], ...] = RETRYABLE_EXCEPTIONS,
+        deadline: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        jitter: Callable[[float, float], float] = random.uniform,
+    ):
+        """
+        Initializes the retry policy.
+
+        Args:
+            max_retries (int): Retries allowed after the first attempt; 0 disables
+            retries.
+            backoff_factor (float): Base delay in seconds for exponential backoff.
+            max_backoff (float): Upper bound for a single delay in seconds.
+            retry_statuses (Iterable[int]): Response status codes to retry.
+            retry_exceptions (Tuple[Type[Exception], ...]): Transport errors to retry.
+            deadline (Optional[float]): Overall seconds allowed per call.
+            clock (Callable[[], float]): Monotonic clock used for the deadline.
+            jitter (Callable[[float, float], float]): Picks a delay in a range.
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = tuple(retry_statuses)
+        self.retry_exceptions = retry_exceptions
+        self.deadline = deadline
+        self._clock = clock
+        self._jitter = jitter
+
+    def start(self) -> Optional[float]:
+        """Returns the absolute deadline for a call starting now, if any."""
+        if self.deadline is None:
+            return None
+        return self._clock() + self.deadline
+
+    def next_delay(
+        self,
+        attempt: int,
+        deadline: Optional[float],
+        response: Optional[httpx.Response] = None,
+        error: Optional[Exception] = None,
+    ) -> Optional[float]:
+        """
+        Returns the seconds to wait before retrying, or None to stop.
+
+        Args:
+            attempt (int): Zero-based index of the attempt that just finished.
+            deadline (Optional[float]): Absolute deadline returned by `start()`.
+            response (Optional[httpx.Response]): Response of the attempt, if any.
+            error (Optional[Exception]): Transport error raised by the attempt.
+        """
+        if attempt >= self.max_retries:
+            return None
+        if error is not None and not isinstance(error, self.retry_exceptions):
+            return None
+        if response is not None and response.status_code not in self.retry_statuses:
+            return None
+
+        delay = self._retry_after(response)
+        if delay is None:
+            ceiling = min(self.max_backoff, self.backoff_factor * 2**attempt)
+            delay = self._jitter(0, ceiling)
+        else:
+            delay = min(delay, self.max_backoff)
+
+        if deadline is not None and self._clock() + delay >= deadline:
+            return None
+        return delay
+
+    def bound_timeout(
+        self, timeout: httpx.Timeout, deadline: Optional[float]
+    ) -> httpx.Timeout:
+        """Returns timeout with every phase capped by the time left to deadline."""
+        if deadline is None:
+            return timeout
+        remaining = max(deadline - self._clock(), 0.001)
+
+        def cap(value: Optional[float]) -> float:
+            return remaining if value is None else min(value, remaining)
+
+        return httpx.Timeout(
+            connect=cap(timeout.connect),
+            read=cap(timeout.read),
+            write=cap(timeout.write),
+            pool=cap(timeout.pool),
+        )
+
+    @staticmethod
+    def _retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+        """Parses a Retry-After header given in seconds or as an HTTP date."""
+        if response is None:
+            return None
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -1,7 +1,7 @@
-import httpx
-from typing import Dict, Optional, Any
+from typing import Optional, Any
 
 from mpesa.api.auth import MpesaBase
+from mpesa.api.endpoints import REVERSAL
 
 class Reversal(MpesaBase):
     """
@@ -22,10 +22,11 @@ class Reversal(MpesaBase):
         app_key: Optional[str] = None,
         app_secret: Optional[str] = None,
         sandbox_url: Optional[str] = "https://sandbox.safaricom.co.ke",
-        live_url: Optional[str] = "https://safaricom.co.ke"
+        live_url: Optional[str] = "https://safaricom.co.ke",
+        **kwargs: Any,
     ):
         """
-        Initializes the Reversal instance and authenticates using the MpesaBase class.
+        Initializes the Reversal instance; authentication happens on the first request.
 
         Args:
             env (str): The environemnt in which to run; options are "sanbox" and
@@ -34,16 +35,16 @@ class Reversal(MpesaBase):
             app_secret (str): Consumer secret for Mpesa API
             sandbox_url (str): URL for Mpesa's sandbox environment
             live_url (str): URL for Mpesa's production environment
+            **kwargs: Additional options forwarded to MpesaBase, e.g. token_cache
         """
-        super().__init__(env, app_key, app_secret, sandbox_url, live_url)
-        self.authentication_token: Optional[str] = self.authenticate()
+        super().__init__(env, app_key, app_secret, sandbox_url, live_url, **kwargs)
 
     def reverse(
         self,
         receiver: int,
         initiator: str,
         amount: str,
-        security_credential: str,
+        security_credential: Optional[str],
         transaction_id: str,
         timeout_url: str,
         result_url: str,
@@ -59,7 +60,8 @@ class Reversal(MpesaBase):
             initiator (str): Name of the initiator to initiate the request.
             amount (int): Amount transacted in the transaction is to be reversed,
             down to the cent.
-            security_credential (str): Encrypted password for the initiator.
+            security_credential (Optional[str]): Encrypted password for the
+            initiator; pass None to generate it from the client's initiator_password.
             transaction_id (str): Mpesa Transaction ID of the transaction to be reversed.
             timeout_url (str): Path that stores info about timed-out transactions.
             result_url (str): Path that stores information about the transaction.
@@ -72,43 +74,21 @@ class Reversal(MpesaBase):
         Raises:
             httpx.HTTPStatusError: Raised for HTTP errors during the transaction.
             ValueError: Raised for invalid or unsuccessful response from Mpesa API.
+            DuplicateRequestError: Raised when an idempotency store is configured
+            and a reversal of the same transaction_id is pending.
         """
 
-        payload = {
-            "Initiator": initiator,
-            "SecurityCredential": security_credential,
-            "CommandID":"TransactionReversal",
-            "TransactionID": transaction_id,
-            "Amount": amount,
-            "ReceiverParty": receiver,
-            "RecieverIdentifierType": receiver_identifier,
-            "ResultURL": result_url,
-            "QueueTimeOutURL": timeout_url,
-            "Remarks": remarks,
-            "Occasion": occasion
-        }
-
-        headers = {
-            "Authorization": f"Bearer {self.authentication_token}",
-            "Content-Type": "application/json"
-        }
-
-        base_url = self.live_url if self.env == "production" else self.sandbox_url
-        api_url = f"{base_url}/mpesa/reversal/v1/request"
-
-        with httpx.Client() as client:
-            try:
-                response = client.post(api_url, headers=headers, json=payload)
-                response.raise_for_status() # Raises HTTP errors if status is not 200
-
-                return response.json()
-
-            except httpx.HTTPStatusError as http_err:
-                print(f"HTTP Error during Mpesa reversal request: {http_err}")
-                raise http_err
-
-            except (ValueError, httpx.RequestError) as err:
-                print(f"Error occurred during reversal request: {err}")
-                raise (
-                    "An error occured during the reversal request."
-                ) from err
+        return self._call(
+            REVERSAL,
+            initiator,
+            self._security_credential(security_credential),
+            transaction_id,
+            amount,
+            receiver,
+            receiver_identifier,
+            result_url,
+            timeout_url,
+            remarks,
+            occasion,
+            idempotency_key=transaction_id,
+        )
@@ -0,0 +1,704 @@
+import argparse
+import asyncio
+import heapq
+import itertools
+import random
+import secrets
+import threading
+import time
+from collections import Counter, OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from mpesa.api import serialization
+from mpesa.api.auth import INVALID_TOKEN_ERROR_CODE
+from mpesa.api.constants import (
+    ACCOUNT_BALANCE_PATH,
+    AUTH_PATH,
+    B2C_PAYMENT_PATH,
+    C2B_REGISTER_PATH,
+    C2B_SIMULATE_PATH,
+    REVERSAL_PATH,
+    STK_PUSH_PATH,
+    STK_QUERY_PATH,
+    TRANSACTION_STATUS_PATH,
+)
+from mpesa.api.poller import STK_PENDING_ERROR_CODE
+
+CallbackHandler = Callable[[str, Dict[str, Any]], Any]
+
+# Pending STK pushes remembered for status queries before the oldest are dropped.
+MAX_TRACKED_PUSHES = 100000
+
+ACCEPTED_DESCRIPTION = "Accept the service request successfully."
+
+
+def post_callback(url: str, body: Dict[str, Any]) -> None:
+    """Delivers a simulated callback to url over HTTP."""
+    httpx.post(url, json=body, timeout=10)
+
+
+class _CallbackScheduler:
+    """Single background thread delivering callbacks once they are due."""
+
+    def __init__(self, handler: CallbackHandler):
+        self.handler = handler
+        self.errors = 0
+        self._condition = threading.Condition()
+        self._heap: List[Tuple[float, int, str, Dict[str, Any]]] = []
+        self._sequence = itertools.count()
+        self._running = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def schedule(self, delay: float, url: str, body: Dict[str, Any]) -> None:
+        with self._condition:
+            if self._stopped:
+                return
+            due = time.monotonic() + delay
+            heapq.heappush(self._heap, (due, next(self._sequence), url, body))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="daraja-simulator-callbacks", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._heap and not self._running, timeout
+            )
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._heap.clear()
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        with self._condition:
+            while not self._stopped:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                wait = self._heap[0][0] - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                _, _, url, body = heapq.heappop(self._heap)
+                self._running += 1
+                self._condition.release()
+                try:
+                    self.handler(url, body)
+                except Exception:
+                    self.errors += 1
+                finally:
+                    self._condition.acquire()
+                    self._running -= 1
+                    self._condition.notify_all()
+
+
+class DarajaSimulator:
+    """
+    DarajaSimulator is a local stand-in for the Daraja API used to test and
+    benchmark integrations without reaching the Safaricom sandbox.
+
+    It implements OAuth, STK push and query, B2C, C2B registration and
+    simulation, account balance, transaction status and reversal with responses
+    shaped like Daraja's. Requests can be served in-process through an
+    `httpx.MockTransport` passed to any API class, or over HTTP with `serve()`.
+    Latency and error rates are configurable, and result callbacks are delivered
+    asynchronously to `callback_handler` in the shape expected by
+    CallbackReceiver.
+
+    Attributes:
+        latency (float): Seconds added to every response.
+        latency_jitter (float): Upper bound of random seconds added to latency.
+        error_rate (float): Fraction of API requests answered with error_status.
+        error_status (int): Status code of injected errors.
+        callback_delay (float): Seconds before result callbacks are delivered.
+        stk_completion_delay (float): Seconds before an STK push completes; until
+        then status queries report the push as being processed.
+        result_code (int): ResultCode reported for completed transactions.
+        token_lifetime (int): Lifetime in seconds of issued access tokens.
+        request_counts (Counter): Number of requests served per path.
+
+    Methods:
+        transport() -> httpx.MockTransport: Transport for synchronous clients.
+        async_transport() -> httpx.MockTransport: Transport for asyncio clients.
+        handle(request) -> httpx.Response: Answers a request without latency.
+        serve(host, port) -> SimulatorServer: Serves the simulator over HTTP.
+        revoke_tokens(): Invalidates every issued access token.
+        join_callbacks(timeout) -> bool: Waits for scheduled callbacks.
+        close(): Stops callback delivery.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        callback_handler: Optional[CallbackHandler] = None,
+        callback_delay: float = 0.0,
+        stk_completion_delay: float = 0.0,
+        result_code: int = 0,
+        token_lifetime: int = 3599,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initializes the simulator.
+
+        Args:
+            latency (float): Seconds added to every response.
+            latency_jitter (float): Upper bound of random seconds added to latency.
+            error_rate (float): Fraction of API requests, excluding OAuth, that are
+            answered with error_status.
+            error_status (int): Status code of injected errors.
+            callback_handler (Optional[CallbackHandler]): Called with the URL and
+            body of each result callback; use `post_callback` to deliver them over
+            HTTP. Callbacks are not generated when None.
+            callback_delay (float): Seconds before result callbacks are delivered.
+            stk_completion_delay (float): Seconds before an STK push completes.
+            result_code (int): ResultCode reported for completed transactions.
+            token_lifetime (int): Lifetime in seconds of issued access tokens.
+            seed (Optional[int]): Seed for latency jitter and error injection.
+        """
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be between 0 and 1.")
+
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.callback_delay = callback_delay
+        self.stk_completion_delay = stk_completion_delay
+        self.result_code = result_code
+        self.token_lifetime = token_lifetime
+        self.request_counts: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._tokens: Dict[str, float] = {}
+        self._pushes: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._confirmation_urls: Dict[str, str] = {}
+        self._callbacks = (
+            _CallbackScheduler(callback_handler) if callback_handler else None
+        )
+        self._routes: Dict[str, Callable[[Dict[str, Any]], httpx.Response]] = {
+            STK_PUSH_PATH: self._stk_push,
+            STK_QUERY_PATH: self._stk_query,
+            B2C_PAYMENT_PATH: self._b2c,
+            C2B_REGISTER_PATH: self._c2b_register,
+            C2B_SIMULATE_PATH: self._c2b_simulate,
+            ACCOUNT_BALANCE_PATH: self._balance,
+            TRANSACTION_STATUS_PATH: self._transaction_status,
+            REVERSAL_PATH: self._reversal,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def transport(self) -> httpx.MockTransport:
+        """Returns a transport serving synchronous clients in-process."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            delay = self._delay()
+            if delay:
+                time.sleep(delay)
+            return self.handle(request)
+
+        return httpx.MockTransport(handler)
+
+    def async_transport(self) -> httpx.MockTransport:
+        """Returns a transport serving asyncio clients without blocking the loop."""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            delay = self._delay()
+            if delay:
+                await asyncio.sleep(delay)
+            return self.handle(request)
+
+        return httpx.MockTransport(handler)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> "SimulatorServer":
+        """
+        Serves the simulator over HTTP on a background thread.
+
+        Args:
+            host (str): Interface to bind.
+            port (int): Port to bind; 0 picks a free port.
+
+        Returns:
+            SimulatorServer: The running server; use its `url` as sandbox_url.
+        """
+        return SimulatorServer(self, host, port)
+
+    def revoke_tokens(self) -> None:
+        """Invalidates every issued access token, as if they had expired."""
+        with self._lock:
+            self._tokens.clear()
+
+    def join_callbacks(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every scheduled callback was delivered; False on timeout."""
+        if self._callbacks is None:
+            return True
+        return self._callbacks.join(timeout)
+
+    def close(self) -> None:
+        """Stops the callback thread, dropping undelivered callbacks."""
+        if self._callbacks is not None:
+            self._callbacks.stop()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """
+        Answers a Daraja request without simulated latency.
+
+        Args:
+            request (httpx.Request): Request addressed to any base URL.
+
+        Returns:
+            httpx.Response: Response shaped like Daraja's.
+        """
+        path = request.url.path
+        with self._lock:
+            self.request_counts[path] += 1
+
+        if request.method == "GET" and path == AUTH_PATH.split("?")[0]:
+            return self._oauth(request)
+
+        route = self._routes.get(path)
+        if route is None or request.method != "POST":
+            return _error(404, "404.001.01", "Resource not found")
+        if not self._authorized(request):
+            return _error(401, INVALID_TOKEN_ERROR_CODE, "Invalid Access Token")
+        if self.error_rate and self._chance(self.error_rate):
+            return _error(self.error_status, "503.001.01", "Service Unavailable")
+
+        try:
+            payload = serialization.loads(request.content)
+        except ValueError:
+            return _error(400, "400.002.02", "Bad Request - Invalid JSON")
+        if not isinstance(payload, dict):
+            return _error(400, "400.002.02", "Bad Request - Invalid JSON")
+        return route(payload)
+
+    def _delay(self) -> float:
+        if not self.latency_jitter:
+            return self.latency
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.latency_jitter)
+
+    def _chance(self, probability: float) -> bool:
+        with self._lock:
+            return self._random.random() < probability
+
+    def _next_id(self) -> int:
+        with self._lock:
+            return next(self._ids)
+
+    def _conversation_id(self) -> str:
+        return f"AG_{time.strftime('%Y%m%d')}_{self._next_id():020x}"
+
+    def _callback(self, url: Optional[str], body: Dict[str, Any], delay=None) -> None:
+        if self._callbacks is not None and url:
+            delay = self.callback_delay if delay is None else delay
+            self._callbacks.schedule(delay, url, body)
+
+    def _oauth(self, request: httpx.Request) -> httpx.Response:
+        if not request.headers.get("Authorization", "").startswith("Basic "):
+            return _error(400, "400.008.01", "Invalid Authentication passed")
+        token = secrets.token_urlsafe(21)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = {
+                key: expiry for key, expiry in self._tokens.items() if expiry > now
+            }
+            self._tokens[token] = now + self.token_lifetime
+        return httpx.Response(
+            200, json={"access_token": token, "expires_in": str(self.token_lifetime)}
+        )
+
+    def _authorized(self, request: httpx.Request) -> bool:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme != "Bearer":
+            return False
+        with self._lock:
+            expiry = self._tokens.get(token)
+        return expiry is not None and expiry > time.monotonic()
+
+    def _accepted(self, originator_conversation_id: Optional[str] = None):
+        return {
+            "OriginatorConversationID": originator_conversation_id
+            or f"{self._next_id()}-{self._next_id()}-1",
+            "ConversationID": self._conversation_id(),
+            "ResponseCode": "0",
+            "ResponseDescription": ACCEPTED_DESCRIPTION,
+        }
+
+    def _result(
+        self,
+        accepted: Dict[str, Any],
+        parameters: List[Tuple[str, Any]],
+        transaction_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        success = self.result_code == 0
+        return {
+            "Result": {
+                "ResultType": 0,
+                "ResultCode": self.result_code,
+                "ResultDesc": (
+                    "The service request is processed successfully."
+                    if success
+                    else "The transaction could not be completed."
+                ),
+                "OriginatorConversationID": accepted["OriginatorConversationID"],
+                "ConversationID": accepted["ConversationID"],
+                "TransactionID": transaction_id or _receipt(self._next_id()),
+                "ResultParameters": (
+                    {
+                        "ResultParameter": [
+                            {"Key": key, "Value": value} for key, value in parameters
+                        ]
+                    }
+                    if success
+                    else None
+                ),
+                "ReferenceData": {
+                    "ReferenceItem": {"Key": "QueueTimeoutURL", "Value": ""}
+                },
+            }
+        }
+
+    def _stk_push(self, payload: Dict[str, Any]) -> httpx.Response:
+        number = self._next_id()
+        checkout_request_id = f"ws_CO_{number:012d}"
+        merchant_request_id = f"{number}-{number}-1"
+        with self._lock:
+            self._pushes[checkout_request_id] = (
+                time.monotonic() + self.stk_completion_delay,
+                payload,
+            )
+            while len(self._pushes) > MAX_TRACKED_PUSHES:
+                self._pushes.popitem(last=False)
+
+        body: Dict[str, Any] = {
+            "MerchantRequestID": merchant_request_id,
+            "CheckoutRequestID": checkout_request_id,
+            "ResultCode": self.result_code,
+            "ResultDesc": self._stk_result_desc(),
+        }
+        if self.result_code == 0:
+            body["CallbackMetadata"] = {
+                "Item": [
+                    {"Name": "Amount", "Value": payload.get("Amount")},
+                    {"Name": "MpesaReceiptNumber", "Value": _receipt(number)},
+                    {"Name": "TransactionDate", "Value": int(_timestamp())},
+                    {"Name": "PhoneNumber", "Value": payload.get("PhoneNumber")},
+                ]
+            }
+        self._callback(
+            payload.get("CallBackURL"),
+            {"Body": {"stkCallback": body}},
+            max(self.callback_delay, self.stk_completion_delay),
+        )
+        return httpx.Response(
+            200,
+            json={
+                "MerchantRequestID": merchant_request_id,
+                "CheckoutRequestID": checkout_request_id,
+                "ResponseCode": "0",
+                "ResponseDescription": "Success. Request accepted for processing",
+                "CustomerMessage": "Success. Request accepted for processing",
+            },
+        )
+
+    def _stk_query(self, payload: Dict[str, Any]) -> httpx.Response:
+        checkout_request_id = payload.get("CheckoutRequestID")
+        with self._lock:
+            push = self._pushes.get(checkout_request_id)
+        if push is None:
+            return _error(400, "400.002.02", "Bad Request - Invalid CheckoutRequestID")
+        if time.monotonic() < push[0]:
+            return _error(
+                500, STK_PENDING_ERROR_CODE, "The transaction is being processed"
+            )
+        return httpx.Response(
+            200,
+            json={
+                "ResponseCode": "0",
+                # Daraja's own spelling
+                "ResponseDescription": "The service request has been accepted "
+                "successsfully",
+                "MerchantRequestID": checkout_request_id,
+                "CheckoutRequestID": checkout_request_id,
+                "ResultCode": str(self.result_code),
+                "ResultDesc": self._stk_result_desc(),
+            },
+        )
+
+    def _stk_result_desc(self) -> str:
+        if self.result_code == 0:
+            return "The service request is processed successfully."
+        return "Request cancelled by user."
+
+    def _b2c(self, payload: Dict[str, Any]) -> httpx.Response:
+        accepted = self._accepted(payload.get("OriginatorConversationID"))
+        receipt = _receipt(self._next_id())
+        self._callback(
+            payload.get("ResultURL"),
+            self._result(
+                accepted,
+                [
+                    ("TransactionAmount", payload.get("Amount")),
+                    ("TransactionReceipt", receipt),
+                    ("ReceiverPartyPublicName", f"{payload.get('PartyB')} - Customer"),
+                    ("TransactionCompletedDateTime", _timestamp()),
+                    ("B2CUtilityAccountAvailableFunds", 100000.0),
+                    ("B2CWorkingAccountAvailableFunds", 100000.0),
+                    ("B2CRecipientIsRegisteredCustomer", "Y"),
+                ],
+                receipt,
+            ),
+        )
+        return httpx.Response(200, json=accepted)
+
+    def _c2b_register(self, payload: Dict[str, Any]) -> httpx.Response:
+        with self._lock:
+            self._confirmation_urls[str(payload.get("ShortCode"))] = payload.get(
+                "ConfirmationURL"
+            )
+        return httpx.Response(
+            200,
+            json={
+                "OriginatorCoversationID": f"{self._next_id()}-1",
+                "ResponseCode": "0",
+                "ResponseDescription": "Success",
+            },
+        )
+
+    def _c2b_simulate(self, payload: Dict[str, Any]) -> httpx.Response:
+        shortcode = str(payload.get("ShortCode"))
+        with self._lock:
+            confirmation_url = self._confirmation_urls.get(shortcode)
+        self._callback(
+            confirmation_url,
+            {
+                "TransactionType": "Pay Bill",
+                "TransID": _receipt(self._next_id()),
+                "TransTime": _timestamp(),
+                "TransAmount": str(payload.get("Amount")),
+                "BusinessShortCode": shortcode,
+                "BillRefNumber": payload.get("BillRefNumber") or "",
+                "InvoiceNumber": "",
+                "OrgAccountBalance": "",
+                "ThirdPartyTransID": "",
+                "MSISDN": str(payload.get("Msisdn")),
+                "FirstName": "John",
+            },
+        )
+        return httpx.Response(
+            200,
+            json={
+                "OriginatorCoversationID": f"{self._next_id()}-1",
+                "ResponseCode": "0",
+                "ResponseDescription": ACCEPTED_DESCRIPTION,
+            },
+        )
+
+    def _balance(self, payload: Dict[str, Any]) -> httpx.Response:
+        accepted = self._accepted()
+        self._callback(
+            payload.get("ResultURL"),
+            self._result(
+                accepted,
+                [
+                    (
+                        "AccountBalance",
+                        "Working Account|KES|100000.00|100000.00|0.00|0.00"
+                        "&Utility Account|KES|100000.00|100000.00|0.00|0.00",
+                    ),
+                    ("BOCompletedTime", int(_timestamp())),
+                ],
+            ),
+        )
+        return httpx.Response(200, json=accepted)
+
+    def _transaction_status(self, payload: Dict[str, Any]) -> httpx.Response:
+        accepted = self._accepted(payload.get("OriginatorconversationID"))
+        transaction_id = payload.get("TransactionID")
+        self._callback(
+            payload.get("ResultURL"),
+            self._result(
+                accepted,
+                [
+                    ("ReceiptNo", transaction_id),
+                    ("TransactionStatus", "Completed"),
+                    ("FinalisedTime", int(_timestamp())),
+                    ("Amount", 100),
+                    ("ReasonType", "Salary Payment via API"),
+                ],
+                transaction_id,
+            ),
+        )
+        return httpx.Response(200, json=accepted)
+
+    def _reversal(self, payload: Dict[str, Any]) -> httpx.Response:
+        accepted = self._accepted()
+        self._callback(
+            payload.get("ResultURL"),
+            self._result(
+                accepted,
+                [
+                    ("DebitAccountBalance", "Utility Account|KES|100000.00"),
+                    ("Amount", payload.get("Amount")),
+                    ("OriginalTransactionID", payload.get("TransactionID")),
+                ],
+            ),
+        )
+        return httpx.Response(200, json=accepted)
+
+
+class SimulatorServer:
+    """
+    SimulatorServer serves a DarajaSimulator over HTTP/1.1 with keep-alive on a
+    background thread.
+
+    Attributes:
+        simulator (DarajaSimulator): Simulator answering the requests.
+        url (str): Base URL of the server, usable as sandbox_url.
+
+    Methods:
+        close(): Stops the server.
+    """
+
+    def __init__(self, simulator: DarajaSimulator, host: str, port: int):
+        self.simulator = simulator
+        self._server = _SimulatorHTTPServer((host, port), _SimulatorRequestHandler)
+        self._server.daemon_threads = True
+        self._server.simulator = simulator
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="daraja-simulator", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stops serving and closes the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+class _SimulatorHTTPServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops connections from concurrent benchmark clients.
+    request_queue_size = 1024
+
+
+class _SimulatorRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY Nagle's
+    # algorithm holds the body back for a delayed ACK on keep-alive connections.
+    disable_nagle_algorithm = True
+
+    def _dispatch(self) -> None:
+        simulator: DarajaSimulator = self.server.simulator
+        length = int(self.headers.get("Content-Length") or 0)
+        request = httpx.Request(
+            self.command,
+            f"http://{self.headers.get('Host', 'localhost')}{self.path}",
+            headers=list(self.headers.items()),
+            content=self.rfile.read(length),
+        )
+        delay = simulator._delay()
+        if delay:
+            time.sleep(delay)
+        response = simulator.handle(request)
+
+        self.send_response(response.status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response.content)))
+        self.end_headers()
+        self.wfile.write(response.content)
+
+    do_GET = _dispatch
+    do_POST = _dispatch
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def _error(status: int, error_code: str, message: str) -> httpx.Response:
+    return httpx.Response(
+        status,
+        json={
+            "requestId": secrets.token_hex(8),
+            "errorCode": error_code,
+            "errorMessage": message,
+        },
+    )
+
+
+def _receipt(number: int) -> str:
+    """Returns a receipt number shaped like Mpesa's ten character receipts."""
+    return f"SIM{number:07X}"[-10:]
+
+
+def _timestamp() -> str:
+    return time.strftime("%Y%m%d%H%M%S")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the simulator as a standalone HTTP server."""
+    parser = argparse.ArgumentParser(description="Local Daraja API simulator.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument(
+        "--callback-delay",
+        type=float,
+        default=None,
+        help="Deliver result callbacks over HTTP after this delay.",
+    )
+    parser.add_argument("--stk-completion-delay", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    simulator = DarajaSimulator(
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        callback_handler=post_callback if args.callback_delay is not None else None,
+        callback_delay=args.callback_delay or 0.0,
+        stk_completion_delay=args.stk_completion_delay,
+    )
+    server = simulator.serve(args.host, args.port)
+    print(f"Daraja simulator listening on {server.url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        simulator.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
-import httpx
 from typing import Optional, Dict, Any
 
 from mpesa.api.auth import MpesaBase
+from mpesa.api.endpoints import TRANSACTION_STATUS
 
 
 class TransactionStatus(MpesaBase):
@@ -12,14 +12,14 @@ class TransactionStatus(MpesaBase):
         app_secret: Optional[str] = None,
         sandbox_url: str = "https://sandbox.safaricom.co.ke",
         live_url: str = "https://safaricom.co.ke",
+        **kwargs: Any,
     ):
 
-        super().__init__(env, app_key, app_secret, sandbox_url, live_url)
-        self.authentication_token: Optional[str] = self.authenticate()
+        super().__init__(env, app_key, app_secret, sandbox_url, live_url, **kwargs)
 
     def check_transaction_status(
         self,
-        security_credential: str,
+        security_credential: Optional[str],
         originator_conversation_id: str,
         party_a: str,
         identifier_type: str,
@@ -33,11 +33,12 @@ class TransactionStatus(MpesaBase):
         """Checks the status of a transaction through Mpesa API.
 
             Args:
-                security_credential (str): Encrypted credential of the user getting transaction status
-                originator_conversation_id: (str): unique identifier for the transaction request
+                security_credential (Optional[str]): Encrypted credential of the user getting transaction status;
+                pass None to generate it from the client's initiator_password
+                originator_conversation_id: (str): unique identifier for this status query
                 party_a (str): Organization/MSISDN receiving the transaction - MSISDN or shortcode.
                 identifier_type (int): Type of organization receiving the transaction 1-MSISDN. 2-Till Number, 3-Shortcode.
-                transaction_id (str): Unique identifier to identify a transaction on Mpesa
+                transaction_id (str): Mpesa receipt number of the transaction to look up, sent as TransactionID
                 remarks (str): Comments that are sent along with the transaction(maximum 100 characters).
                 initiator (str): This is the credential/username used to authenticate the transaction request.
                 result_url (str): The url that handles information from the mpesa API call.
@@ -58,39 +59,16 @@ class TransactionStatus(MpesaBase):
                 "App key and app secret must be provided for authentication."
             )
 
-        payload = {
-            "Securitycredential": security_credential,
-            "OriginatorconversationID": originator_conversation_id,
-            "CommandID": "TransactionStatusQuery",
-            "PartyA": party_a,
-            "IdentifierType": identifier_type,
-            "Remarks": remarks,
-            "Initiator": initiator,
-            "QueueTimeOutURL": queue_timeout_url,
-            "ResultURL": result_url,
-            "TransactionID": originator_conversation_id,
-            "Occasion": occassion,
-        }
-        headers = {
-            "Authorization": f"Bearer {self.authentication_token}",
-            "Content-Type": "application/json",
-        }
-
-        # Determine te base url based on environment
-        base_url = self.live_url if self.env == "production" else self.sandbox_url
-        saf_url = f"{base_url}/mpesa/transactionstatus/v1/query"
-
-        with httpx.Client() as client:
-            try:
-                response = client.post(saf_url, headers=headers, json=payload)
-                response.raise_for_status()
-
-                return response.json()
-
-            except httpx.HTTPStatusError as exc:
-                raise exc
-
-            except (httpx.RequestError, ValueError) as e:
-                raise ValueError(
-                    "An error occured during retrieval of transaction status process."
-                ) from e
+        return self._call(
+            TRANSACTION_STATUS,
+            self._security_credential(security_credential),
+            originator_conversation_id,
+            party_a,
+            identifier_type,
+            remarks,
+            initiator,
+            queue_timeout_url,
+            result_url,
+            transaction_id,
+            occassion,
+        )
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+import weakref
+from typing import Callable, Dict, Optional, Tuple
+
+TokenKey = Tuple[str, str, str]
+
+
+class TokenCache:
+    """
+    TokenCache is a thread-safe store of OAuth access tokens shared between
+    MpesaBase instances. Tokens are keyed by (env, app_key, base_url) so that
+    every API class built with the same credentials reuses a single token until
+    it is close to expiry.
+
+    Attributes:
+        refresh_margin (float): Seconds before the reported expiry at which a
+        cached token is treated as stale and refreshed early.
+
+    Methods:
+        get(key) -> Optional[str]: Returns a cached token that is still fresh.
+        set(key, token, expires_in): Stores a token with its lifetime in seconds.
+        invalidate(key, token): Drops the token stored under key, optionally only if
+        it is still the given token.
+        clear(): Drops every cached token.
+        refresh_lock(key) -> threading.Lock: Lock serialising token refreshes.
+        async_refresh_lock(key) -> asyncio.Lock: Event loop bound refresh lock.
+    """
+
+    def __init__(
+        self,
+        refresh_margin: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes an empty token cache.
+
+        Args:
+            refresh_margin (float): Seconds subtracted from each token's lifetime so
+            that it is refreshed before Mpesa rejects it.
+            clock (Callable[[], float]): Monotonic clock used to track expiry.
+        """
+        self.refresh_margin = refresh_margin
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens: Dict[TokenKey, Tuple[str, float]] = {}
+        self._refresh_locks: Dict[TokenKey, threading.Lock] = {}
+        self._async_refresh_locks = weakref.WeakKeyDictionary()
+
+    def get(self, key: TokenKey) -> Optional[str]:
+        """Returns the token cached under key, or None if missing or stale."""
+        with self._lock:
+            entry = self._tokens.get(key)
+        if entry is None:
+            return None
+        token, refresh_at = entry
+        if self._clock() >= refresh_at:
+            return None
+        return token
+
+    def set(self, key: TokenKey, token: str, expires_in: float) -> None:
+        """Caches token under key for expires_in seconds less the refresh margin."""
+        lifetime = max(float(expires_in) - self.refresh_margin, 0.0)
+        with self._lock:
+            self._tokens[key] = (token, self._clock() + lifetime)
+
+    def invalidate(self, key: TokenKey, token: Optional[str] = None) -> None:
+        """
+        Removes the token cached under key.
+
+        When token is given the entry is only removed if it still holds that token,
+        so callers that saw a rejected token do not discard a newer one that another
+        caller has already fetched.
+        """
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is not None and (token is None or entry[0] == token):
+                del self._tokens[key]
+
+    def clear(self) -> None:
+        """Removes every cached token."""
+        with self._lock:
+            self._tokens.clear()
+
+    def refresh_lock(self, key: TokenKey) -> threading.Lock:
+        """
+        Returns the lock held while a token for key is fetched, so that concurrent
+        threads missing the cache trigger a single authentication request.
+        """
+        with self._lock:
+            lock = self._refresh_locks.get(key)
+            if lock is None:
+                lock = self._refresh_locks[key] = threading.Lock()
+            return lock
+
+    def async_refresh_lock(self, key: TokenKey) -> asyncio.Lock:
+        """Returns the asyncio counterpart of `refresh_lock()` for the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            locks = self._async_refresh_locks.get(loop)
+            if locks is None:
+                locks = self._async_refresh_locks[loop] = {}
+            lock = locks.get(key)
+            if lock is None:
+                lock = locks[key] = asyncio.Lock()
+            return lock
+
+
+# Process-wide cache used by MpesaBase unless a dedicated one is supplied.
+default_token_cache = TokenCache()
@@ -0,0 +1,328 @@
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from mpesa.api.constants import (
+    ACCOUNT_BALANCE_PATH,
+    B2C_PAYMENT_PATH,
+    C2B_REGISTER_PATH,
+    C2B_SIMULATE_PATH,
+    REVERSAL_PATH,
+    STK_PUSH_PATH,
+    STK_QUERY_PATH,
+    TRANSACTION_STATUS_PATH,
+)
+
+# Kenyan mobile numbers: 07XX/01XX, 7XX/1XX, 2547XX/2541XX and +254 forms.
+_MSISDN = re.compile(r"(?:\+?254|0)?([17]\d{8})")
+_SEPARATORS = re.compile(r"[\s\-().]")
+# Numbers as Daraja expects them in payloads.
+_CANONICAL_MSISDN = re.compile(r"254[17]\d{8}")
+_SHORTCODE = re.compile(r"\d{5,7}")
+_RECEIPT = re.compile(r"[A-Z0-9]{10}")
+_URL = re.compile(r"https?://[^\s/$.?#][^\s]*", re.IGNORECASE)
+_WHOLE_NUMBER = re.compile(r"\d+(?:\.0+)?")
+
+MIN_AMOUNT = 1
+MAX_AMOUNT = 250000
+MIN_B2C_AMOUNT = 10
+MAX_REMARKS_LENGTH = 100
+MAX_ACCOUNT_REFERENCE_LENGTH = 12
+MAX_TRANSACTION_DESC_LENGTH = 13
+
+B2C_COMMAND_IDS = frozenset({"SalaryPayment", "BusinessPayment", "PromotionPayment"})
+C2B_COMMAND_IDS = frozenset({"CustomerPayBillOnline", "CustomerBuyGoodsOnline"})
+STK_TRANSACTION_TYPES = frozenset({"CustomerPayBillOnline", "CustomerBuyGoodsOnline"})
+C2B_RESPONSE_TYPES = frozenset({"Completed", "Cancelled"})
+# IdentifierType values: 1 MSISDN, 2 till number, 3 shortcode (as documented on
+# TransactionStatus), 4 organization shortcode, 11 organization.
+IDENTIFIER_TYPES = frozenset({"1", "2", "3", "4", "11"})
+
+
+def normalize_msisdn(msisdn: Union[str, int]) -> str:
+    """
+    Normalizes a Kenyan mobile number to the 2547XXXXXXXX form Mpesa expects.
+
+    Args:
+        msisdn (Union[str, int]): Number in 07XX, 01XX, 7XX, 2547XX or +2547XX
+        form; spaces, dashes and brackets are ignored.
+
+    Returns:
+        str: The number as 254 followed by nine digits.
+
+    Raises:
+        ValueError: Raised if msisdn is not a Kenyan mobile number.
+    """
+    match = _MSISDN.fullmatch(_SEPARATORS.sub("", str(msisdn)))
+    if match is None:
+        raise ValueError(f"{msisdn!r} is not a valid Kenyan mobile number.")
+    return "254" + match.group(1)
+
+
+class ValidationError(ValueError):
+    """
+    Raised when a request payload breaks one or more validation rules.
+
+    Attributes:
+        errors (List[str]): Description of every broken rule.
+    """
+
+    def __init__(self, operation: str, errors: List[str]):
+        super().__init__(f"Invalid {operation} request: {'; '.join(errors)}.")
+        self.errors = errors
+
+
+class Rule(NamedTuple):
+    """
+    A check applied to one payload field.
+
+    Attributes:
+        field (str): Payload field the rule applies to.
+        check (Callable[[Any], bool]): Returns True for valid values.
+        message (str): Describes a valid value, e.g. "must be at most 100
+        characters".
+        required (bool): Whether a missing or empty value breaks the rule.
+    """
+
+    field: str
+    check: Callable[[Any], bool]
+    message: str
+    required: bool = True
+
+
+def _matches(pattern: "re.Pattern") -> Callable[[Any], bool]:
+    fullmatch = pattern.fullmatch
+    return lambda value: fullmatch(str(value)) is not None
+
+
+def msisdn(field: str, required: bool = True) -> Rule:
+    """Rule accepting a mobile number in the 2547XXXXXXXX/2541XXXXXXXX form."""
+    return Rule(
+        field,
+        _matches(_CANONICAL_MSISDN),
+        "must be a Kenyan mobile number in the form 2547XXXXXXXX",
+        required,
+    )
+
+
+def shortcode(field: str) -> Rule:
+    """Rule accepting a paybill, till or B2C shortcode of 5 to 7 digits."""
+    return Rule(field, _matches(_SHORTCODE), "must be a shortcode of 5 to 7 digits")
+
+
+def receipt(field: str) -> Rule:
+    """Rule accepting a Mpesa receipt number such as OEI2AK4Q16."""
+    return Rule(
+        field, _matches(_RECEIPT), "must be a 10 character Mpesa receipt number"
+    )
+
+
+def url(field: str) -> Rule:
+    """Rule accepting an absolute http(s) URL."""
+    return Rule(field, _matches(_URL), "must be an http(s) URL")
+
+
+def one_of(field: str, values: FrozenSet[str]) -> Rule:
+    """Rule accepting one of values, compared as strings."""
+    return Rule(
+        field,
+        lambda value: str(value) in values,
+        f"must be one of {', '.join(sorted(values))}",
+    )
+
+
+def max_length(field: str, length: int, required: bool = True) -> Rule:
+    """Rule accepting values of at most length characters."""
+    return Rule(
+        field,
+        lambda value: len(str(value)) <= length,
+        f"must be at most {length} characters",
+        required,
+    )
+
+
+def amount(field: str, minimum: int = MIN_AMOUNT, maximum: int = MAX_AMOUNT) -> Rule:
+    """Rule accepting whole shilling amounts between minimum and maximum."""
+
+    def check(value: Any) -> bool:
+        if isinstance(value, bool):
+            return False
+        if isinstance(value, float):
+            return value.is_integer() and minimum <= value <= maximum
+        if isinstance(value, int):
+            return minimum <= value <= maximum
+        text = str(value)
+        return _WHOLE_NUMBER.fullmatch(text) is not None and (
+            minimum <= float(text) <= maximum
+        )
+
+    return Rule(field, check, f"must be a whole amount between {minimum} and {maximum}")
+
+
+DEFAULT_RULES: Dict[str, Tuple[Rule, ...]] = {
+    C2B_REGISTER_PATH: (
+        shortcode("ShortCode"),
+        one_of("ResponseType", C2B_RESPONSE_TYPES),
+        url("ConfirmationURL"),
+        url("ValidationURL"),
+    ),
+    C2B_SIMULATE_PATH: (
+        shortcode("ShortCode"),
+        one_of("CommandID", C2B_COMMAND_IDS),
+        amount("Amount"),
+        msisdn("Msisdn"),
+    ),
+    B2C_PAYMENT_PATH: (
+        one_of("CommandID", B2C_COMMAND_IDS),
+        amount("Amount", MIN_B2C_AMOUNT),
+        shortcode("PartyA"),
+        msisdn("PartyB"),
+        max_length("Remarks", MAX_REMARKS_LENGTH),
+        max_length("Occassion", MAX_REMARKS_LENGTH, required=False),
+        url("QueueTimeOutURL"),
+        url("ResultURL"),
+    ),
+    ACCOUNT_BALANCE_PATH: (
+        shortcode("PartyA"),
+        one_of("IdentifierType", IDENTIFIER_TYPES),
+        max_length("Remarks", MAX_REMARKS_LENGTH),
+        url("QueueTimeOutURL"),
+        url("ResultURL"),
+    ),
+    TRANSACTION_STATUS_PATH: (
+        receipt("TransactionID"),
+        one_of("IdentifierType", IDENTIFIER_TYPES),
+        max_length("Remarks", MAX_REMARKS_LENGTH),
+        max_length("Occasion", MAX_REMARKS_LENGTH, required=False),
+        url("QueueTimeOutURL"),
+        url("ResultURL"),
+    ),
+    STK_PUSH_PATH: (
+        shortcode("BusinessShortCode"),
+        one_of("TransactionType", STK_TRANSACTION_TYPES),
+        amount("Amount"),
+        msisdn("PartyA"),
+        shortcode("PartyB"),
+        msisdn("PhoneNumber"),
+        url("CallBackURL"),
+        max_length("AccountReference", MAX_ACCOUNT_REFERENCE_LENGTH),
+        max_length("TransactionDesc", MAX_TRANSACTION_DESC_LENGTH),
+    ),
+    STK_QUERY_PATH: (
+        shortcode("BusinessShortCode"),
+        max_length("CheckoutRequestID", 100),
+    ),
+    REVERSAL_PATH: (
+        receipt("TransactionID"),
+        amount("Amount"),
+        shortcode("ReceiverParty"),
+        one_of("RecieverIdentifierType", IDENTIFIER_TYPES),
+        max_length("Remarks", MAX_REMARKS_LENGTH),
+        max_length("Occasion", MAX_REMARKS_LENGTH, required=False),
+        url("QueueTimeOutURL"),
+        url("ResultURL"),
+    ),
+}
+
+
+class PayloadValidator:
+    """
+    PayloadValidator checks request payloads against per-endpoint rules before
+    they are sent, so that invalid phone numbers, amounts, command IDs and
+    over-long remarks are rejected locally instead of by a 400 from Mpesa. Pass
+    one to an API class as `validator` to check every request it sends.
+
+    Rules are built once, with precompiled patterns and frozen lookup sets, and
+    are keyed by endpoint path. `validate_many()` applies them column by column
+    to a batch of payloads.
+
+    Attributes:
+        rules (Dict[str, Tuple[Rule, ...]]): Rules keyed by endpoint path.
+
+    Methods:
+        errors(path, payload) -> List[str]: Returns the rules a payload breaks.
+        validate(path, payload, operation): Raises ValidationError for an
+        invalid payload.
+        validate_many(path, payloads) -> List[List[str]]: Returns the errors of
+        every payload.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Iterable[Rule]]] = None):
+        """
+        Initializes the validator.
+
+        Args:
+            rules (Optional[Dict[str, Iterable[Rule]]]): Rules keyed by endpoint
+            path, replacing the DEFAULT_RULES of those endpoints.
+        """
+        self.rules = {**DEFAULT_RULES}
+        for path, path_rules in (rules or {}).items():
+            self.rules[path] = tuple(path_rules)
+
+    def errors(self, path: str, payload: Dict[str, Any]) -> List[str]:
+        """
+        Returns a description of every rule the payload of a request breaks.
+
+        Args:
+            path (str): Endpoint path of the request.
+            payload (Dict[str, Any]): JSON body of the request.
+
+        Returns:
+            List[str]: Empty if the payload is valid.
+        """
+        return self.validate_many(path, (payload,))[0]
+
+    def validate(
+        self, path: str, payload: Dict[str, Any], operation: str = "Mpesa"
+    ) -> None:
+        """
+        Checks the payload of a request.
+
+        Args:
+            path (str): Endpoint path of the request.
+            payload (Dict[str, Any]): JSON body of the request.
+            operation (str): Name of the operation used in the error message.
+
+        Raises:
+            ValidationError: Raised if the payload breaks any rule.
+        """
+        errors = self.errors(path, payload)
+        if errors:
+            raise ValidationError(operation, errors)
+
+    def validate_many(
+        self, path: str, payloads: Iterable[Dict[str, Any]]
+    ) -> List[List[str]]:
+        """
+        Validates a batch of payloads for one endpoint, applying each rule to the
+        whole batch before moving to the next one.
+
+        Args:
+            path (str): Endpoint path of the requests.
+            payloads (Iterable[Dict[str, Any]]): JSON bodies of the requests.
+
+        Returns:
+            List[List[str]]: Errors of each payload, in input order.
+        """
+        payloads = list(payloads)
+        errors: List[List[str]] = [[] for _ in payloads]
+        for field, check, message, required in self.rules.get(path, ()):
+            described = f"{field} {message}"
+            for index, payload in enumerate(payloads):
+                value = payload.get(field)
+                if value is None or value == "":
+                    if required:
+                        errors[index].append(f"{field} is required")
+                elif not check(value):
+                    errors[index].append(described)
+        return errors
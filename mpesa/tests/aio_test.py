@@ -0,0 +1,239 @@
+import asyncio
+
+import pytest
+import respx
+from httpx import HTTPStatusError, Response
+
+from mpesa.api.aio import (
+    AsyncB2C,
+    AsyncBalance,
+    AsyncC2B,
+    AsyncMpesaBase,
+    AsyncMpesaExpress,
+    AsyncReversal,
+    AsyncTransactionStatus,
+)
+from mpesa.api.constants import AUTH_ENDPOINT
+
+SANDBOX_URL = "https://sandbox.safaricom.co.ke"
+SUCCESS = {"ResponseCode": "0", "ResponseDescription": "Success"}
+
+
+@pytest.fixture
+def auth_route():
+    with respx.mock() as respx_mock:
+        route = respx_mock.get(AUTH_ENDPOINT).mock(
+            return_value=Response(
+                200, json={"access_token": "mock_token", "expires_in": 3599}
+            )
+        )
+        yield respx_mock, route
+
+
+@respx.mock(assert_all_called=False)
+def test_constructor_does_not_authenticate(respx_mock):
+    route = respx_mock.get(AUTH_ENDPOINT).mock(return_value=Response(200, json={}))
+    AsyncB2C(env="sandbox", app_key="test_key", app_secret="test_secret")
+
+    assert route.call_count == 0
+
+
+def test_authenticate_success(auth_route):
+    async def run():
+        async with AsyncMpesaBase(app_key="test_key", app_secret="test_secret") as base:
+            return await base.authenticate()
+
+    assert asyncio.run(run()) == "mock_token"
+
+
+def test_concurrent_requests_share_token(auth_route):
+    respx_mock, route = auth_route
+    stk = respx_mock.post(f"{SANDBOX_URL}/mpesa/stkpush/v1/processrequest").mock(
+        return_value=Response(200, json=SUCCESS)
+    )
+
+    async def run():
+        async with AsyncMpesaExpress(
+            app_key="test_key", app_secret="test_secret"
+        ) as express:
+            await express.get_token()
+            return await asyncio.gather(
+                *(
+                    express.stk_push(
+                        short_code=600789,
+                        pass_key="pass_key",
+                        transaction_type="CustomerPayBillOnline",
+                        amount=10,
+                        sender_msisdn=254700000000,
+                        receiver_msisdn=254700000000,
+                        callback_url="https://example.com/callback",
+                        transaction_desc="Test transaction",
+                        account_ref="Account reference",
+                    )
+                    for _ in range(5)
+                )
+            )
+
+    responses = asyncio.run(run())
+
+    assert [response["ResponseCode"] for response in responses] == ["0"] * 5
+    assert route.call_count == 1
+    assert stk.call_count == 5
+    assert stk.calls.last.request.headers["Authorization"] == "Bearer mock_token"
+
+
+@pytest.mark.parametrize(
+    "cls, path, method, kwargs",
+    [
+        (
+            AsyncC2B,
+            "/mpesa/c2b/v1/registerurl",
+            "register",
+            dict(
+                shortcode=600000,
+                response_type="Completed",
+                confirmation_url="https://example.com/confirmation",
+                validation_url="https://example.com/validation",
+            ),
+        ),
+        (
+            AsyncB2C,
+            "/mpesa/b2c/v3/paymentrequest",
+            "transact",
+            dict(
+                originator_conversation_id="12345",
+                initiator_name="test_initiator",
+                security_credential="test_credential",
+                command_id="BusinessPayment",
+                amount="1000",
+                party_a=600123,
+                party_b=254700000000,
+                remarks="Test Transaction",
+                queue_timeout_url="https://example.com/timeout",
+                result_url="https://example.com/result",
+            ),
+        ),
+        (
+            AsyncBalance,
+            "/mpesa/accountbalance/v1/query",
+            "get_balance",
+            dict(
+                initiator="test_initiator",
+                security_credential="test_credential",
+                party_a="600000",
+                identifier_type=4,
+                remarks="Test balance query",
+                queue_timeout_url="https://example.com/timeout",
+                result_url="https://example.com/result",
+            ),
+        ),
+        (
+            AsyncTransactionStatus,
+            "/mpesa/transactionstatus/v1/query",
+            "check_transaction_status",
+            dict(
+                security_credential="test_credential",
+                originator_conversation_id="test_originator_id",
+                party_a="254700000000",
+                identifier_type="1",
+                transaction_id="test_transaction_id",
+                remarks="Test transaction status",
+                initiator="test_initiator",
+                result_url="https://example.com/result",
+                queue_timeout_url="https://example.com/timeout",
+            ),
+        ),
+        (
+            AsyncReversal,
+            "/mpesa/reversal/v1/request",
+            "reverse",
+            dict(
+                receiver=600798,
+                initiator="testapi",
+                amount=10,
+                security_credential="test_credential",
+                transaction_id="transaction_id",
+                timeout_url="https://example.com/timeout",
+                result_url="https://example.com/result",
+                occasion=None,
+                remarks="Remarks",
+            ),
+        ),
+    ],
+)
+def test_endpoint_success(auth_route, cls, path, method, kwargs):
+    respx_mock, _ = auth_route
+    respx_mock.post(f"{SANDBOX_URL}{path}").mock(
+        return_value=Response(200, json=SUCCESS)
+    )
+
+    async def run():
+        async with cls(
+            env="sandbox", app_key="test_key", app_secret="test_secret"
+        ) as api:
+            return await getattr(api, method)(**kwargs)
+
+    assert asyncio.run(run()) == SUCCESS
+
+
+def test_endpoint_http_error(auth_route):
+    respx_mock, _ = auth_route
+    respx_mock.post(f"{SANDBOX_URL}/mpesa/stkpushquery/v1/query").mock(
+        return_value=Response(500, json={"error": "Internal Server Error"})
+    )
+
+    async def run():
+        async with AsyncMpesaExpress(
+            app_key="test_key", app_secret="test_secret"
+        ) as express:
+            await express.status(
+                short_code=600798, checkout_request_id="checkout_id", pass_key="key"
+            )
+
+    with pytest.raises(HTTPStatusError):
+        asyncio.run(run())
+
+
+def test_missing_credentials():
+    async def run():
+        async with AsyncB2C(env="sandbox") as b2c:
+            await b2c.get_token()
+
+    with pytest.raises(ValueError, match="App key and app secret must be provided"):
+        asyncio.run(run())
+
+
+def test_concurrent_tasks_authenticate_once(auth_route):
+    _, route = auth_route
+
+    async def run():
+        async with AsyncMpesaBase(app_key="test_key", app_secret="test_secret") as base:
+            return await asyncio.gather(*(base.get_token() for _ in range(50)))
+
+    assert asyncio.run(run()) == ["mock_token"] * 50
+    assert route.call_count == 1
+
+
+def test_expired_token_is_refreshed_and_request_replayed():
+    with respx.mock() as respx_mock:
+        respx_mock.get(AUTH_ENDPOINT).mock(
+            side_effect=[
+                Response(200, json={"access_token": "old_token"}),
+                Response(200, json={"access_token": "new_token"}),
+            ]
+        )
+        route = respx_mock.post(f"{SANDBOX_URL}/mpesa/c2b/v1/simulate").mock(
+            side_effect=[Response(401), Response(200, json=SUCCESS)]
+        )
+
+        async def run():
+            async with AsyncC2B(app_key="test_key", app_secret="test_secret") as c2b:
+                return await c2b.simulate(
+                    shortcode=600000,
+                    command_id="CustomerPayBillOnline",
+                    amount=10,
+                    msisdn=254700000000,
+                )
+
+        assert asyncio.run(run()) == SUCCESS
+        assert route.calls[1].request.headers["Authorization"] == "Bearer new_token"
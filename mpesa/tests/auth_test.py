@@ -1,8 +1,17 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
 import pytest
 import respx
 from httpx import Response, HTTPStatusError
 from mpesa.api.auth import MpesaBase
+from mpesa.api.c2b import C2B
 from mpesa.api.constants import AUTH_ENDPOINT
+from mpesa.api.token_cache import TokenCache
+
+SANDBOX_URL = "https://sandbox.safaricom.co.ke"
 
 
 @pytest.fixture
@@ -46,6 +55,19 @@ def test_authenticate_failure_401(mpesa_instance):
     assert exc_info.value.response.status_code == 401
 
 
+@respx.mock
+def test_errors_are_logged_not_printed(mpesa_instance, caplog, capsys):
+    """Test that authentication errors go to the module logger, not stdout."""
+    mock_authenticate_response(401, {"error": "invalid_client"})
+
+    with caplog.at_level(logging.WARNING, logger="mpesa.api.auth"):
+        with pytest.raises(HTTPStatusError):
+            mpesa_instance.authenticate()
+
+    assert "Authentication failed with status 401" in caplog.text
+    assert capsys.readouterr().out == ""
+
+
 @respx.mock
 def test_authenticate_no_access_token_in_response(mpesa_instance):
     """Test authentication response without access token."""
@@ -56,3 +78,173 @@ def test_authenticate_no_access_token_in_response(mpesa_instance):
         ValueError, match="Authentication failed: access_token not found in response"
     ):
         mpesa_instance.authenticate()
+
+
+@respx.mock
+def test_get_token_reuses_cached_token():
+    """Test that instances sharing a cache authenticate only once."""
+    route = respx.get(AUTH_ENDPOINT).mock(
+        return_value=Response(
+            200, json={"access_token": "mock_token", "expires_in": "3599"}
+        )
+    )
+    cache = TokenCache()
+
+    first = MpesaBase(app_key="test_key", app_secret="test_secret", token_cache=cache)
+    second = MpesaBase(app_key="test_key", app_secret="test_secret", token_cache=cache)
+
+    assert first.get_token() == "mock_token"
+    assert second.get_token() == "mock_token"
+    assert second.token == "mock_token"
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_get_token_refreshes_expired_token():
+    """Test that an expired token triggers a new authentication request."""
+    route = respx.get(AUTH_ENDPOINT).mock(
+        return_value=Response(
+            200, json={"access_token": "mock_token", "expires_in": "0"}
+        )
+    )
+    mpesa = MpesaBase(
+        app_key="test_key", app_secret="test_secret", token_cache=TokenCache()
+    )
+
+    mpesa.get_token()
+    mpesa.get_token()
+
+    assert route.call_count == 2
+
+
+@respx.mock
+def test_authenticate_reuses_pooled_client(mpesa_instance):
+    """Test that repeated requests go through the same pooled client."""
+    mock_authenticate_response(200, {"access_token": "mock_token"})
+
+    mpesa_instance.authenticate()
+    client = mpesa_instance.client
+    mpesa_instance.authenticate()
+
+    assert mpesa_instance.client is client
+
+
+def test_context_manager_closes_owned_client():
+    """Test that leaving the context closes the client created by the instance."""
+    with MpesaBase(app_key="test_key", app_secret="test_secret") as mpesa:
+        client = mpesa.client
+
+    assert client.is_closed
+
+
+def test_close_leaves_shared_client_open():
+    """Test that a client passed in by the caller is not closed by the instance."""
+    shared = httpx.Client()
+    mpesa = MpesaBase(app_key="test_key", app_secret="test_secret", http_client=shared)
+
+    mpesa.close()
+
+    assert mpesa.client is shared
+    assert not shared.is_closed
+    shared.close()
+
+
+@respx.mock
+def test_get_token_single_flight_across_threads():
+    """Test that concurrent cache misses trigger a single authentication request."""
+
+    def slow_auth(request):
+        time.sleep(0.05)
+        return Response(200, json={"access_token": "mock_token", "expires_in": 3599})
+
+    route = respx.get(AUTH_ENDPOINT).mock(side_effect=slow_auth)
+    cache = TokenCache()
+    instances = [
+        MpesaBase(app_key="test_key", app_secret="test_secret", token_cache=cache)
+        for _ in range(20)
+    ]
+
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        tokens = list(executor.map(lambda mpesa: mpesa.get_token(), instances))
+
+    assert tokens == ["mock_token"] * 20
+    assert route.call_count == 1
+
+
+@respx.mock
+@pytest.mark.parametrize(
+    "rejection",
+    [
+        Response(401, json={"errorMessage": "Unauthorized"}),
+        Response(
+            404,
+            json={"errorCode": "404.001.03", "errorMessage": "Invalid Access Token"},
+        ),
+    ],
+)
+def test_expired_token_is_refreshed_and_request_replayed(rejection):
+    """Test that a rejected token is refreshed once and the request replayed."""
+    auth = respx.get(AUTH_ENDPOINT).mock(
+        side_effect=[
+            Response(200, json={"access_token": "old_token", "expires_in": 3599}),
+            Response(200, json={"access_token": "new_token", "expires_in": 3599}),
+        ]
+    )
+    simulate = respx.post(f"{SANDBOX_URL}/mpesa/c2b/v1/simulate").mock(
+        side_effect=[rejection, Response(200, json={"ResponseCode": "0"})]
+    )
+    c2b = C2B(app_key="test_key", app_secret="test_secret", token_cache=TokenCache())
+
+    response = c2b.simulate(
+        shortcode=600000,
+        command_id="CustomerPayBillOnline",
+        amount=10,
+        msisdn=254700000000,
+    )
+
+    assert response["ResponseCode"] == "0"
+    assert auth.call_count == 2
+    assert simulate.calls[0].request.headers["Authorization"] == "Bearer old_token"
+    assert simulate.calls[1].request.headers["Authorization"] == "Bearer new_token"
+
+
+@respx.mock
+def test_rejected_token_is_replayed_only_once():
+    """Test that a persistently rejected request is not replayed in a loop."""
+    respx.get(AUTH_ENDPOINT).mock(
+        return_value=Response(200, json={"access_token": "mock_token"})
+    )
+    simulate = respx.post(f"{SANDBOX_URL}/mpesa/c2b/v1/simulate").mock(
+        return_value=Response(401)
+    )
+    c2b = C2B(app_key="test_key", app_secret="test_secret", token_cache=TokenCache())
+
+    with pytest.raises(HTTPStatusError):
+        c2b.simulate(
+            shortcode=600000,
+            command_id="CustomerPayBillOnline",
+            amount=10,
+            msisdn=254700000000,
+        )
+
+    assert simulate.call_count == 2
+
+
+def test_invalidate_keeps_newer_token():
+    """Test that invalidating a stale token does not drop a refreshed one."""
+    cache = TokenCache()
+    key = ("sandbox", "test_key", SANDBOX_URL)
+    cache.set(key, "new_token", 3599)
+
+    cache.invalidate(key, "old_token")
+
+    assert cache.get(key) == "new_token"
+
+
+@respx.mock
+def test_warmup_fetches_token(mpesa_instance):
+    """Test that warmup authenticates ahead of the first request."""
+    mock_authenticate_response(200, {"access_token": "mock_token"})
+
+    assert mpesa_instance.warmup() == "mock_token"
+    assert mpesa_instance.authentication_token == "mock_token"
@@ -1,11 +1,12 @@
 import pytest
 import respx
-from httpx import Response, HTTPStatusError
+from httpx import ConnectError, Response, HTTPStatusError
 from mpesa.api.b2c import B2C  # Adjust this import path if necessary
+from mpesa.api.retry import RetryPolicy
 
 @pytest.fixture
 def mock_authentication():
-    with respx.mock() as respx_mock:
+    with respx.mock(assert_all_called=False) as respx_mock:
         # Mock the authentication endpoint with a successful response
         respx_mock.get("https://sandbox.safaricom.co.ke/oauth/v1/generate?grant_type=client_credentials").mock(
             return_value=Response(
@@ -97,3 +98,48 @@ def test_transact_missing_token():
             result_url="https://example.com/result",
             occassion="Test",
         )
+
+
+@respx.mock
+def test_transact_connection_error(mock_authentication):
+    # Mock the B2C endpoint to fail before a response is received
+    route = respx.post("https://sandbox.safaricom.co.ke/mpesa/b2c/v3/paymentrequest").mock(
+        side_effect=ConnectError("Connection refused")
+    )
+    b2c = B2C(
+        env="sandbox",
+        app_key="test_key",
+        app_secret="test_secret",
+        retry_policy=RetryPolicy(max_retries=2, backoff_factor=0),
+    )
+
+    with pytest.raises(ValueError, match="An error occurred during the B2C transaction"):
+        b2c.transact(
+            originator_conversation_id="12345",
+            initiator_name="test_initiator",
+            security_credential="test_credential",
+            command_id="BusinessPayment",
+            amount="1000",
+            party_a=600123,
+            party_b=254700000000,
+            remarks="Test Transaction",
+            queue_timeout_url="https://example.com/timeout",
+            result_url="https://example.com/result",
+            occassion="Test",
+        )
+
+    # Connection errors are retried since the request never reached Mpesa
+    assert route.call_count == 3
+
+
+@respx.mock(assert_all_called=False)
+def test_constructor_does_not_authenticate():
+    # Constructing the client must not contact Mpesa
+    auth = respx.get("https://sandbox.safaricom.co.ke/oauth/v1/generate?grant_type=client_credentials").mock(
+        return_value=Response(200, json={"access_token": "mock_token"})
+    )
+
+    b2c = B2C(env="sandbox", app_key="test_key", app_secret="test_secret")
+
+    assert auth.call_count == 0
+    assert b2c.authentication_token is None
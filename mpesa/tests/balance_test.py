@@ -5,7 +5,7 @@ from mpesa.api.balance import Balance
 
 @pytest.fixture
 def mock_authentication():
-    with respx.mock() as respx_mock:
+    with respx.mock(assert_all_called=False) as respx_mock:
         respx_mock.get("https://sandbox.safaricom.co.ke/oauth/v1/generate?grant_type=client_credentials").mock(
             return_value=Response(
                 200,
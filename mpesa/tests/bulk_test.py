@@ -0,0 +1,130 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from httpx import Response
+
+from mpesa.api.aio import AsyncB2C
+from mpesa.api.b2c import B2C
+from mpesa.api.bulk import BulkDisbursement
+
+B2C_URL = "https://sandbox.safaricom.co.ke/mpesa/b2c/v3/paymentrequest"
+
+DEFAULTS = {
+    "initiator_name": "test_initiator",
+    "security_credential": "test_credential",
+    "command_id": "BusinessPayment",
+    "party_a": 600123,
+    "remarks": "Bulk payout",
+    "queue_timeout_url": "https://example.com/timeout",
+    "result_url": "https://example.com/result",
+}
+
+
+def payouts(count):
+    return ({"party_b": 254700000000 + i, "amount": "100"} for i in range(count))
+
+
+def test_run_yields_every_result(respx_router):
+    route = respx_router.post(B2C_URL).mock(
+        return_value=Response(200, json={"ResponseCode": "0"})
+    )
+    b2c = B2C(env="sandbox", app_key="test_key", app_secret="test_secret")
+    engine = BulkDisbursement(b2c, concurrency=4, defaults=DEFAULTS)
+
+    results = list(engine.run(payouts(25)))
+
+    assert len(results) == 25
+    assert all(result.ok for result in results)
+    assert route.call_count == 25
+    assert engine.stats.submitted == 25
+    assert engine.stats.succeeded == 25
+    assert engine.stats.error_rate == 0.0
+    assert engine.stats.throughput > 0
+
+
+def test_run_assigns_unique_conversation_ids(respx_router):
+    route = respx_router.post(B2C_URL).mock(
+        return_value=Response(200, json={"ResponseCode": "0"})
+    )
+    b2c = B2C(env="sandbox", app_key="test_key", app_secret="test_secret")
+    records = [
+        {"party_b": 254700000001, "amount": "10", "originator_conversation_id": "x1"},
+        {"party_b": 254700000002, "amount": "10"},
+        {"party_b": 254700000003, "amount": "10"},
+    ]
+
+    results = list(BulkDisbursement(b2c, defaults=DEFAULTS).run(records))
+
+    ids = {result.originator_conversation_id for result in results}
+    assert len(ids) == 3
+    assert "x1" in ids
+    sent = {
+        json.loads(call.request.content)["OriginatorConversationID"]
+        for call in route.calls
+    }
+    assert sent == ids
+
+
+def test_run_counts_errors(respx_router):
+    respx_router.post(B2C_URL).mock(
+        side_effect=[
+            Response(200, json={"ResponseCode": "0"}),
+            Response(400, json={"errorMessage": "Bad Request"}),
+        ]
+    )
+    b2c = B2C(env="sandbox", app_key="test_key", app_secret="test_secret")
+    engine = BulkDisbursement(b2c, concurrency=1, defaults=DEFAULTS)
+
+    results = list(engine.run(payouts(2)))
+
+    assert [result.ok for result in results] == [True, False]
+    assert engine.stats.failed == 1
+    assert engine.stats.error_rate == 0.5
+
+
+def test_run_bounds_concurrency(respx_router):
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+    release = threading.Event()
+
+    def handler(request):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        release.wait(0.01)
+        with lock:
+            in_flight -= 1
+        return Response(200, json={"ResponseCode": "0"})
+
+    respx_router.post(B2C_URL).mock(side_effect=handler)
+    b2c = B2C(env="sandbox", app_key="test_key", app_secret="test_secret")
+
+    list(BulkDisbursement(b2c, concurrency=3, defaults=DEFAULTS).run(payouts(20)))
+
+    assert peak <= 3
+
+
+def test_invalid_concurrency():
+    with pytest.raises(ValueError, match="concurrency must be at least 1"):
+        BulkDisbursement(object(), concurrency=0)
+
+
+def test_arun_with_async_client(respx_router):
+    route = respx_router.post(B2C_URL).mock(
+        return_value=Response(200, json={"ResponseCode": "0"})
+    )
+
+    async def run():
+        async with AsyncB2C(app_key="test_key", app_secret="test_secret") as b2c:
+            engine = BulkDisbursement(b2c, concurrency=5, defaults=DEFAULTS)
+            return [result async for result in engine.arun(payouts(12))], engine
+
+    results, engine = asyncio.run(run())
+
+    assert len(results) == 12
+    assert route.call_count == 12
+    assert engine.stats.succeeded == 12
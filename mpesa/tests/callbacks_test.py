@@ -0,0 +1,246 @@
+import asyncio
+import io
+import json
+import queue
+
+import pytest
+
+from mpesa.api.callbacks import (
+    B2CResult,
+    BalanceResult,
+    C2BNotification,
+    CallbackReceiver,
+    StkCallback,
+    parse_callback,
+)
+
+STK_SUCCESS = {
+    "Body": {
+        "stkCallback": {
+            "MerchantRequestID": "29115-34620561-1",
+            "CheckoutRequestID": "ws_CO_191220191020363925",
+            "ResultCode": 0,
+            "ResultDesc": "The service request is processed successfully.",
+            "CallbackMetadata": {
+                "Item": [
+                    {"Name": "Amount", "Value": 1.00},
+                    {"Name": "MpesaReceiptNumber", "Value": "NLJ7RT61SV"},
+                    {"Name": "Balance"},
+                    {"Name": "TransactionDate", "Value": 20191219102115},
+                    {"Name": "PhoneNumber", "Value": 254708374149},
+                ]
+            },
+        }
+    }
+}
+
+STK_CANCELLED = {
+    "Body": {
+        "stkCallback": {
+            "MerchantRequestID": "29115-34620561-1",
+            "CheckoutRequestID": "ws_CO_191220191020363925",
+            "ResultCode": 1032,
+            "ResultDesc": "Request cancelled by user.",
+        }
+    }
+}
+
+B2C_RESULT = {
+    "Result": {
+        "ResultType": 0,
+        "ResultCode": 0,
+        "ResultDesc": "The service request is processed successfully.",
+        "OriginatorConversationID": "10571-7910404-1",
+        "ConversationID": "AG_20191219_00004e48cf7e3533f581",
+        "TransactionID": "NLJ41HAY6Q",
+        "ResultParameters": {
+            "ResultParameter": [
+                {"Key": "TransactionAmount", "Value": 10},
+                {"Key": "TransactionReceipt", "Value": "NLJ41HAY6Q"},
+                {
+                    "Key": "ReceiverPartyPublicName",
+                    "Value": "254708374149 - John Doe",
+                },
+            ]
+        },
+        "ReferenceData": {
+            "ReferenceItem": {"Key": "QueueTimeoutURL", "Value": "https://example.com"}
+        },
+    }
+}
+
+BALANCE_RESULT = {
+    "Result": {
+        "ResultType": 0,
+        "ResultCode": 0,
+        "ResultDesc": "The service request is processed successfully.",
+        "OriginatorConversationID": "16917-22577599-3",
+        "ConversationID": "AG_20200206_00005e091a8ec6b9eac5",
+        "TransactionID": "OA90000000",
+        "ResultParameters": {
+            "ResultParameter": [
+                {
+                    "Key": "AccountBalance",
+                    "Value": "Working Account|KES|700000.00|700000.00|0.00|0.00"
+                    "&Utility Account|KES|228037.00|228037.00|0.00|0.00",
+                }
+            ]
+        },
+    }
+}
+
+C2B_CONFIRMATION = {
+    "TransactionType": "Pay Bill",
+    "TransID": "RKTQDM7W6S",
+    "TransTime": "20191122063845",
+    "TransAmount": "10",
+    "BusinessShortCode": "600638",
+    "BillRefNumber": "invoice008",
+    "MSISDN": "25470****149",
+    "FirstName": "John",
+}
+
+
+def test_parse_stk_success():
+    callback = parse_callback("stk", json.dumps(STK_SUCCESS).encode())
+
+    assert isinstance(callback, StkCallback)
+    assert callback.ok
+    assert callback.amount == 1.0
+    assert callback.mpesa_receipt_number == "NLJ7RT61SV"
+    assert callback.transaction_date == 20191219102115
+    assert callback.phone_number == 254708374149
+    assert callback.metadata["Balance"] is None
+
+
+def test_parse_stk_cancelled():
+    callback = parse_callback("stk", STK_CANCELLED)
+
+    assert not callback.ok
+    assert callback.result_code == 1032
+    assert callback.metadata == {}
+    assert callback.amount is None
+
+
+def test_parse_b2c_result():
+    result = parse_callback("b2c", B2C_RESULT)
+
+    assert isinstance(result, B2CResult)
+    assert result.ok
+    assert result.originator_conversation_id == "10571-7910404-1"
+    assert result.transaction_amount == 10
+    assert result.receiver_party_public_name == "254708374149 - John Doe"
+    assert result.reference_data == {"QueueTimeoutURL": "https://example.com"}
+
+
+def test_parse_balance_accounts():
+    result = parse_callback("balance", BALANCE_RESULT)
+
+    assert isinstance(result, BalanceResult)
+    assert result.accounts == [
+        ("Working Account", "KES", "700000.00"),
+        ("Utility Account", "KES", "228037.00"),
+    ]
+
+
+def test_results_use_slots():
+    callback = parse_callback("stk", STK_SUCCESS)
+
+    with pytest.raises(AttributeError):
+        callback.unexpected = True
+
+
+def test_parse_malformed_body():
+    with pytest.raises(ValueError, match="Malformed stk callback body"):
+        parse_callback("stk", {"Body": {}})
+
+
+def test_unknown_route_kind():
+    with pytest.raises(ValueError, match="Unknown callback kinds: bogus"):
+        CallbackReceiver({"/callback": "bogus"})
+
+
+def test_dispatch_hands_off_to_handler_and_queue():
+    received = []
+    results = queue.Queue()
+    receiver = CallbackReceiver(
+        {"/mpesa/stk": "stk"}, handler=received.append, queue=results
+    )
+
+    status, body = receiver.dispatch("/mpesa/stk", json.dumps(STK_SUCCESS).encode())
+
+    assert status == 200
+    assert body == {"ResultCode": 0, "ResultDesc": "Accepted"}
+    assert received[0].checkout_request_id == "ws_CO_191220191020363925"
+    assert results.get_nowait() is received[0]
+
+
+def test_dispatch_unknown_path_and_malformed_body():
+    receiver = CallbackReceiver({"/mpesa/stk": "stk"})
+
+    assert receiver.dispatch("/other", b"{}")[0] == 404
+    assert receiver.dispatch("/mpesa/stk", b"not json")[0] == 400
+
+
+def test_validation_can_reject():
+    receiver = CallbackReceiver(
+        {"/validate": "c2b_validation"},
+        validator=lambda notification: notification.trans_amount != "10",
+    )
+
+    status, body = receiver.dispatch("/validate", json.dumps(C2B_CONFIRMATION).encode())
+
+    assert status == 200
+    assert body["ResultCode"] == "C2B00016"
+
+
+def test_wsgi_app():
+    received = []
+    receiver = CallbackReceiver(
+        {"/confirm": "c2b_confirmation"}, handler=received.append
+    )
+    body = json.dumps(C2B_CONFIRMATION).encode()
+    responses = []
+
+    result = receiver.wsgi_app(
+        {
+            "REQUEST_METHOD": "POST",
+            "PATH_INFO": "/confirm",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": io.BytesIO(body),
+        },
+        lambda status, headers: responses.append(status),
+    )
+
+    assert responses == ["200 OK"]
+    assert json.loads(b"".join(result)) == {"ResultCode": 0, "ResultDesc": "Accepted"}
+    assert isinstance(received[0], C2BNotification)
+    assert received[0].trans_id == "RKTQDM7W6S"
+
+
+def test_asgi_app_streams_to_async_queue():
+    async def run():
+        results = asyncio.Queue()
+        receiver = CallbackReceiver({"/result": "b2c"}, queue=results)
+        body = json.dumps(B2C_RESULT).encode()
+        messages = [
+            {"type": "http.request", "body": body[:10], "more_body": True},
+            {"type": "http.request", "body": body[10:], "more_body": False},
+        ]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "POST", "path": "/result"}
+        await receiver(scope, receive, send)
+        return sent, await results.get()
+
+    sent, result = asyncio.run(run())
+
+    assert sent[0]["status"] == 200
+    assert json.loads(sent[1]["body"]) == {"ResultCode": 0, "ResultDesc": "Accepted"}
+    assert result.transaction_id == "NLJ41HAY6Q"
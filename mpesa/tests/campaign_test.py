@@ -0,0 +1,160 @@
+import asyncio
+import io
+import json
+import time
+
+import pytest
+from httpx import Response
+
+from mpesa.api.aio import AsyncMpesaExpress
+from mpesa.api.campaign import (
+    RESULT_FIELDS,
+    INVALID,
+    StkCampaign,
+    read_records,
+)
+from mpesa.api.mpesa_express import MpesaExpress
+from mpesa.api.reconciliation import write_report
+from mpesa.api.validation import PayloadValidator
+
+STK_URL = "https://sandbox.safaricom.co.ke/mpesa/stkpush/v1/processrequest"
+
+DEFAULTS = {
+    "short_code": 174379,
+    "pass_key": "pass_key",
+    "transaction_type": "CustomerPayBillOnline",
+    "amount": 10,
+    "callback_url": "https://example.com/stk",
+    "transaction_desc": "Campaign",
+    "account_ref": "Campaign",
+}
+
+
+@pytest.fixture
+def stk_route(respx_router):
+    def respond(request):
+        body = json.loads(request.content)
+        if body["PhoneNumber"] == 254700000099:
+            return Response(
+                200, json={"ResponseCode": "1", "ResponseDescription": "No"}
+            )
+        return Response(
+            200,
+            json={
+                "MerchantRequestID": "M1",
+                "CheckoutRequestID": f"ws_{body['PhoneNumber']}",
+                "ResponseCode": "0",
+                "ResponseDescription": "Success. Request accepted for processing",
+            },
+        )
+
+    return respx_router.post(STK_URL).mock(side_effect=respond)
+
+
+def numbers(count):
+    return [{"msisdn": f"07{n:08d}"} for n in range(count)]
+
+
+def test_read_records_streams_csv_and_jsonl(tmp_path):
+    path = tmp_path / "campaign.jsonl"
+    path.write_text(
+        '{"msisdn": "0712345678", "amount": 5}\n\n{"msisdn": "0712345679"}\n'
+    )
+
+    assert list(read_records(str(path))) == [
+        {"msisdn": "0712345678", "amount": 5},
+        {"msisdn": "0712345679"},
+    ]
+    assert list(read_records(io.StringIO("msisdn,amount\n0712345678,5\n"))) == [
+        {"msisdn": "0712345678", "amount": "5"}
+    ]
+    with pytest.raises(ValueError, match="Unknown record format xml"):
+        list(read_records(io.StringIO(""), format="xml"))
+
+
+def test_run_sends_prompts_and_reports_results(stk_route):
+    records = numbers(3) + [{"msisdn": "12345"}, {"msisdn": "0700000099", "amount": 99}]
+    campaign = StkCampaign(
+        MpesaExpress(app_key="key", app_secret="secret"), DEFAULTS, concurrency=2
+    )
+    report = io.StringIO()
+
+    counts = write_report(campaign.run(records), report, fields=RESULT_FIELDS)
+
+    assert counts == {"submitted": 3, "invalid": 1, "rejected": 1}
+    assert campaign.stats == counts
+    assert stk_route.call_count == 4
+    bodies = [json.loads(call.request.content) for call in stk_route.calls]
+    assert sorted(body["PartyA"] for body in bodies) == [
+        254700000000,
+        254700000001,
+        254700000002,
+        254700000099,
+    ]
+    assert {body["Amount"] for body in bodies} == {10, 99}
+    lines = report.getvalue().splitlines()
+    assert lines[0] == ",".join(RESULT_FIELDS)
+    assert "3,,invalid" in report.getvalue()
+    assert "ws_254700000001" in report.getvalue()
+
+
+def test_restart_resumes_from_checkpoint(stk_route, tmp_path):
+    checkpoint = str(tmp_path / "campaign.checkpoint")
+    client = MpesaExpress(app_key="key", app_secret="secret")
+    campaign = StkCampaign(
+        client, DEFAULTS, concurrency=1, checkpoint=checkpoint, checkpoint_every=2
+    )
+
+    results = campaign.run(numbers(10))
+    first = [next(results) for _ in range(5)]
+    results.close()  # the process stops
+
+    assert [result.index for result in first] == [0, 1, 2, 3, 4]
+    assert campaign.position() == 5
+
+    resumed = StkCampaign(client, DEFAULTS, concurrency=1, checkpoint=checkpoint)
+    rest = list(resumed.run(numbers(10)))
+
+    assert [result.index for result in rest] == [5, 6, 7, 8, 9]
+    assert stk_route.call_count == 10
+    assert resumed.position() == 10
+    assert list(resumed.run(numbers(10))) == []
+
+
+def test_rate_paces_submissions(stk_route):
+    campaign = StkCampaign(
+        MpesaExpress(app_key="key", app_secret="secret"), DEFAULTS, rate=50
+    )
+
+    started = time.monotonic()
+    results = list(campaign.run(numbers(6)))
+
+    assert len(results) == 6
+    assert time.monotonic() - started >= 0.09
+
+
+def test_arun_sends_prompts(stk_route):
+    async def run():
+        async with AsyncMpesaExpress(app_key="key", app_secret="secret") as client:
+            campaign = StkCampaign(client, DEFAULTS, concurrency=3)
+            return [result async for result in campaign.arun(numbers(5))]
+
+    results = asyncio.run(run())
+
+    assert sorted(result.index for result in results) == [0, 1, 2, 3, 4]
+    assert all(result.ok for result in results)
+    assert results[0].response["CheckoutRequestID"].startswith("ws_2547")
+
+
+def test_records_rejected_by_validator_are_invalid(stk_route):
+    client = MpesaExpress(
+        app_key="key", app_secret="secret", validator=PayloadValidator()
+    )
+    campaign = StkCampaign(client, DEFAULTS)
+
+    records = [{"msisdn": "0712345678", "amount": 0}, {"msisdn": "0712345678"}]
+    results = list(campaign.run(records))
+
+    assert [result.status for result in results] == [INVALID, "submitted"]
+    assert "Amount must be a whole amount" in str(results[0].error)
+    assert stk_route.call_count == 1
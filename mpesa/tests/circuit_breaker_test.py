@@ -0,0 +1,245 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from mpesa.api.aio import AsyncBalance
+from mpesa.api.b2c import B2C
+from mpesa.api.balance import Balance
+from mpesa.api.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from mpesa.api.constants import (
+    ACCOUNT_BALANCE_ENDPOINT,
+    ACCOUNT_BALANCE_PATH,
+    AUTH_ENDPOINT,
+    B2C_PAYMENT_PATH,
+)
+from mpesa.api.idempotency import MemoryIdempotencyStore
+from mpesa.api.retry import RetryPolicy
+from mpesa.tests.conftest import FakeClock
+
+B2C_URL = "https://sandbox.safaricom.co.ke/mpesa/b2c/v3/paymentrequest"
+PATH = ACCOUNT_BALANCE_PATH
+
+
+def fail(breaker, path=PATH, probe=False, env="sandbox"):
+    breaker.record(env, path, probe, response=Response(503))
+
+
+def succeed(breaker, path=PATH, probe=False):
+    breaker.record("sandbox", path, probe, response=Response(200))
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, clock=FakeClock())
+
+    fail(breaker)
+    fail(breaker)
+    succeed(breaker)
+    fail(breaker)
+    fail(breaker)
+    assert breaker.state("sandbox", PATH) == CLOSED
+    assert breaker.allow("sandbox", PATH) is False
+
+    fail(breaker)
+
+    assert breaker.state("sandbox", PATH) == OPEN
+    assert breaker.state("production", PATH) == CLOSED
+    assert breaker.state("sandbox", B2C_PAYMENT_PATH) == CLOSED
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.allow("sandbox", PATH)
+    assert error.value.retry_after == 30.0
+    assert error.value.path == PATH
+
+
+def test_only_unhealthy_outcomes_are_failures():
+    breaker = CircuitBreaker(failure_threshold=1)
+
+    for status in (200, 400, 401, 429):
+        breaker.record("sandbox", PATH, response=Response(status))
+    assert breaker.state("sandbox", PATH) == CLOSED
+
+    breaker.record("sandbox", PATH, error=httpx.ReadTimeout("timed out"))
+    assert breaker.state("sandbox", PATH) == OPEN
+
+
+def test_half_open_probe_closes_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+    fail(breaker)
+
+    clock.now = 10
+    assert breaker.states() == {("sandbox", PATH): HALF_OPEN}
+    assert breaker.allow("sandbox", PATH) is True
+    with pytest.raises(CircuitOpenError):
+        breaker.allow("sandbox", PATH)
+
+    # Outcomes of requests admitted before the circuit opened are ignored.
+    succeed(breaker, probe=False)
+    assert breaker.state("sandbox", PATH) == HALF_OPEN
+
+    succeed(breaker, probe=True)
+    assert breaker.state("sandbox", PATH) == CLOSED
+
+
+def test_failed_probe_reopens_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        failure_threshold=1, recovery_timeout=10, success_threshold=2, clock=clock
+    )
+    fail(breaker)
+    clock.now = 10
+    assert breaker.allow("sandbox", PATH) is True
+    succeed(breaker, probe=True)
+    assert breaker.state("sandbox", PATH) == HALF_OPEN
+
+    assert breaker.allow("sandbox", PATH) is True
+    fail(breaker, probe=True)
+
+    assert breaker.state("sandbox", PATH) == OPEN
+    clock.now = 15
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.allow("sandbox", PATH)
+    assert error.value.retry_after == 5
+
+
+def test_reset():
+    breaker = CircuitBreaker(failure_threshold=1)
+    fail(breaker)
+    fail(breaker, env="production")
+
+    breaker.reset(env="sandbox")
+
+    assert breaker.states() == {("production", PATH): OPEN}
+    with pytest.raises(ValueError, match="failure_threshold"):
+        CircuitBreaker(failure_threshold=0)
+
+
+def balance(api):
+    return api.get_balance(
+        "initiator", "credential", "600000", 4, "remarks", "timeout", "result"
+    )
+
+
+@respx.mock
+def test_open_circuit_fails_fast():
+    respx.get(AUTH_ENDPOINT).mock(
+        return_value=Response(200, json={"access_token": "token"})
+    )
+    route = respx.post(ACCOUNT_BALANCE_ENDPOINT).mock(return_value=Response(503))
+    b2c_route = respx.post(B2C_URL).mock(return_value=Response(200, json={}))
+    breaker = CircuitBreaker(failure_threshold=2)
+    options = {
+        "app_key": "key",
+        "app_secret": "secret",
+        "retry_policy": RetryPolicy(max_retries=0),
+        "circuit_breaker": breaker,
+    }
+    api = Balance(**options)
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            balance(api)
+    with pytest.raises(CircuitOpenError):
+        balance(api)
+
+    assert route.call_count == 2
+    assert breaker.state("sandbox", ACCOUNT_BALANCE_PATH) == OPEN
+    # Other endpoints keep working.
+    B2C(**options).transact(
+        "ocid",
+        "initiator",
+        "credential",
+        "BusinessPayment",
+        "10",
+        600000,
+        254700000000,
+        "remarks",
+        "timeout",
+        "result",
+    )
+    assert b2c_route.call_count == 1
+
+
+@respx.mock
+def test_retries_stop_once_circuit_opens():
+    respx.get(AUTH_ENDPOINT).mock(
+        return_value=Response(200, json={"access_token": "token"})
+    )
+    route = respx.post(ACCOUNT_BALANCE_ENDPOINT).mock(return_value=Response(503))
+    api = Balance(
+        app_key="key",
+        app_secret="secret",
+        retry_policy=RetryPolicy(max_retries=5, backoff_factor=0),
+        circuit_breaker=CircuitBreaker(failure_threshold=2),
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        balance(api)
+
+    assert route.call_count == 2
+
+
+@respx.mock
+def test_open_circuit_releases_idempotency_key():
+    respx.get(AUTH_ENDPOINT).mock(
+        return_value=Response(200, json={"access_token": "token"})
+    )
+    breaker = CircuitBreaker(failure_threshold=1)
+    fail(breaker, path=B2C_PAYMENT_PATH)
+    store = MemoryIdempotencyStore()
+    b2c = B2C(
+        app_key="key",
+        app_secret="secret",
+        circuit_breaker=breaker,
+        idempotency_store=store,
+    )
+
+    with pytest.raises(CircuitOpenError):
+        b2c.transact(
+            "ocid",
+            "initiator",
+            "credential",
+            "BusinessPayment",
+            "10",
+            600000,
+            254700000000,
+            "remarks",
+            "timeout",
+            "result",
+        )
+
+    assert store.get("ocid") is None
+
+
+@respx.mock
+def test_async_client_uses_circuit_breaker():
+    respx.get(AUTH_ENDPOINT).mock(
+        return_value=Response(200, json={"access_token": "token"})
+    )
+    route = respx.post(ACCOUNT_BALANCE_ENDPOINT).mock(
+        side_effect=httpx.ConnectTimeout("timed out")
+    )
+    breaker = CircuitBreaker(failure_threshold=1)
+
+    async def run():
+        async with AsyncBalance(
+            app_key="key",
+            app_secret="secret",
+            retry_policy=RetryPolicy(max_retries=0),
+            circuit_breaker=breaker,
+        ) as api:
+            with pytest.raises(ValueError):
+                await balance(api)
+            with pytest.raises(CircuitOpenError):
+                await balance(api)
+
+    asyncio.run(run())
+    assert route.call_count == 1
@@ -0,0 +1,36 @@
+import pytest
+import respx
+from httpx import Response
+
+from mpesa.api.constants import AUTH_ENDPOINT
+from mpesa.api.token_cache import default_token_cache
+
+
+class FakeClock:
+    """Manually advanced clock for expiry, pacing and backoff tests."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Ensures each test authenticates against its own mocked endpoint."""
+    default_token_cache.clear()
+    yield
+    default_token_cache.clear()
+
+
+@pytest.fixture
+def respx_router():
+    """Mocks the Mpesa API with a successful authentication endpoint."""
+    with respx.mock() as respx_mock:
+        respx_mock.get(AUTH_ENDPOINT).mock(
+            return_value=Response(
+                200, json={"access_token": "mock_token", "expires_in": 3599}
+            )
+        )
+        yield respx_mock
@@ -0,0 +1,181 @@
+import asyncio
+
+import pytest
+
+from mpesa.api.aio import AsyncBalance
+from mpesa.api.b2c import B2C
+from mpesa.api.callbacks import B2CResult, BalanceResult, parse_callback
+from mpesa.api.correlator import ResultCorrelator, ResultTimeoutError
+from mpesa.api.simulator import DarajaSimulator
+from mpesa.tests.conftest import FakeClock
+
+CREDENTIALS = {"app_key": "key", "app_secret": "secret"}
+
+
+def result(kind="b2c", ocid="ocid-1", conversation_id="AG_1", code=0):
+    return parse_callback(
+        kind,
+        {
+            "Result": {
+                "ResultType": 0,
+                "ResultCode": code,
+                "ResultDesc": "The service request is processed successfully.",
+                "OriginatorConversationID": ocid,
+                "ConversationID": conversation_id,
+                "TransactionID": "SIM0000001",
+            }
+        },
+    )
+
+
+ACKNOWLEDGEMENT = {"OriginatorConversationID": "ocid-1", "ConversationID": "AG_1"}
+
+
+def test_result_resolves_tracked_request():
+    correlator = ResultCorrelator()
+    future = correlator.track(ACKNOWLEDGEMENT)
+    delivered = result(ocid="unknown")
+
+    assert correlator.deliver(delivered) is True
+    assert future.result(0) is delivered
+    assert len(correlator) == 0
+    assert correlator.deliver(result()) is False
+    assert correlator.deliver(object()) is False
+
+
+def test_result_arriving_before_registration_is_held():
+    correlator = ResultCorrelator()
+    delivered = result()
+
+    assert correlator.deliver(delivered) is False
+    future = correlator.expect("ocid-1")
+
+    assert future.result(0) is delivered
+    # Held under both IDs, but only handed out once.
+    assert not correlator.expect("AG_1").done()
+
+
+def test_alias_adds_ids():
+    correlator = ResultCorrelator()
+    future = correlator.expect("own-ocid")
+
+    correlator.alias("own-ocid", "ocid-1", "AG_1")
+    correlator.deliver(result(ocid="mpesa-ocid", conversation_id="AG_1"))
+
+    assert future.done()
+    with pytest.raises(ValueError, match="No request is waiting under own-ocid"):
+        correlator.alias("own-ocid", "AG_2")
+    with pytest.raises(ValueError, match="OriginatorConversationID"):
+        correlator.expect(None, "")
+
+
+def test_timeout_notification_fails_future():
+    correlator = ResultCorrelator()
+    future = correlator.track(ACKNOWLEDGEMENT)
+    notification = result("timeout", code=1)
+
+    correlator.deliver(notification)
+
+    with pytest.raises(ResultTimeoutError) as error:
+        future.result(0)
+    assert error.value.notification is notification
+
+
+def test_requests_expire_after_ttl():
+    clock = FakeClock()
+    correlator = ResultCorrelator(ttl=10, clock=clock)
+    first = correlator.expect("ocid-1")
+    clock.now = 5
+    second = correlator.expect("ocid-2")
+
+    clock.now = 10
+    assert correlator.expire() == 1
+
+    with pytest.raises(ResultTimeoutError, match="No result arrived for ocid-1"):
+        first.result(0)
+    assert not second.done()
+    assert len(correlator) == 1
+
+
+def test_pending_table_is_bounded():
+    correlator = ResultCorrelator(max_pending=2)
+    futures = [correlator.expect(f"ocid-{n}") for n in range(3)]
+
+    assert len(correlator) == 2
+    assert isinstance(futures[0].exception(0), ResultTimeoutError)
+    assert not futures[1].done() and not futures[2].done()
+
+
+def test_blocking_result_with_simulator():
+    correlator = ResultCorrelator()
+    simulator = DarajaSimulator(
+        callback_handler=lambda url, body: correlator.deliver(
+            parse_callback("b2c", body)
+        ),
+        callback_delay=0.01,
+    )
+    b2c = B2C(transport=simulator.transport(), **CREDENTIALS)
+
+    try:
+        acknowledgement = b2c.transact(
+            "ocid-1",
+            "initiator",
+            "credential",
+            "BusinessPayment",
+            "10",
+            600000,
+            254700000000,
+            "Payout",
+            "https://example.com/timeout",
+            "https://example.com/result",
+        )
+        outcome = correlator.result(acknowledgement, timeout=5)
+    finally:
+        simulator.close()
+
+    assert isinstance(outcome, B2CResult)
+    assert outcome.originator_conversation_id == "ocid-1"
+    assert outcome.transaction_amount == "10"
+
+
+def test_blocking_result_times_out():
+    correlator = ResultCorrelator()
+
+    with pytest.raises(ResultTimeoutError):
+        correlator.result(ACKNOWLEDGEMENT, timeout=0.01)
+    # The request stays registered until its ttl passes.
+    assert len(correlator) == 1
+
+
+def test_await_result_of_async_request():
+    correlator = ResultCorrelator()
+    simulator = DarajaSimulator(
+        callback_handler=lambda url, body: correlator.deliver(
+            parse_callback("balance", body)
+        ),
+    )
+
+    async def run():
+        async with AsyncBalance(
+            transport=simulator.async_transport(), **CREDENTIALS
+        ) as balance:
+            return await correlator.wait(
+                balance.get_balance(
+                    "initiator",
+                    "credential",
+                    "600000",
+                    4,
+                    "Balance",
+                    "https://example.com/timeout",
+                    "https://example.com/result",
+                ),
+                timeout=5,
+            )
+
+    try:
+        outcome = asyncio.run(run())
+    finally:
+        simulator.close()
+
+    assert isinstance(outcome, BalanceResult)
+    assert outcome.ok
@@ -0,0 +1,183 @@
+import base64
+import datetime
+import json
+import time
+
+import pytest
+import respx
+from httpx import Response
+
+from mpesa.api.b2c import B2C
+from mpesa.api.credentials import (
+    SecurityCredentialCache,
+    StkPasswordGenerator,
+    TimestampClock,
+    stk_password_generator,
+)
+from mpesa.api.mpesa_express import MpesaExpress
+from mpesa.tests.conftest import FakeClock
+
+SANDBOX_URL = "https://sandbox.safaricom.co.ke"
+
+
+def test_password_encodes_shortcode_passkey_and_timestamp():
+    clock = FakeClock(1700000000.25)
+    generator = StkPasswordGenerator(174379, "passkey", TimestampClock(clock))
+
+    password, timestamp = generator.generate()
+
+    expected = time.strftime("%Y%m%d%H%M%S", time.localtime(1700000000))
+    assert timestamp == expected
+    assert base64.b64decode(password).decode() == f"174379passkey{expected}"
+
+
+def test_pair_is_cached_within_a_second():
+    clock = FakeClock(1700000000.1)
+    generator = StkPasswordGenerator(174379, "passkey", TimestampClock(clock))
+
+    first = generator.generate()
+    clock.now = 1700000000.9
+    assert generator.generate() == first
+
+    clock.now = 1700000001.0
+    password, timestamp = generator.generate()
+    assert timestamp != first[1]
+    assert base64.b64decode(password).decode().endswith(timestamp)
+
+
+def test_generators_are_shared_per_shortcode_and_passkey():
+    assert stk_password_generator(174379, "a") is stk_password_generator(174379, "a")
+    assert stk_password_generator(174379, "a") is not stk_password_generator(
+        174379, "b"
+    )
+
+
+def test_create_password_returns_text():
+    express = MpesaExpress(app_key="key", app_secret="secret")
+
+    password = express.create_password(174379, "passkey")
+
+    assert not password.startswith("b'")
+    assert base64.b64decode(password).decode().startswith("174379passkey")
+
+
+@respx.mock(assert_all_called=False)
+def test_stk_push_password_matches_timestamp(respx_mock):
+    respx_mock.get(
+        f"{SANDBOX_URL}/oauth/v1/generate?grant_type=client_credentials"
+    ).mock(return_value=Response(200, json={"access_token": "token"}))
+    route = respx_mock.post(f"{SANDBOX_URL}/mpesa/stkpushquery/v1/query").mock(
+        return_value=Response(200, json={"ResultCode": "0"})
+    )
+    express = MpesaExpress(app_key="key", app_secret="secret")
+
+    express.status(174379, "ws_CO_1", "passkey")
+
+    payload = json.loads(route.calls.last.request.content)
+    decoded = base64.b64decode(payload["Password"]).decode()
+    assert decoded == f"174379passkey{payload['Timestamp']}"
+
+
+@pytest.fixture(scope="module")
+def certificate(tmp_path_factory):
+    pytest.importorskip("cryptography")
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name(
+        [x509.NameAttribute(NameOID.COMMON_NAME, "apicrypt.safaricom.co.ke")]
+    )
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(private_key, hashes.SHA256())
+    )
+    directory = tmp_path_factory.mktemp("certificates")
+    pem_path = directory / "sandbox.cer"
+    pem_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    der_path = directory / "sandbox.der"
+    der_path.write_bytes(cert.public_bytes(serialization.Encoding.DER))
+    return private_key, str(pem_path), str(der_path)
+
+
+def decrypt(private_key, credential):
+    from cryptography.hazmat.primitives.asymmetric import padding
+
+    return private_key.decrypt(
+        base64.b64decode(credential), padding.PKCS1v15()
+    ).decode()
+
+
+def test_security_credential_is_encrypted_once(certificate):
+    private_key, pem_path, der_path = certificate
+    cache = SecurityCredentialCache()
+
+    credential = cache.get("sandbox", "Safaricom999!*!", pem_path)
+
+    assert decrypt(private_key, credential) == "Safaricom999!*!"
+    assert cache.get("sandbox", "Safaricom999!*!", pem_path) == credential
+    assert decrypt(private_key, cache.get("sandbox", "other", der_path)) == "other"
+
+
+def test_security_credential_invalidation(certificate):
+    private_key, pem_path, _ = certificate
+    cache = SecurityCredentialCache()
+    first = cache.get("sandbox", "password", pem_path)
+    production = cache.get("production", "password", pem_path)
+
+    cache.invalidate("sandbox", "password")
+
+    assert cache.get("production", "password", pem_path) == production
+    renewed = cache.get("sandbox", "password", pem_path)
+    assert renewed != first
+    assert decrypt(private_key, renewed) == "password"
+
+
+@respx.mock(assert_all_called=False)
+def test_b2c_generates_security_credential(respx_mock, certificate):
+    private_key, pem_path, _ = certificate
+    respx_mock.get(
+        f"{SANDBOX_URL}/oauth/v1/generate?grant_type=client_credentials"
+    ).mock(return_value=Response(200, json={"access_token": "token"}))
+    route = respx_mock.post(f"{SANDBOX_URL}/mpesa/b2c/v3/paymentrequest").mock(
+        return_value=Response(200, json={"ResponseCode": "0"})
+    )
+    b2c = B2C(
+        app_key="key",
+        app_secret="secret",
+        initiator_password="password",
+        certificate_path=pem_path,
+        credential_cache=SecurityCredentialCache(),
+    )
+
+    b2c.transact(
+        "ocid-1",
+        "initiator",
+        None,
+        "BusinessPayment",
+        "10",
+        600123,
+        254700000000,
+        "Payout",
+        "https://example.com/timeout",
+        "https://example.com/result",
+    )
+
+    payload = json.loads(route.calls.last.request.content)
+    assert decrypt(private_key, payload["SecurityCredential"]) == "password"
+
+
+def test_security_credential_requires_configuration():
+    b2c = B2C(app_key="key", app_secret="secret")
+
+    with pytest.raises(ValueError, match="initiator_password and certificate_path"):
+        b2c.security_credential()
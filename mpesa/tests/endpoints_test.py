@@ -0,0 +1,98 @@
+import json
+
+import pytest
+import respx
+from httpx import Response
+
+from mpesa.api import serialization
+from mpesa.api.balance import Balance
+from mpesa.api.constants import ACCOUNT_BALANCE_ENDPOINT, AUTH_ENDPOINT
+from mpesa.api.endpoints import ACCOUNT_BALANCE, REVERSAL, Endpoint
+from mpesa.api.retry import RetryPolicy
+
+
+def test_payload_fills_variable_fields_in_order():
+    payload = ACCOUNT_BALANCE.payload(
+        "initiator", "credential", "600000", 4, "remarks", "timeout", "result"
+    )
+
+    assert list(payload) == [
+        "Initiator",
+        "SecurityCredential",
+        "CommandID",
+        "PartyA",
+        "IdentifierType",
+        "Remarks",
+        "QueueTimeOutURL",
+        "ResultURL",
+    ]
+    assert payload["CommandID"] == "AccountBalance"
+    assert payload["PartyA"] == "600000"
+    assert ACCOUNT_BALANCE.fields[:2] == ("Initiator", "SecurityCredential")
+
+
+def test_payload_returns_a_new_dict():
+    first = REVERSAL.payload(*range(len(REVERSAL.fields)))
+    first["Amount"] = "changed"
+
+    second = REVERSAL.payload(*range(len(REVERSAL.fields)))
+
+    assert second["Amount"] == 3
+    assert second["CommandID"] == "TransactionReversal"
+
+
+def test_payload_rejects_wrong_number_of_values():
+    with pytest.raises(ValueError, match="balance query takes 7 fields, got 1"):
+        ACCOUNT_BALANCE.payload("initiator")
+
+
+def test_constants_must_be_fields():
+    with pytest.raises(ValueError, match="CommandID"):
+        Endpoint("/path", "operation", ("Amount",), {"CommandID": "Pay"})
+
+
+def test_headers_are_reused_until_the_token_changes():
+    balance = Balance(app_key="key", app_secret="secret")
+
+    headers = balance._headers("first")
+
+    assert balance._headers("first") is headers
+    assert balance._headers("second") == {
+        "Authorization": "Bearer second",
+        "Content-Type": "application/json",
+    }
+
+
+def test_urls_are_resolved_per_instance():
+    sandbox = Balance(app_key="key", app_secret="secret")
+    production = Balance(env="production", app_key="key", app_secret="secret")
+
+    assert sandbox._url(ACCOUNT_BALANCE.path) == ACCOUNT_BALANCE_ENDPOINT
+    assert production._url(ACCOUNT_BALANCE.path) == (
+        "https://safaricom.co.ke/mpesa/accountbalance/v1/query"
+    )
+
+
+@respx.mock
+def test_body_is_serialized_once_per_request():
+    respx.get(AUTH_ENDPOINT).mock(
+        return_value=Response(200, json={"access_token": "token"})
+    )
+    route = respx.post(ACCOUNT_BALANCE_ENDPOINT).mock(
+        side_effect=[Response(503), Response(200, json={"ResponseCode": "0"})]
+    )
+    balance = Balance(
+        app_key="key",
+        app_secret="secret",
+        retry_policy=RetryPolicy(max_retries=1, backoff_factor=0),
+    )
+
+    balance.get_balance(
+        "initiator", "credential", "600000", 4, "remarks", "timeout", "result"
+    )
+
+    first, second = (call.request for call in route.calls)
+    assert first.content == second.content
+    assert first.headers["Content-Type"] == "application/json"
+    assert json.loads(first.content)["CommandID"] == "AccountBalance"
+    assert first.content == serialization.dumps(json.loads(first.content))
@@ -0,0 +1,285 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from mpesa.api.aio import AsyncB2C
+from mpesa.api.b2c import B2C
+from mpesa.api.idempotency import (
+    PENDING,
+    SUCCEEDED,
+    DuplicateRequestError,
+    IdempotencyStore,
+    MemoryIdempotencyStore,
+    SQLiteIdempotencyStore,
+    fingerprint,
+)
+from mpesa.api.retry import RetryPolicy
+from mpesa.api.reversal import Reversal
+
+AUTH_URL = (
+    "https://sandbox.safaricom.co.ke/oauth/v1/generate?grant_type=client_credentials"
+)
+B2C_URL = "https://sandbox.safaricom.co.ke/mpesa/b2c/v3/paymentrequest"
+REVERSAL_URL = "https://sandbox.safaricom.co.ke/mpesa/reversal/v1/request"
+ACCEPTED = {"ConversationID": "AG_1", "ResponseCode": "0"}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryIdempotencyStore()
+    else:
+        store = SQLiteIdempotencyStore(str(tmp_path / "idempotency.db"))
+        yield store
+        store.close()
+
+
+@pytest.fixture
+def mock_api():
+    with respx.mock(assert_all_called=False) as respx_mock:
+        respx_mock.get(AUTH_URL).mock(
+            return_value=Response(
+                200, json={"access_token": "token", "expires_in": 3599}
+            )
+        )
+        yield respx_mock
+
+
+def pay(b2c, amount="100", originator_conversation_id="ocid-1"):
+    return b2c.transact(
+        originator_conversation_id=originator_conversation_id,
+        initiator_name="initiator",
+        security_credential="credential",
+        command_id="BusinessPayment",
+        amount=amount,
+        party_a=600123,
+        party_b=254700000000,
+        remarks="Payout",
+        queue_timeout_url="https://example.com/timeout",
+        result_url="https://example.com/result",
+    )
+
+
+def make_b2c(store, cls=B2C):
+    return cls(
+        app_key="key",
+        app_secret="secret",
+        idempotency_store=store,
+        retry_policy=RetryPolicy(max_retries=0),
+    )
+
+
+def test_replay_returns_cached_response(mock_api, store):
+    route = mock_api.post(B2C_URL).mock(return_value=Response(200, json=ACCEPTED))
+    b2c = make_b2c(store)
+
+    assert pay(b2c) == ACCEPTED
+    assert pay(b2c) == ACCEPTED
+    assert route.call_count == 1
+    assert store.get("ocid-1").state == SUCCEEDED
+
+
+def test_different_payload_is_rejected(mock_api, store):
+    mock_api.post(B2C_URL).mock(return_value=Response(200, json=ACCEPTED))
+    b2c = make_b2c(store)
+    pay(b2c)
+
+    with pytest.raises(DuplicateRequestError, match="different request"):
+        pay(b2c, amount="200")
+
+
+def test_timeout_keeps_request_pending(mock_api, store):
+    route = mock_api.post(B2C_URL).mock(side_effect=httpx.ReadTimeout("timed out"))
+    b2c = make_b2c(store)
+
+    with pytest.raises(ValueError, match="B2C transaction"):
+        pay(b2c)
+    with pytest.raises(DuplicateRequestError, match="already pending"):
+        pay(b2c)
+
+    assert route.call_count == 1
+    assert store.get("ocid-1").state == PENDING
+
+
+def test_definite_failures_release_the_key(mock_api, store):
+    route = mock_api.post(B2C_URL).mock(
+        side_effect=[
+            httpx.ConnectError("refused"),
+            Response(400, json={"errorCode": "400.002.02"}),
+            Response(200, json=ACCEPTED),
+        ]
+    )
+    b2c = make_b2c(store)
+
+    with pytest.raises(ValueError):
+        pay(b2c)
+    with pytest.raises(httpx.HTTPStatusError):
+        pay(b2c)
+    assert store.get("ocid-1") is None
+
+    assert pay(b2c) == ACCEPTED
+    assert route.call_count == 3
+
+
+def test_gateway_timeout_keeps_request_pending(mock_api, store):
+    mock_api.post(B2C_URL).mock(return_value=Response(504))
+    b2c = make_b2c(store)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        pay(b2c)
+
+    assert store.get("ocid-1").state == PENDING
+
+
+def test_gateway_timeout_is_not_retried(mock_api, store):
+    route = mock_api.post(B2C_URL).mock(
+        side_effect=[Response(504), Response(200, json=ACCEPTED)]
+    )
+    b2c = B2C(
+        app_key="key",
+        app_secret="secret",
+        idempotency_store=store,
+        retry_policy=RetryPolicy(max_retries=3, backoff_factor=0),
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        pay(b2c)
+
+    assert route.call_count == 1
+    assert store.get("ocid-1").state == PENDING
+
+
+def test_async_gateway_timeout_is_not_retried(mock_api, store):
+    route = mock_api.post(B2C_URL).mock(
+        side_effect=[Response(504), Response(200, json=ACCEPTED)]
+    )
+
+    async def run():
+        async with AsyncB2C(
+            app_key="key",
+            app_secret="secret",
+            idempotency_store=store,
+            retry_policy=RetryPolicy(max_retries=3, backoff_factor=0),
+        ) as b2c:
+            await pay(b2c)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(run())
+
+    assert route.call_count == 1
+    assert store.get("ocid-1").state == PENDING
+
+
+def test_reversal_keyed_on_transaction_id(mock_api, store):
+    route = mock_api.post(REVERSAL_URL).mock(return_value=Response(200, json=ACCEPTED))
+    reversal = Reversal(app_key="key", app_secret="secret", idempotency_store=store)
+
+    for _ in range(2):
+        reversal.reverse(
+            receiver=600123,
+            initiator="initiator",
+            amount="100",
+            security_credential="credential",
+            transaction_id="NLJ41HAY6Q",
+            timeout_url="https://example.com/timeout",
+            result_url="https://example.com/result",
+            occasion=None,
+            remarks="Refund",
+        )
+
+    assert route.call_count == 1
+    assert store.get("NLJ41HAY6Q").response == ACCEPTED
+
+
+def test_async_replay(mock_api, store):
+    route = mock_api.post(B2C_URL).mock(return_value=Response(200, json=ACCEPTED))
+
+    async def run():
+        async with make_b2c(store, AsyncB2C) as b2c:
+            return await pay(b2c), await pay(b2c)
+
+    assert asyncio.run(run()) == (ACCEPTED, ACCEPTED)
+    assert route.call_count == 1
+
+
+def test_async_store_calls_run_off_the_event_loop(mock_api):
+    mock_api.post(B2C_URL).mock(return_value=Response(200, json=ACCEPTED))
+    threads = []
+
+    class RecordingStore(MemoryIdempotencyStore):
+        def claim(self, key, fingerprint):
+            threads.append(threading.get_ident())
+            return super().claim(key, fingerprint)
+
+        def complete(self, key, response):
+            threads.append(threading.get_ident())
+            super().complete(key, response)
+
+    store = RecordingStore()
+
+    async def run():
+        async with make_b2c(store, AsyncB2C) as b2c:
+            return await pay(b2c)
+
+    assert asyncio.run(run()) == ACCEPTED
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+    assert store.get("ocid-1").state == SUCCEEDED
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemoryIdempotencyStore(max_entries=2)
+    for key in ("a", "b"):
+        store.claim(key, "x")
+        store.complete(key, ACCEPTED)
+    store.claim("a", "x")
+    store.claim("c", "x")
+
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert len(store) == 2
+
+
+def test_memory_store_keeps_pending_records():
+    store = MemoryIdempotencyStore(max_entries=2)
+    store.claim("a", "x")
+    store.claim("b", "x")
+    store.complete("b", ACCEPTED)
+    store.claim("c", "x")
+    store.claim("d", "x")
+
+    assert store.get("a").state == PENDING
+    assert store.get("b") is None
+    assert store.get("c").state == PENDING
+    assert len(store) == 3
+
+
+def test_store_interface_is_abstract():
+    with pytest.raises(TypeError):
+        IdempotencyStore()
+
+
+def test_sqlite_store_survives_reopening(tmp_path):
+    path = str(tmp_path / "idempotency.db")
+    store = SQLiteIdempotencyStore(path)
+    store.claim("ocid-1", "digest")
+    store.complete("ocid-1", ACCEPTED)
+    store.close()
+
+    reopened = SQLiteIdempotencyStore(path)
+    record = reopened.claim("ocid-1", "digest")
+    reopened.close()
+
+    assert record.state == SUCCEEDED
+    assert record.response == ACCEPTED
+
+
+def test_fingerprint_ignores_security_credential():
+    payload = {"OriginatorConversationID": "ocid-1", "SecurityCredential": "a"}
+
+    assert fingerprint(payload) == fingerprint({**payload, "SecurityCredential": "b"})
+    assert fingerprint(payload) != fingerprint({**payload, "Amount": "1"})
@@ -0,0 +1,195 @@
+import asyncio
+
+import httpx
+import pytest
+
+from mpesa.api.aio import AsyncB2C
+from mpesa.api.b2c import B2C
+from mpesa.api.idempotency import MemoryIdempotencyStore
+from mpesa.api.instrumentation import (
+    Histogram,
+    Instrumentation,
+    MetricsCollector,
+    OpenTelemetryInstrumentation,
+    PhaseTimer,
+    render_prometheus,
+)
+from mpesa.api.retry import RetryPolicy
+from mpesa.api.simulator import DarajaSimulator
+
+B2C_PATH = "/mpesa/b2c/v3/paymentrequest"
+CREDENTIALS = {"app_key": "key", "app_secret": "secret"}
+
+
+class RecordingInstrumentation(Instrumentation):
+    def __init__(self):
+        self.events = []
+
+    def request_started(self, path, operation):
+        self.events.append(("started", path, operation))
+
+    def auth_acquired(self, path, seconds):
+        self.events.append(("auth", path))
+
+    def attempt_finished(self, path, attempt, status_code, error, seconds, phases):
+        self.events.append(("attempt", attempt, status_code))
+
+    def retry_scheduled(self, path, attempt, delay):
+        self.events.append(("retry", attempt))
+
+    def request_finished(self, path, operation, status_code, error, seconds):
+        self.events.append(("finished", status_code, type(error).__name__))
+
+
+def pay(b2c, originator_conversation_id="ocid-1"):
+    return b2c.transact(
+        originator_conversation_id,
+        "initiator",
+        "credential",
+        "BusinessPayment",
+        "100",
+        600123,
+        254700000000,
+        "Payout",
+        "https://example.com/timeout",
+        "https://example.com/result",
+    )
+
+
+def test_hooks_report_retries_and_final_status():
+    simulator = DarajaSimulator(error_rate=1.0)
+    instrumentation = RecordingInstrumentation()
+    b2c = B2C(
+        transport=simulator.transport(),
+        instrumentation=instrumentation,
+        retry_policy=RetryPolicy(max_retries=1, backoff_factor=0),
+        **CREDENTIALS,
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        pay(b2c)
+
+    assert instrumentation.events == [
+        ("started", B2C_PATH, "B2C transaction"),
+        ("auth", B2C_PATH),
+        ("attempt", 0, 503),
+        ("retry", 0),
+        ("attempt", 1, 503),
+        ("finished", 503, "HTTPStatusError"),
+    ]
+
+
+def test_collector_aggregates_per_endpoint():
+    simulator = DarajaSimulator()
+    collector = MetricsCollector()
+    b2c = B2C(
+        transport=simulator.transport(),
+        instrumentation=collector,
+        idempotency_store=MemoryIdempotencyStore(),
+        **CREDENTIALS,
+    )
+
+    pay(b2c)
+    pay(b2c)
+
+    metrics = collector.snapshot()[B2C_PATH]
+    assert metrics["requests"] == 2
+    assert metrics["attempts"] == 1
+    assert metrics["statuses"] == {"200": 1, "replayed": 1}
+    assert metrics["latency"]["count"] == 2
+    assert metrics["auth"]["count"] == 2
+
+
+def test_phase_timings_over_http():
+    collector = MetricsCollector()
+    with DarajaSimulator() as simulator, simulator.serve() as server:
+        with B2C(
+            sandbox_url=server.url, instrumentation=collector, **CREDENTIALS
+        ) as b2c:
+            pay(b2c)
+
+    # The connection was opened by the authentication request and is reused.
+    phases = collector.endpoint(B2C_PATH).phases
+    assert set(phases) == {"send", "wait", "receive"}
+    assert phases["wait"].count == 1
+
+
+def test_async_hooks():
+    simulator = DarajaSimulator()
+    collector = MetricsCollector()
+
+    async def run():
+        async with AsyncB2C(
+            transport=simulator.async_transport(),
+            instrumentation=collector,
+            **CREDENTIALS,
+        ) as b2c:
+            await pay(b2c)
+
+    asyncio.run(run())
+
+    assert collector.endpoint(B2C_PATH).statuses == {"200": 1}
+
+
+def test_phase_timer_accumulates_phases():
+    timer = PhaseTimer()
+    timer("http11.send_request_headers.started", {})
+    timer("http11.send_request_headers.complete", {})
+    timer("http11.send_request_body.started", {})
+    timer("http11.send_request_body.complete", {})
+    timer("http11.response_closed.started", {})
+
+    assert list(timer.phases) == ["send"]
+
+
+def test_histogram_quantile():
+    histogram = Histogram(buckets=(0.1, 0.5, 1.0))
+    for value in (0.05, 0.2, 0.3, 0.7, 2.0):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 0.5
+    assert histogram.quantile(0.99) == float("inf")
+    assert histogram.snapshot()["cumulative_counts"] == [1, 3, 4, 5]
+
+
+def test_render_prometheus():
+    collector = MetricsCollector(buckets=(0.1, 1.0))
+    collector.request_finished(B2C_PATH, "B2C transaction", 200, None, 0.05)
+
+    text = render_prometheus(collector)
+
+    assert f'mpesa_requests_total{{endpoint="{B2C_PATH}"}} 1' in text
+    assert f'mpesa_responses_total{{endpoint="{B2C_PATH}",status="200"}} 1' in text
+    assert (
+        f'mpesa_request_duration_seconds_bucket{{endpoint="{B2C_PATH}",le="0.1"}} 1'
+        in text
+    )
+    assert "# TYPE mpesa_request_duration_seconds histogram" in text
+
+
+def test_opentelemetry_with_meter():
+    class Instrument:
+        def __init__(self):
+            self.values = []
+
+        def add(self, value, attributes):
+            self.values.append((value, attributes))
+
+        record = add
+
+    class Meter:
+        def __init__(self):
+            self.instruments = {}
+
+        def create_counter(self, name, **kwargs):
+            return self.instruments.setdefault(name, Instrument())
+
+        create_histogram = create_counter
+
+    meter = Meter()
+    instrumentation = OpenTelemetryInstrumentation(meter)
+    instrumentation.request_finished(B2C_PATH, "B2C transaction", 200, None, 0.05)
+
+    assert meter.instruments["mpesa.requests"].values == [
+        (1, {"endpoint": B2C_PATH, "status": "200"})
+    ]
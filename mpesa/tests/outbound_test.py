@@ -0,0 +1,202 @@
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from httpx import Response
+
+from mpesa.api.b2c import B2C
+from mpesa.api.idempotency import MemoryIdempotencyStore
+from mpesa.api.outbound import OutboundQueue
+
+B2C_URL = "https://sandbox.safaricom.co.ke/mpesa/b2c/v3/paymentrequest"
+
+
+def payout(number):
+    return {
+        "originator_conversation_id": f"ocid-{number}",
+        "initiator_name": "test_initiator",
+        "security_credential": "test_credential",
+        "command_id": "BusinessPayment",
+        "amount": "100",
+        "party_a": 600123,
+        "party_b": 254700000000 + number,
+        "remarks": "Payout",
+        "queue_timeout_url": "https://example.com/timeout",
+        "result_url": "https://example.com/result",
+    }
+
+
+@pytest.fixture
+def b2c_route(respx_router):
+    return respx_router.post(B2C_URL).mock(
+        return_value=Response(200, json={"ConversationID": "AG_1", "ResponseCode": "0"})
+    )
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return str(tmp_path / "outbound.db")
+
+
+def rows(path):
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT id, state FROM outbound").fetchall()
+
+
+def test_enqueued_requests_are_sent_and_removed(journal, b2c_route):
+    results = []
+    b2c = B2C(app_key="key", app_secret="secret")
+
+    with OutboundQueue(journal, {"b2c": b2c}, handler=results.append) as outbound:
+        ids = [outbound.enqueue("b2c", "transact", payout(n)) for n in range(20)]
+        assert outbound.join(timeout=10)
+        assert outbound.pending == 0
+
+    assert b2c_route.call_count == 20
+    assert sorted(result.entry.id for result in results) == sorted(ids)
+    assert all(result.ok for result in results)
+    assert rows(journal) == []
+
+
+def test_unfinished_entries_are_replayed(journal, tmp_path, b2c_route):
+    release = threading.Event()
+
+    class StuckB2C:
+        def transact(self, **kwargs):
+            release.wait()
+
+    crashed = str(tmp_path / "crashed.db")
+    outbound = OutboundQueue(journal, {"b2c": StuckB2C()}, concurrency=1)
+    outbound.start()
+    ids = [outbound.enqueue("b2c", "transact", payout(n)) for n in range(3)]
+    # A copy of the journal taken now is what a crashed pod leaves behind.
+    with sqlite3.connect(journal) as source, sqlite3.connect(crashed) as target:
+        source.backup(target)
+    release.set()
+    outbound.close()
+
+    results = []
+    b2c = B2C(app_key="key", app_secret="secret")
+    with OutboundQueue(crashed, {"b2c": b2c}, handler=results.append) as replay:
+        assert replay.join(timeout=10)
+
+    assert sorted(result.entry.id for result in results) == sorted(ids)
+    assert {result.entry.kwargs["party_b"] for result in results} == {
+        payout(n)["party_b"] for n in range(3)
+    }
+    assert b2c_route.call_count == 3
+    assert rows(crashed) == []
+
+
+@pytest.mark.parametrize("options", [{"drain": False}, {"timeout": 0.1}])
+def test_close_leaves_unsent_entries_pending(journal, options):
+    sending = threading.Event()
+    sent = []
+
+    class SlowB2C:
+        def transact(self, **kwargs):
+            sent.append(kwargs["originator_conversation_id"])
+            sending.set()
+            time.sleep(0.3)
+
+    outbound = OutboundQueue(journal, {"b2c": SlowB2C()}, concurrency=1)
+    outbound.start()
+    ids = [outbound.enqueue("b2c", "transact", payout(n)) for n in range(5)]
+    assert sending.wait(timeout=5)
+    outbound.close(**options)
+
+    assert sent == ["ocid-0"]
+    assert sorted(rows(journal)) == sorted((id, "pending") for id in ids[1:])
+
+
+def test_handler_errors_are_logged(journal, b2c_route, caplog):
+    def handler(result):
+        raise RuntimeError("handler failed")
+
+    b2c = B2C(app_key="key", app_secret="secret")
+    with caplog.at_level(logging.ERROR, logger="mpesa.api.outbound"):
+        with OutboundQueue(journal, {"b2c": b2c}, handler=handler) as outbound:
+            entry_id = outbound.enqueue("b2c", "transact", payout(0))
+            assert outbound.join(timeout=10)
+
+    assert rows(journal) == []
+    assert f"handler failed for entry {entry_id}" in caplog.text
+    assert "RuntimeError: handler failed" in caplog.text
+
+
+def test_failed_entries_are_kept_until_requeued(journal, respx_router):
+    route = respx_router.post(B2C_URL).mock(return_value=Response(400, json={}))
+    b2c = B2C(app_key="key", app_secret="secret")
+
+    with OutboundQueue(journal, {"b2c": b2c}) as outbound:
+        entry_id = outbound.enqueue("b2c", "transact", payout(1))
+        assert outbound.join(timeout=10)
+
+        [failed] = outbound.failed()
+        assert failed.id == entry_id
+        assert failed.kwargs == payout(1)
+        assert "400" in failed.error
+
+        route.mock(return_value=Response(200, json={"ResponseCode": "0"}))
+        assert outbound.requeue() == 1
+        assert outbound.join(timeout=10)
+        assert outbound.failed() == []
+
+    assert route.call_count == 2
+    assert rows(journal) == []
+
+
+def test_replayed_payout_is_not_paid_twice(journal, b2c_route):
+    b2c = B2C(
+        app_key="key", app_secret="secret", idempotency_store=MemoryIdempotencyStore()
+    )
+    # Sent before the pod crashed, but not yet removed from the journal.
+    sent = b2c.transact(**payout(1))
+    results = []
+
+    with OutboundQueue(journal, {"b2c": b2c}, handler=results.append) as outbound:
+        outbound.enqueue("b2c", "transact", payout(1))
+        assert outbound.join(timeout=10)
+
+    assert results[0].response == sent
+    assert b2c_route.call_count == 1
+
+
+def test_concurrent_enqueues_share_commits(journal, b2c_route):
+    results = []
+    b2c = B2C(app_key="key", app_secret="secret")
+
+    with OutboundQueue(
+        journal, {"b2c": b2c}, concurrency=8, handler=results.append
+    ) as outbound:
+        with ThreadPoolExecutor(8) as executor:
+            list(
+                executor.map(
+                    lambda n: outbound.enqueue("b2c", "transact", payout(n)), range(400)
+                )
+            )
+        for n in range(400, 800):
+            outbound.enqueue("b2c", "transact", payout(n), wait=False)
+        outbound.flush()
+        assert outbound.join(timeout=30)
+
+    assert len(results) == 800
+    assert b2c_route.call_count == 800
+
+
+def test_enqueue_validates_requests(journal):
+    outbound = OutboundQueue(journal, {"b2c": B2C(app_key="key", app_secret="secret")})
+
+    with pytest.raises(ValueError, match="not running"):
+        outbound.enqueue("b2c", "transact", payout(1))
+    outbound.start()
+    with pytest.raises(ValueError, match="Unknown API c2b"):
+        outbound.enqueue("c2b", "register_url", {})
+    with pytest.raises(ValueError, match="B2C has no method _post"):
+        outbound.enqueue("b2c", "_post", {})
+    outbound.close()
+    with pytest.raises(ValueError, match="not running"):
+        outbound.enqueue("b2c", "transact", payout(1))
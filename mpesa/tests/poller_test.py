@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import threading
+
+import httpx
+import pytest
+
+from mpesa.api.circuit_breaker import CLOSED, CircuitBreaker
+from mpesa.api.constants import STK_QUERY_PATH
+from mpesa.api.mpesa_express import MpesaExpress
+from mpesa.api.poller import StkPushPoller
+from mpesa.api.responses import response_data
+from mpesa.api.simulator import DarajaSimulator
+
+PENDING = httpx.Response(
+    500,
+    json={
+        "errorCode": "500.001.1001",
+        "errorMessage": "The transaction is being processed",
+    },
+    request=httpx.Request(
+        "POST", "https://sandbox.safaricom.co.ke/mpesa/stkpushquery/v1/query"
+    ),
+)
+
+
+def pending_error():
+    return httpx.HTTPStatusError("pending", request=PENDING.request, response=PENDING)
+
+
+class FakeExpress:
+    """Stands in for MpesaExpress, replaying scripted status results per push."""
+
+    def __init__(self, scripts):
+        self.scripts = {key: list(value) for key, value in scripts.items()}
+        self.calls = []
+        self.lock = threading.Lock()
+        self.concurrent = {}
+        self.max_concurrent = 0
+
+    def status(self, short_code, checkout_request_id, pass_key):
+        with self.lock:
+            self.calls.append(checkout_request_id)
+            self.concurrent[checkout_request_id] = (
+                self.concurrent.get(checkout_request_id, 0) + 1
+            )
+            self.max_concurrent = max(
+                self.max_concurrent, self.concurrent[checkout_request_id]
+            )
+            script = self.scripts[checkout_request_id]
+            result = script.pop(0) if len(script) > 1 else script[0]
+        try:
+            if isinstance(result, BaseException):
+                raise result
+            return result
+        finally:
+            with self.lock:
+                self.concurrent[checkout_request_id] -= 1
+
+
+def stk_push(express):
+    return response_data(
+        express.stk_push(
+            174379,
+            "passkey",
+            "CustomerPayBillOnline",
+            1,
+            254708374149,
+            254708374149,
+            "https://example.com/stk",
+            "Payment",
+            "ref",
+        )
+    )
+
+
+def make_poller(express, **kwargs):
+    options = dict(initial_delay=0.01, backoff=1.5, max_interval=0.05, timeout=2.0)
+    options.update(kwargs)
+    return StkPushPoller(express, **options)
+
+
+def test_resolves_on_terminal_result_code():
+    express = FakeExpress(
+        {
+            "ws_1": [
+                pending_error(),
+                pending_error(),
+                {"ResultCode": "0", "ResultDesc": "Processed successfully"},
+            ]
+        }
+    )
+
+    with make_poller(express) as poller:
+        outcome = poller.track(600000, "pass_key", "ws_1").result(timeout=2)
+
+    assert outcome.ok
+    assert outcome.result_code == "0"
+    assert outcome.result_desc == "Processed successfully"
+    assert express.calls == ["ws_1"] * 3
+
+
+def test_cancelled_push_is_final():
+    express = FakeExpress({"ws_1": [{"ResultCode": 1032, "ResultDesc": "Cancelled"}]})
+
+    with make_poller(express) as poller:
+        outcome = poller.track(600000, "pass_key", "ws_1").result(timeout=2)
+
+    assert not outcome.ok
+    assert outcome.result_code == "1032"
+
+
+def test_duplicate_tracking_shares_future():
+    express = FakeExpress({"ws_1": [pending_error(), {"ResultCode": "0"}]})
+    outcomes = []
+
+    with make_poller(express) as poller:
+        first = poller.track(600000, "pass_key", "ws_1")
+        second = poller.track(600000, "pass_key", "ws_1", callback=outcomes.append)
+        first.result(timeout=2)
+
+    assert first is second
+    assert len(outcomes) == 1
+    assert express.max_concurrent == 1
+
+
+def test_timeout_reported_as_error():
+    express = FakeExpress({"ws_1": [pending_error()]})
+
+    with make_poller(express, timeout=0.1) as poller:
+        outcome = poller.track(600000, "pass_key", "ws_1").result(timeout=2)
+
+    assert isinstance(outcome.error, TimeoutError)
+    assert outcome.result_code is None
+
+
+def test_transport_errors_keep_polling():
+    transport_error = ValueError("An error occurred during the status query.")
+    transport_error.__cause__ = httpx.ConnectError("refused")
+    express = FakeExpress({"ws_1": [transport_error, {"ResultCode": "0"}]})
+
+    with make_poller(express) as poller:
+        outcome = poller.track(600000, "pass_key", "ws_1").result(timeout=2)
+
+    assert outcome.ok
+
+
+def test_unexpected_http_error_is_final():
+    response = httpx.Response(
+        400, json={"errorCode": "400.002.02"}, request=PENDING.request
+    )
+    error = httpx.HTTPStatusError(
+        "bad request", request=response.request, response=response
+    )
+    express = FakeExpress({"ws_1": [error]})
+
+    with make_poller(express) as poller:
+        outcome = poller.track(600000, "pass_key", "ws_1").result(timeout=2)
+
+    assert outcome.error is error
+
+
+def test_unexpected_exception_is_final():
+    express = FakeExpress({"ws_1": [RuntimeError("boom")]})
+
+    with make_poller(express) as poller:
+        outcome = poller.track(600000, "pass_key", "ws_1").result(timeout=2)
+
+    assert isinstance(outcome.error, RuntimeError)
+    assert poller.pending == 0
+
+
+def test_tracks_many_pushes_and_iterates_outcomes():
+    ids = [f"ws_{i}" for i in range(200)]
+    express = FakeExpress({key: [pending_error(), {"ResultCode": "0"}] for key in ids})
+
+    async def run(poller):
+        for key in ids:
+            poller.track(600000, "pass_key", key)
+        return [outcome.checkout_request_id async for outcome in poller.outcomes()]
+
+    with make_poller(express, workers=16) as poller:
+        received = asyncio.run(run(poller))
+        assert poller.pending == 0
+
+    assert sorted(received) == sorted(ids)
+
+
+def test_stop_skips_callbacks_of_cancelled_pushes(caplog):
+    express = FakeExpress({"ws_1": [pending_error()]})
+    outcomes = []
+
+    with caplog.at_level(logging.ERROR):
+        poller = make_poller(express)
+        future = poller.track(600000, "pass_key", "ws_1", callback=outcomes.append)
+        poller.stop()
+
+    assert future.cancelled()
+    assert outcomes == []
+    assert caplog.records == []
+
+
+def test_track_after_stop_fails():
+    poller = make_poller(FakeExpress({}))
+    poller.stop()
+
+    with pytest.raises(RuntimeError, match="The poller has been stopped"):
+        poller.track(600000, "pass_key", "ws_1")
+
+
+def test_pending_queries_do_not_open_the_circuit():
+    breaker = CircuitBreaker()
+    simulator = DarajaSimulator(stk_completion_delay=1.5)
+    express = MpesaExpress(
+        app_key="key",
+        app_secret="secret",
+        transport=simulator.transport(),
+        circuit_breaker=breaker,
+    )
+    pushes = [stk_push(express) for _ in range(6)]
+
+    with make_poller(express, max_interval=0.2, timeout=5.0) as poller:
+        futures = [
+            poller.track(174379, "passkey", push["CheckoutRequestID"])
+            for push in pushes
+        ]
+        outcomes = [future.result(timeout=10) for future in futures]
+
+    assert all(outcome.ok for outcome in outcomes)
+    assert breaker.state("sandbox", STK_QUERY_PATH) == CLOSED
+
+
+@pytest.mark.parametrize("mode", ["json", "model", "raw"])
+def test_outcomes_in_every_response_mode(mode):
+    simulator = DarajaSimulator(stk_completion_delay=0.05)
+    express = MpesaExpress(
+        app_key="key",
+        app_secret="secret",
+        transport=simulator.transport(),
+        response_mode=mode,
+    )
+    push = stk_push(express)
+
+    with make_poller(express) as poller:
+        outcome = poller.track(174379, "passkey", push["CheckoutRequestID"]).result(
+            timeout=2
+        )
+
+    assert outcome.ok
+    assert outcome.result_code == "0"
+    assert outcome.result_desc
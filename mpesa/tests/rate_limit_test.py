@@ -0,0 +1,119 @@
+import asyncio
+import threading
+
+import pytest
+import respx
+from httpx import Response
+
+from mpesa.api.c2b import C2B
+from mpesa.api.constants import (
+    AUTH_ENDPOINT,
+    B2C_PAYMENT_PATH,
+    C2B_SIMULATE_PATH,
+    STK_PUSH_PATH,
+)
+from mpesa.api.rate_limit import RateLimiter, TokenBucket
+from mpesa.tests.conftest import FakeClock
+
+
+def test_bucket_allows_burst_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+    # Reservations queue behind each other
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_bucket_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=1, clock=clock)
+
+    assert bucket.reserve() == 0.0
+    clock.now = 0.1
+    assert bucket.reserve() == 0.0
+
+
+def test_bucket_rejects_invalid_rate():
+    with pytest.raises(ValueError, match="rate must be greater than zero"):
+        TokenBucket(rate=0)
+
+
+def test_bucket_shared_across_threads():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=100, capacity=1, clock=clock)
+    delays = []
+    lock = threading.Lock()
+
+    def reserve():
+        delay = bucket.reserve()
+        with lock:
+            delays.append(delay)
+
+    threads = [threading.Thread(target=reserve) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(delays) == pytest.approx([i / 100 for i in range(10)])
+
+
+def test_limiter_buckets_per_endpoint():
+    limiter = RateLimiter({STK_PUSH_PATH: 5, B2C_PAYMENT_PATH: 2})
+
+    assert limiter.bucket(STK_PUSH_PATH).rate == 5
+    assert limiter.bucket(B2C_PAYMENT_PATH).rate == 2
+    assert limiter.bucket(STK_PUSH_PATH) is limiter.bucket(STK_PUSH_PATH)
+    assert limiter.bucket(C2B_SIMULATE_PATH) is None
+
+
+def test_limiter_default_rate():
+    limiter = RateLimiter(default_rate=3, burst=1)
+
+    assert limiter.bucket(C2B_SIMULATE_PATH).rate == 3
+    assert limiter.bucket(C2B_SIMULATE_PATH).capacity == 1
+
+
+def test_acquire_async_waits_for_token():
+    limiter = RateLimiter({STK_PUSH_PATH: 50}, burst=1)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(*(limiter.acquire_async(STK_PUSH_PATH) for _ in range(3)))
+        return loop.time() - start
+
+    assert asyncio.run(run()) >= 0.035
+
+
+class RecordingLimiter(RateLimiter):
+    def __init__(self):
+        super().__init__()
+        self.paths = []
+
+    def acquire(self, path):
+        self.paths.append(path)
+
+
+@respx.mock
+def test_requests_pass_through_limiter():
+    respx.get(AUTH_ENDPOINT).mock(
+        return_value=Response(200, json={"access_token": "mock_token"})
+    )
+    respx.post(f"https://sandbox.safaricom.co.ke{C2B_SIMULATE_PATH}").mock(
+        return_value=Response(200, json={"ResponseCode": "0"})
+    )
+    limiter = RecordingLimiter()
+    c2b = C2B(app_key="test_key", app_secret="test_secret", rate_limiter=limiter)
+
+    c2b.simulate(
+        shortcode=600000,
+        command_id="CustomerPayBillOnline",
+        amount=10,
+        msisdn=254700000000,
+    )
+
+    assert limiter.paths == [C2B_SIMULATE_PATH]
@@ -0,0 +1,177 @@
+import asyncio
+import io
+
+import pytest
+
+from mpesa.api.aio import AsyncTransactionStatus
+from mpesa.api.callbacks import TransactionStatusResult, parse_callback
+from mpesa.api.reconciliation import (
+    COMPLETED,
+    ERROR,
+    FAILED,
+    TIMEOUT,
+    StatusReconciliation,
+    read_transaction_ids,
+    write_report,
+)
+from mpesa.api.retry import RetryPolicy
+from mpesa.api.simulator import DarajaSimulator
+from mpesa.api.status import TransactionStatus
+
+DEFAULTS = {
+    "security_credential": "credential",
+    "party_a": "600000",
+    "identifier_type": "4",
+    "remarks": "Reconciliation",
+    "initiator": "initiator",
+    "result_url": "https://example.com/status/result",
+    "queue_timeout_url": "https://example.com/status/timeout",
+}
+CREDENTIALS = {"app_key": "key", "app_secret": "secret"}
+
+
+def receiver(runner):
+    def deliver(url, body):
+        kind = "timeout" if url.endswith("/timeout") else "status"
+        runner[0].deliver(parse_callback(kind, body))
+
+    return deliver
+
+
+def reconcile(transaction_ids, **options):
+    runner = []
+    simulator_options = options.pop("simulator", {})
+    simulator = DarajaSimulator(callback_handler=receiver(runner), **simulator_options)
+    status = TransactionStatus(
+        transport=simulator.transport(),
+        retry_policy=RetryPolicy(max_retries=0),
+        **CREDENTIALS,
+    )
+    runner.append(StatusReconciliation(status, DEFAULTS, **options))
+    try:
+        return list(runner[0].run(transaction_ids)), runner[0]
+    finally:
+        simulator.close()
+
+
+def test_results_are_correlated_to_transactions():
+    transaction_ids = [f"SIM{n:07d}" for n in range(25)]
+    source = io.StringIO(
+        "TransactionID,Amount\n" + "".join(f"{t},10\n" for t in transaction_ids) + ",\n"
+    )
+
+    records, runner = reconcile(read_transaction_ids(source), concurrency=4)
+
+    assert sorted(record.transaction_id for record in records) == transaction_ids
+    assert all(record.status == COMPLETED for record in records)
+    for record in records:
+        assert isinstance(record.result, TransactionStatusResult)
+        assert record.result.transaction_id == record.transaction_id
+        assert record.result.parameters["ReceiptNo"] == record.transaction_id
+    assert runner.stats == {COMPLETED: 25}
+    assert runner.pending == 0
+
+
+def test_failed_results_and_report():
+    records, _ = reconcile(["SIM0000001", "SIM0000002"], simulator={"result_code": 1})
+    report = io.StringIO()
+
+    counts = write_report(records, report)
+
+    assert counts == {FAILED: 2}
+    lines = report.getvalue().splitlines()
+    assert lines[0].startswith("transaction_id,status,result_code,result_desc")
+    assert sorted(line.split(",")[:3] for line in lines[1:]) == [
+        ["SIM0000001", FAILED, "1"],
+        ["SIM0000002", FAILED, "1"],
+    ]
+
+
+def test_missing_results_time_out():
+    simulator = DarajaSimulator()
+    status = TransactionStatus(transport=simulator.transport(), **CREDENTIALS)
+    runner = StatusReconciliation(status, DEFAULTS, result_timeout=0.05)
+
+    records = list(runner.run(["SIM0000001", {"transaction_id": "SIM0000002"}]))
+
+    assert {record.transaction_id for record in records} == {
+        "SIM0000001",
+        "SIM0000002",
+    }
+    assert all(record.status == TIMEOUT and record.result is None for record in records)
+
+
+def test_rejected_queries_are_reported_as_errors():
+    records, runner = reconcile(
+        ["SIM0000001"], simulator={"error_rate": 1.0, "error_status": 400}
+    )
+
+    assert [record.status for record in records] == [ERROR]
+    assert isinstance(records[0].error, Exception)
+    assert runner.pending == 0
+
+
+class EarlyResultStatus:
+    """Delivers the result before acknowledging, under Mpesa-assigned IDs."""
+
+    def __init__(self):
+        self.runner = None
+
+    def check_transaction_status(self, **query):
+        body = {
+            "Result": {
+                "ResultType": 0,
+                "ResultCode": 0,
+                "ResultDesc": "The service request is processed successfully.",
+                "OriginatorConversationID": "mpesa-ocid",
+                "ConversationID": "AG_1",
+                "TransactionID": query["transaction_id"],
+            }
+        }
+        assert not self.runner.deliver(parse_callback("status", body))
+        return {"OriginatorConversationID": "mpesa-ocid", "ConversationID": "AG_1"}
+
+
+def test_results_delivered_before_the_acknowledgement():
+    status = EarlyResultStatus()
+    runner = status.runner = StatusReconciliation(status, DEFAULTS)
+
+    records = list(runner.run(["SIM0000001"]))
+
+    assert [(r.transaction_id, r.status) for r in records] == [
+        ("SIM0000001", COMPLETED)
+    ]
+
+
+def test_async_run():
+    runner = []
+    simulator = DarajaSimulator(callback_handler=receiver(runner))
+
+    async def run():
+        async with AsyncTransactionStatus(
+            transport=simulator.async_transport(), **CREDENTIALS
+        ) as status:
+            runner.append(StatusReconciliation(status, DEFAULTS, concurrency=3))
+            return [record async for record in runner[0].arun(["A1", "A2", "A3", "A4"])]
+
+    try:
+        records = asyncio.run(run())
+    finally:
+        simulator.close()
+
+    assert sorted(record.transaction_id for record in records) == [
+        "A1",
+        "A2",
+        "A3",
+        "A4",
+    ]
+    assert all(record.ok for record in records)
+
+
+def test_read_transaction_ids_requires_column(tmp_path):
+    path = tmp_path / "transactions.csv"
+    path.write_text("Receipt\nSIM0000001\n")
+
+    assert list(read_transaction_ids(str(path), column="Receipt")) == ["SIM0000001"]
+    with pytest.raises(ValueError, match="no TransactionID column"):
+        list(read_transaction_ids(str(path)))
@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+
+from mpesa.api.aio import AsyncBalance
+from mpesa.api.balance import Balance
+from mpesa.api.constants import AUTH_PATH
+from mpesa.api.mpesa_express import MpesaExpress
+from mpesa.api.registry import AsyncClientRegistry, ClientRegistry
+from mpesa.api.simulator import DarajaSimulator
+from mpesa.tests.conftest import FakeClock
+
+AUTH = AUTH_PATH.split("?")[0]
+
+
+def balance(api):
+    return api.get_balance(
+        "initiator",
+        "credential",
+        "600000",
+        4,
+        "remarks",
+        "https://example.com/timeout",
+        "https://example.com/result",
+    )
+
+
+@pytest.fixture
+def simulator():
+    simulator = DarajaSimulator()
+    yield simulator
+    simulator.close()
+
+
+def test_tenants_share_pool_and_token_cache(simulator):
+    with ClientRegistry(transport=simulator.transport()) as registry:
+        registry.register("600000", "key-a", "secret-a")
+        registry.register("600001", "key-b", "secret-b")
+
+        first, second = registry["600000"], registry.tenant("600001")
+        assert isinstance(first.balance, Balance)
+        assert isinstance(first.mpesa_express, MpesaExpress)
+        assert first.balance is first.balance
+        assert first.balance.client is second.b2c.client
+        assert first.balance.token_cache is registry.token_cache
+
+        for _ in range(3):
+            assert balance(first.balance)["ResponseCode"] == "0"
+            balance(second.balance)
+
+    # One authentication per consumer key, shared by every API class.
+    assert simulator.request_counts[AUTH] == 2
+
+
+def test_idle_tenants_are_evicted(simulator):
+    clock = FakeClock()
+    registry = ClientRegistry(
+        idle_timeout=60, transport=simulator.transport(), clock=clock
+    )
+    registry.register("600000", "key-a", "secret-a")
+    registry.register("600001", "key-b", "secret-b")
+
+    tenant = registry.tenant("600000")
+    balance(tenant.balance)
+    clock.now = 30
+    registry.tenant("600001")
+    clock.now = 61
+
+    assert registry.evict_idle() == ["600000"]
+    assert registry.active == ["600001"]
+    assert len(registry) == 2
+
+    rebuilt = registry.tenant("600000")
+    assert rebuilt is not tenant
+    balance(rebuilt.balance)
+    # The rebuilt tenant reuses the cached token.
+    assert simulator.request_counts[AUTH] == 1
+    registry.close()
+
+
+def test_max_active_evicts_least_recently_used(simulator):
+    registry = ClientRegistry(max_active=2, transport=simulator.transport())
+    for name in ("a", "b", "c"):
+        registry.register(name, f"key-{name}", "secret")
+
+    registry.tenant("a")
+    registry.tenant("b")
+    registry.tenant("a")
+    registry.tenant("c")
+
+    assert registry.active == ["a", "c"]
+    registry.close()
+
+
+def test_register_and_unregister(simulator):
+    registry = ClientRegistry(transport=simulator.transport())
+    registry.register("600000", "key-a", "secret-a", initiator_password="secret")
+    tenant = registry.tenant("600000")
+    assert tenant.b2c.initiator_password == "secret"
+    balance(tenant.balance)
+
+    registry.unregister("600000")
+
+    assert "600000" not in registry
+    assert registry.token_cache.get(tenant.balance._token_key()) is None
+    with pytest.raises(ValueError, match="No tenant is registered as 600000"):
+        registry.tenant("600000")
+    with pytest.raises(ValueError, match="App key and app secret"):
+        registry.register("600001", "", "secret")
+    with pytest.raises(ValueError, match="Unknown API b2b"):
+        tenant.api("b2b")
+    registry.close()
+
+
+@pytest.mark.parametrize("env", ["sandbox", "production"])
+def test_unregister_does_not_build_clients(env):
+    registry = ClientRegistry(sandbox_url="https://daraja.example.com")
+    registry.register("600000", "key-a", "secret-a", env=env, live_url="https://live")
+    key = Balance(
+        env=env,
+        app_key="key-a",
+        sandbox_url="https://daraja.example.com",
+        live_url="https://live",
+    )._token_key()
+    registry.token_cache.set(key, "token", 3599)
+
+    registry.unregister("600000")
+
+    assert registry.token_cache.get(key) is None
+    assert registry._client is None
+
+
+def test_async_registry(simulator):
+    async def run():
+        async with AsyncClientRegistry(
+            transport=simulator.async_transport()
+        ) as registry:
+            registry.register("600000", "key-a", "secret-a")
+            api = registry.tenant("600000").balance
+            assert isinstance(api, AsyncBalance)
+            responses = await asyncio.gather(*(balance(api) for _ in range(5)))
+        return responses
+
+    assert all(r["ResponseCode"] == "0" for r in asyncio.run(run()))
+    assert simulator.request_counts[AUTH] == 1
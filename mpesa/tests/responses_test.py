@@ -0,0 +1,191 @@
+import asyncio
+import json
+
+import pytest
+from httpx import Response
+
+from mpesa.api.aio import AsyncB2C
+from mpesa.api.b2c import B2C
+from mpesa.api.constants import STK_PUSH_PATH
+from mpesa.api.correlator import ResultCorrelator
+from mpesa.api.idempotency import MemoryIdempotencyStore
+from mpesa.api.mpesa_express import MpesaExpress
+from mpesa.api.responses import (
+    Acknowledgement,
+    MalformedResponseError,
+    MpesaResponse,
+    StkPushResponse,
+    build_response,
+    response_data,
+)
+from mpesa.api.simulator import DarajaSimulator
+
+STK_URL = "https://sandbox.safaricom.co.ke/mpesa/stkpush/v1/processrequest"
+B2C_URL = "https://sandbox.safaricom.co.ke/mpesa/b2c/v3/paymentrequest"
+
+STK_BODY = {
+    "MerchantRequestID": "29115-34620561-1",
+    "CheckoutRequestID": "ws_CO_191220191020363925",
+    "ResponseCode": "0",
+    "ResponseDescription": "Success. Request accepted for processing",
+    "CustomerMessage": "Success. Request accepted for processing",
+}
+
+STK_PUSH = dict(
+    short_code=174379,
+    pass_key="pass_key",
+    transaction_type="CustomerPayBillOnline",
+    amount=10,
+    sender_msisdn=254712345678,
+    receiver_msisdn=254712345678,
+    callback_url="https://example.com/stk",
+    transaction_desc="Payment",
+    account_ref="Invoice42",
+)
+
+PAYOUT = dict(
+    originator_conversation_id="ocid-1",
+    initiator_name="initiator",
+    security_credential="credential",
+    command_id="BusinessPayment",
+    amount="100",
+    party_a=600000,
+    party_b=254712345678,
+    remarks="Payout",
+    queue_timeout_url="https://example.com/timeout",
+    result_url="https://example.com/result",
+)
+
+
+def test_model_parses_body_on_first_field_access():
+    response = build_response("model", STK_PUSH_PATH, b"not json", 200)
+
+    assert isinstance(response, StkPushResponse)
+    assert response.content == b"not json"
+    with pytest.raises(ValueError):
+        response.checkout_request_id
+
+
+def test_model_exposes_fields_and_mapping_access():
+    response = build_response(
+        "model", STK_PUSH_PATH, json.dumps(STK_BODY).encode(), 200
+    )
+
+    assert response.ok
+    assert response.status_code == 200
+    assert response.checkout_request_id == "ws_CO_191220191020363925"
+    assert response.merchant_request_id == "29115-34620561-1"
+    assert response.response_code == "0"
+    assert response["CustomerMessage"] == STK_BODY["CustomerMessage"]
+    assert response.get("ResultCode", "-") == "-"
+    assert "ResponseDescription" in response
+    assert response.to_dict() == STK_BODY
+    assert isinstance(build_response("model", "/other", b"{}"), MpesaResponse)
+    assert not hasattr(response, "__dict__")
+
+
+@pytest.mark.parametrize(
+    "mode, expected",
+    [("json", STK_BODY), ("raw", json.dumps(STK_BODY).encode())],
+)
+def test_client_response_modes(respx_router, mode, expected):
+    respx_router.post(STK_URL).mock(
+        return_value=Response(200, content=json.dumps(STK_BODY).encode())
+    )
+    client = MpesaExpress(app_key="key", app_secret="secret", response_mode=mode)
+
+    assert client.stk_push(**STK_PUSH) == expected
+
+
+def test_client_returns_models(respx_router):
+    respx_router.post(STK_URL).mock(return_value=Response(200, json=STK_BODY))
+    client = MpesaExpress(app_key="key", app_secret="secret", response_mode="model")
+
+    response = client.stk_push(**STK_PUSH)
+
+    assert isinstance(response, StkPushResponse)
+    assert response.checkout_request_id == STK_BODY["CheckoutRequestID"]
+
+
+def test_unknown_response_mode_is_rejected():
+    with pytest.raises(ValueError, match="Unknown response_mode dict"):
+        B2C(app_key="key", app_secret="secret", response_mode="dict")
+
+
+def test_idempotent_replay_returns_model(respx_router):
+    route = respx_router.post(B2C_URL).mock(
+        return_value=Response(
+            200,
+            json={
+                "ConversationID": "AG_1",
+                "OriginatorConversationID": "ocid-1",
+                "ResponseCode": "0",
+            },
+        )
+    )
+    store = MemoryIdempotencyStore()
+    b2c = B2C(
+        app_key="key",
+        app_secret="secret",
+        idempotency_store=store,
+        response_mode="model",
+    )
+
+    first = b2c.transact(**PAYOUT)
+    replay = b2c.transact(**PAYOUT)
+
+    assert route.call_count == 1
+    assert store.get("ocid-1").response == first.data
+    assert isinstance(replay, Acknowledgement)
+    assert replay.conversation_id == first.conversation_id == "AG_1"
+    assert replay.status_code is None
+
+
+@pytest.mark.parametrize("mode", ["json", "model", "raw"])
+def test_malformed_body_releases_idempotency_key(respx_router, mode):
+    route = respx_router.post(B2C_URL).mock(
+        side_effect=[
+            Response(200, content=b"<html>Bad gateway</html>"),
+            Response(200, json={"ConversationID": "AG_1", "ResponseCode": "0"}),
+        ]
+    )
+    store = MemoryIdempotencyStore()
+    b2c = B2C(
+        app_key="key",
+        app_secret="secret",
+        idempotency_store=store,
+        response_mode=mode,
+    )
+
+    with pytest.raises(ValueError, match="during the B2C") as excinfo:
+        b2c.transact(**PAYOUT)
+
+    assert isinstance(excinfo.value.__cause__, MalformedResponseError)
+    assert store.get("ocid-1") is None
+    assert response_data(b2c.transact(**PAYOUT))["ConversationID"] == "AG_1"
+    assert route.call_count == 2
+
+
+def test_async_models_work_with_correlator():
+    simulator = DarajaSimulator(callback_handler=lambda url, body: None)
+    correlator = ResultCorrelator()
+
+    async def run():
+        async with AsyncB2C(
+            app_key="key",
+            app_secret="secret",
+            transport=simulator.async_transport(),
+            response_mode="model",
+        ) as b2c:
+            return await b2c.transact(**PAYOUT)
+
+    try:
+        acknowledgement = asyncio.run(run())
+    finally:
+        simulator.close()
+
+    assert isinstance(acknowledgement, Acknowledgement)
+    assert acknowledgement.ok
+    assert acknowledgement.originator_conversation_id == "ocid-1"
+    correlator.track(acknowledgement)
+    assert len(correlator) == 1
@@ -0,0 +1,156 @@
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from mpesa.api.auth import MpesaBase
+from mpesa.api.balance import Balance
+from mpesa.api.constants import ACCOUNT_BALANCE_ENDPOINT, AUTH_ENDPOINT
+from mpesa.api.retry import RetryPolicy
+from mpesa.tests.conftest import FakeClock
+
+
+def upper_bound(low, high):
+    return high
+
+
+@pytest.fixture
+def policy():
+    return RetryPolicy(max_retries=3, backoff_factor=0.5, jitter=upper_bound)
+
+
+def test_exponential_backoff(policy):
+    response = Response(503)
+
+    assert policy.next_delay(0, None, response=response) == 0.5
+    assert policy.next_delay(1, None, response=response) == 1.0
+    assert policy.next_delay(2, None, response=response) == 2.0
+    assert policy.next_delay(3, None, response=response) is None
+
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(max_retries=10, max_backoff=3, jitter=upper_bound)
+
+    assert policy.next_delay(8, None, response=Response(503)) == 3
+
+
+def test_jitter_spreads_delays():
+    policy = RetryPolicy(backoff_factor=1)
+    delays = {policy.next_delay(2, None, response=Response(503)) for _ in range(20)}
+
+    assert len(delays) > 1
+    assert all(0 <= delay <= 4 for delay in delays)
+
+
+def test_only_safe_errors_are_retried(policy):
+    assert policy.next_delay(0, None, response=Response(429)) is not None
+    assert policy.next_delay(0, None, response=Response(500)) is None
+    assert policy.next_delay(0, None, response=Response(400)) is None
+    assert policy.next_delay(0, None, error=httpx.ConnectError("refused")) == 0.5
+    assert policy.next_delay(0, None, error=httpx.ReadTimeout("timed out")) is None
+
+
+def test_retry_after_seconds(policy):
+    response = Response(429, headers={"Retry-After": "7"})
+
+    assert policy.next_delay(0, None, response=response) == 7.0
+
+
+def test_retry_after_is_capped(policy):
+    response = Response(429, headers={"Retry-After": "3600"})
+
+    assert policy.next_delay(0, None, response=response) == policy.max_backoff
+
+
+def test_retry_after_http_date(policy):
+    response = Response(503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+    assert policy.next_delay(0, None, response=response) == 0.0
+
+
+def test_deadline_stops_retries():
+    clock = FakeClock()
+    policy = RetryPolicy(deadline=1.0, clock=clock, jitter=upper_bound)
+    deadline = policy.start()
+
+    assert policy.next_delay(0, deadline, response=Response(503)) == 0.5
+    clock.now = 0.6
+    assert policy.next_delay(1, deadline, response=Response(503)) is None
+
+
+def test_bound_timeout_respects_deadline():
+    clock = FakeClock()
+    policy = RetryPolicy(deadline=5.0, clock=clock)
+    timeout = httpx.Timeout(30, connect=2)
+
+    bounded = policy.bound_timeout(timeout, policy.start())
+
+    assert bounded.connect == 2
+    assert bounded.read == 5.0
+    assert policy.bound_timeout(timeout, None) is timeout
+
+
+@respx.mock
+def test_request_retried_until_success():
+    respx.get(AUTH_ENDPOINT).mock(
+        return_value=Response(200, json={"access_token": "mock_token"})
+    )
+    route = respx.post(ACCOUNT_BALANCE_ENDPOINT).mock(
+        side_effect=[
+            Response(503),
+            Response(429, headers={"Retry-After": "0"}),
+            Response(200, json={"ResponseCode": "0"}),
+        ]
+    )
+    balance = Balance(
+        app_key="test_key",
+        app_secret="test_secret",
+        retry_policy=RetryPolicy(backoff_factor=0),
+    )
+
+    response = balance.get_balance(
+        initiator="test_initiator",
+        security_credential="test_security_credential",
+        party_a="600000",
+        identifier_type=4,
+        remarks="Test balance query",
+        queue_timeout_url="https://example.com/timeout",
+        result_url="https://example.com/result",
+    )
+
+    assert response["ResponseCode"] == "0"
+    assert route.call_count == 3
+
+
+@respx.mock
+def test_request_gives_up_after_max_retries():
+    respx.get(AUTH_ENDPOINT).mock(
+        return_value=Response(200, json={"access_token": "mock_token"})
+    )
+    route = respx.post(ACCOUNT_BALANCE_ENDPOINT).mock(return_value=Response(503))
+    balance = Balance(
+        app_key="test_key",
+        app_secret="test_secret",
+        retry_policy=RetryPolicy(max_retries=2, backoff_factor=0),
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        balance.get_balance(
+            initiator="test_initiator",
+            security_credential="test_security_credential",
+            party_a="600000",
+            identifier_type=4,
+            remarks="Test balance query",
+            queue_timeout_url="https://example.com/timeout",
+            result_url="https://example.com/result",
+        )
+
+    assert route.call_count == 3
+
+
+def test_default_timeouts():
+    mpesa = MpesaBase(app_key="test_key", app_secret="test_secret")
+
+    assert mpesa.timeout.read == 30
+    assert mpesa.timeout.connect == 10
+    assert mpesa.client.timeout.read == 30
@@ -7,7 +7,7 @@ from mpesa.api.reversal import Reversal
 
 @pytest.fixture
 def mock_authentication():
-    with respx.mock() as respx_mock:
+    with respx.mock(assert_all_called=False) as respx_mock:
         # Mock the authentication endpoint with a fake response
         respx_mock.get("https://sandbox.safaricom.co.ke/oauth/v1/generate?grant_type=client_credentials").mock(
             return_value=Response(
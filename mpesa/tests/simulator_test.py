@@ -0,0 +1,183 @@
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+import httpx
+import pytest
+
+from mpesa.api.aio import AsyncBalance
+from mpesa.api.b2c import B2C
+from mpesa.api.c2b import C2B
+from mpesa.api.callbacks import (
+    B2CResult,
+    C2BNotification,
+    CallbackReceiver,
+    parse_callback,
+)
+from mpesa.api.mpesa_express import MpesaExpress
+from mpesa.api.retry import RetryPolicy
+from mpesa.api.simulator import DarajaSimulator
+
+CREDENTIALS = {"app_key": "key", "app_secret": "secret"}
+
+
+def pay(b2c):
+    return b2c.transact(
+        originator_conversation_id="ocid-1",
+        initiator_name="initiator",
+        security_credential="credential",
+        command_id="BusinessPayment",
+        amount="100",
+        party_a=600123,
+        party_b=254700000000,
+        remarks="Payout",
+        queue_timeout_url="https://example.com/timeout",
+        result_url="https://example.com/b2c/result",
+    )
+
+
+def test_b2c_with_result_callback():
+    results = []
+    receiver = CallbackReceiver({"/b2c/result": "b2c"}, handler=results.append)
+
+    def deliver(url, body):
+        receiver.dispatch(urlsplit(url).path, json.dumps(body).encode())
+
+    with DarajaSimulator(callback_handler=deliver) as simulator:
+        b2c = B2C(transport=simulator.transport(), **CREDENTIALS)
+        response = pay(b2c)
+        assert simulator.join_callbacks(timeout=5)
+
+    assert response["ResponseCode"] == "0"
+    assert response["OriginatorConversationID"] == "ocid-1"
+    assert isinstance(results[0], B2CResult)
+    assert results[0].ok
+    assert results[0].conversation_id == response["ConversationID"]
+    assert results[0].transaction_amount == "100"
+
+
+def test_c2b_simulation_confirms_registered_url():
+    delivered = []
+    with DarajaSimulator(callback_handler=lambda *args: delivered.append(args)) as sim:
+        c2b = C2B(transport=sim.transport(), **CREDENTIALS)
+        c2b.register(
+            600123,
+            "Completed",
+            "https://example.com/confirm",
+            "https://example.com/validate",
+        )
+        c2b.simulate(600123, "CustomerPayBillOnline", 10, 254708374149, "invoice")
+        sim.join_callbacks(timeout=5)
+
+    url, body = delivered[0]
+    assert url == "https://example.com/confirm"
+    notification = parse_callback("c2b_confirmation", body)
+    assert isinstance(notification, C2BNotification)
+    assert notification.trans_amount == "10"
+
+
+def stk_push(express):
+    return express.stk_push(
+        174379,
+        "passkey",
+        "CustomerPayBillOnline",
+        1,
+        254708374149,
+        254708374149,
+        "https://example.com/stk",
+        "Payment",
+        "ref",
+    )
+
+
+def test_stk_query_pending_until_completion():
+    simulator = DarajaSimulator(stk_completion_delay=60)
+    express = MpesaExpress(transport=simulator.transport(), **CREDENTIALS)
+    push = stk_push(express)
+
+    with pytest.raises(httpx.HTTPStatusError) as excinfo:
+        express.status(174379, push["CheckoutRequestID"], "passkey")
+
+    assert excinfo.value.response.json()["errorCode"] == "500.001.1001"
+
+
+def test_stk_query_completed():
+    simulator = DarajaSimulator()
+    express = MpesaExpress(transport=simulator.transport(), **CREDENTIALS)
+    push = stk_push(express)
+
+    status = express.status(174379, push["CheckoutRequestID"], "passkey")
+
+    assert status["ResultCode"] == "0"
+
+
+def test_error_injection_is_retried():
+    simulator = DarajaSimulator(error_rate=1.0)
+    b2c = B2C(
+        transport=simulator.transport(),
+        retry_policy=RetryPolicy(max_retries=2, backoff_factor=0),
+        **CREDENTIALS,
+    )
+
+    with pytest.raises(httpx.HTTPStatusError) as excinfo:
+        pay(b2c)
+
+    assert excinfo.value.response.status_code == 503
+    assert simulator.request_counts["/mpesa/b2c/v3/paymentrequest"] == 3
+
+
+def test_revoked_token_is_refreshed():
+    simulator = DarajaSimulator()
+    b2c = B2C(transport=simulator.transport(), **CREDENTIALS)
+    pay(b2c)
+    simulator.revoke_tokens()
+    pay(b2c)
+
+    assert simulator.request_counts["/oauth/v1/generate"] == 2
+    assert simulator.request_counts["/mpesa/b2c/v3/paymentrequest"] == 3
+
+
+def test_async_transport():
+    simulator = DarajaSimulator(latency=0.01)
+
+    async def run():
+        async with AsyncBalance(
+            transport=simulator.async_transport(), **CREDENTIALS
+        ) as balance:
+            return await asyncio.gather(
+                *(
+                    balance.get_balance(
+                        "initiator",
+                        "credential",
+                        "600123",
+                        4,
+                        "Balance",
+                        "https://example.com/timeout",
+                        "https://example.com/result",
+                    )
+                    for _ in range(5)
+                )
+            )
+
+    responses = asyncio.run(run())
+
+    assert all(response["ResponseCode"] == "0" for response in responses)
+    assert len({response["ConversationID"] for response in responses}) == 5
+
+
+def test_http_server():
+    with DarajaSimulator() as simulator, simulator.serve() as server:
+        with B2C(sandbox_url=server.url, **CREDENTIALS) as b2c:
+            response = pay(b2c)
+
+    assert response["ResponseCode"] == "0"
+
+
+def test_unknown_path_and_missing_token():
+    simulator = DarajaSimulator()
+    with httpx.Client(transport=simulator.transport()) as client:
+        assert client.post("https://sim/mpesa/unknown").status_code == 404
+        response = client.post("https://sim/mpesa/b2c/v3/paymentrequest", json={})
+
+    assert response.status_code == 401
+    assert response.json()["errorCode"] == "404.001.03"
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 import respx
 from httpx import Response, HTTPStatusError
@@ -5,7 +7,7 @@ from mpesa.api.status import TransactionStatus  # Adjust the import path as nece
 
 @pytest.fixture
 def mock_authentication():
-    with respx.mock() as respx_mock:
+    with respx.mock(assert_all_called=False) as respx_mock:
         respx_mock.get("https://sandbox.safaricom.co.ke/oauth/v1/generate?grant_type=client_credentials").mock(
             return_value=Response(
                 200,
@@ -96,3 +98,26 @@ def test_check_transaction_status_value_error(transaction_status_instance):
             result_url="https://example.com/result",
             queue_timeout_url="https://example.com/timeout",
         )
+
+
+@respx.mock
+def test_check_transaction_status_sends_transaction_id(transaction_status_instance):
+    route = respx.post("https://sandbox.safaricom.co.ke/mpesa/transactionstatus/v1/query").mock(
+        return_value=Response(200, json={"ResponseCode": "0"})
+    )
+
+    transaction_status_instance.check_transaction_status(
+        security_credential="test_security_credential",
+        originator_conversation_id="test_originator_id",
+        party_a="254700000000",
+        identifier_type="1",
+        transaction_id="test_transaction_id",
+        remarks="Test transaction status",
+        initiator="test_initiator",
+        result_url="https://example.com/result",
+        queue_timeout_url="https://example.com/timeout",
+    )
+
+    payload = json.loads(route.calls.last.request.content)
+    assert payload["TransactionID"] == "test_transaction_id"
+    assert payload["OriginatorconversationID"] == "test_originator_id"
@@ -0,0 +1,55 @@
+import pytest
+from mpesa.api.token_cache import TokenCache
+from mpesa.tests.conftest import FakeClock
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return TokenCache(refresh_margin=60, clock=clock)
+
+
+def test_get_returns_fresh_token(cache):
+    key = ("sandbox", "key", "https://sandbox.safaricom.co.ke")
+    cache.set(key, "mock_token", 3599)
+
+    assert cache.get(key) == "mock_token"
+
+
+def test_get_missing_key(cache):
+    assert cache.get(("sandbox", "missing", "https://sandbox.safaricom.co.ke")) is None
+
+
+def test_token_refreshed_before_expiry(cache, clock):
+    key = ("sandbox", "key", "https://sandbox.safaricom.co.ke")
+    cache.set(key, "mock_token", "3599")
+
+    clock.now = 3538
+    assert cache.get(key) == "mock_token"
+
+    # Within the refresh margin the token is treated as stale
+    clock.now = 3539
+    assert cache.get(key) is None
+
+
+def test_keys_are_isolated(cache):
+    sandbox = ("sandbox", "key", "https://sandbox.safaricom.co.ke")
+    production = ("production", "key", "https://safaricom.co.ke")
+    cache.set(sandbox, "sandbox_token", 3599)
+
+    assert cache.get(production) is None
+
+
+def test_invalidate_and_clear(cache):
+    key = ("sandbox", "key", "https://sandbox.safaricom.co.ke")
+    cache.set(key, "mock_token", 3599)
+    cache.invalidate(key)
+    assert cache.get(key) is None
+
+    cache.set(key, "mock_token", 3599)
+    cache.clear()
+    assert cache.get(key) is None
@@ -0,0 +1,185 @@
+import pytest
+import respx
+from httpx import Response
+
+from mpesa.api.b2c import B2C
+from mpesa.api.constants import (
+    AUTH_ENDPOINT,
+    B2C_PAYMENT_PATH,
+    STK_PUSH_PATH,
+    TRANSACTION_STATUS_PATH,
+)
+from mpesa.api.validation import (
+    PayloadValidator,
+    ValidationError,
+    max_length,
+    normalize_msisdn,
+)
+
+B2C_URL = "https://sandbox.safaricom.co.ke/mpesa/b2c/v3/paymentrequest"
+
+PAYOUT = {
+    "OriginatorConversationID": "ocid-1",
+    "InitiatorName": "initiator",
+    "SecurityCredential": "credential",
+    "CommandID": "BusinessPayment",
+    "Amount": "100",
+    "PartyA": 600000,
+    "PartyB": 254712345678,
+    "Remarks": "Payout",
+    "QueueTimeOutURL": "https://example.com/timeout",
+    "ResultURL": "https://example.com/result",
+    "Occassion": None,
+}
+
+
+@pytest.mark.parametrize(
+    "msisdn",
+    ["0712345678", "712345678", "254712345678", "+254 712 345 678", 254712345678],
+)
+def test_normalize_msisdn(msisdn):
+    assert normalize_msisdn(msisdn) == "254712345678"
+
+
+def test_normalize_msisdn_01_prefix():
+    assert normalize_msisdn("0110-123-456") == "254110123456"
+
+
+@pytest.mark.parametrize(
+    "msisdn", ["", "0812345678", "07123456", "2557123456789", "07x2345678"]
+)
+def test_normalize_msisdn_rejects_invalid_numbers(msisdn):
+    with pytest.raises(ValueError, match="not a valid Kenyan mobile number"):
+        normalize_msisdn(msisdn)
+
+
+def test_valid_payload_passes():
+    validator = PayloadValidator()
+
+    assert validator.errors(B2C_PAYMENT_PATH, PAYOUT) == []
+    validator.validate(B2C_PAYMENT_PATH, PAYOUT)
+
+
+def test_every_broken_rule_is_reported():
+    payout = {
+        **PAYOUT,
+        "CommandID": "Payment",
+        "Amount": "9",
+        "PartyB": "0712345678",
+        "Remarks": "x" * 101,
+        "ResultURL": "",
+    }
+
+    with pytest.raises(ValidationError) as error:
+        PayloadValidator().validate(B2C_PAYMENT_PATH, payout, "B2C transaction")
+
+    assert error.value.errors == [
+        "CommandID must be one of BusinessPayment, PromotionPayment, SalaryPayment",
+        "Amount must be a whole amount between 10 and 250000",
+        "PartyB must be a Kenyan mobile number in the form 2547XXXXXXXX",
+        "Remarks must be at most 100 characters",
+        "ResultURL is required",
+    ]
+    assert str(error.value).startswith("Invalid B2C transaction request: CommandID")
+
+
+@pytest.mark.parametrize(
+    "amount, valid",
+    [
+        (1, True),
+        ("250000", True),
+        (100.0, True),
+        ("10.00", True),
+        (0, False),
+        (250001, False),
+        (10.5, False),
+        ("1e3", False),
+        (True, False),
+    ],
+)
+def test_amount_bounds(amount, valid):
+    payload = {
+        "BusinessShortCode": 174379,
+        "TransactionType": "CustomerPayBillOnline",
+        "Amount": amount,
+        "PartyA": 254712345678,
+        "PartyB": 174379,
+        "PhoneNumber": 254712345678,
+        "CallBackURL": "https://example.com/stk",
+        "AccountReference": "Invoice42",
+        "TransactionDesc": "Payment",
+    }
+
+    assert (PayloadValidator().errors(STK_PUSH_PATH, payload) == []) is valid
+
+
+@pytest.mark.parametrize(
+    "identifier_type, valid",
+    [(1, True), ("2", True), (3, True), ("4", True), ("11", True), ("5", False)],
+)
+def test_documented_identifier_types_are_accepted(identifier_type, valid):
+    payload = {
+        "Initiator": "initiator",
+        "SecurityCredential": "credential",
+        "CommandID": "TransactionStatusQuery",
+        "TransactionID": "OEI2AK4Q16",
+        "PartyA": 600000,
+        "IdentifierType": identifier_type,
+        "ResultURL": "https://example.com/result",
+        "QueueTimeOutURL": "https://example.com/timeout",
+        "Remarks": "Status",
+    }
+
+    errors = PayloadValidator().errors(TRANSACTION_STATUS_PATH, payload)
+
+    assert (errors == []) is valid
+
+
+def test_validate_many_returns_errors_in_input_order():
+    payloads = [PAYOUT, {**PAYOUT, "Amount": "abc"}, {**PAYOUT, "PartyA": 12}]
+
+    errors = PayloadValidator().validate_many(B2C_PAYMENT_PATH, iter(payloads))
+
+    assert errors == [
+        [],
+        ["Amount must be a whole amount between 10 and 250000"],
+        ["PartyA must be a shortcode of 5 to 7 digits"],
+    ]
+    assert PayloadValidator().validate_many("/unknown", payloads) == [[], [], []]
+
+
+def test_custom_rules_replace_endpoint_defaults():
+    validator = PayloadValidator({B2C_PAYMENT_PATH: [max_length("Remarks", 10)]})
+
+    assert validator.errors(B2C_PAYMENT_PATH, {"Remarks": "Salary payout"}) == [
+        "Remarks must be at most 10 characters"
+    ]
+
+
+@respx.mock
+def test_client_rejects_invalid_payload_before_sending():
+    auth = respx.get(AUTH_ENDPOINT).mock(
+        return_value=Response(200, json={"access_token": "token", "expires_in": 3599})
+    )
+    route = respx.post(B2C_URL).mock(
+        return_value=Response(200, json={"ResponseCode": "0"})
+    )
+    b2c = B2C(app_key="key", app_secret="secret", validator=PayloadValidator())
+    arguments = dict(
+        originator_conversation_id="ocid-1",
+        initiator_name="initiator",
+        security_credential="credential",
+        command_id="BusinessPayment",
+        party_a=600000,
+        remarks="Payout",
+        queue_timeout_url="https://example.com/timeout",
+        result_url="https://example.com/result",
+    )
+
+    with pytest.raises(ValidationError, match="Invalid B2C transaction request"):
+        b2c.transact(amount="100", party_b=712345678, **arguments)
+    assert not auth.called and not route.called
+
+    assert b2c.transact(amount="100", party_b=254712345678, **arguments) == {
+        "ResponseCode": "0"
+    }